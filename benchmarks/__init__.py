@@ -0,0 +1,9 @@
+"""
+Benchmarks for the LandBOSSE cost model and its input/output pipeline.
+
+Run them from the root of the repository with:
+
+python -m benchmarks.run_benchmarks
+
+See run_benchmarks.py for the command line options.
+"""
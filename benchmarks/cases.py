@@ -0,0 +1,480 @@
+"""
+This module defines the benchmark cases.
+
+Each case is a function decorated with @benchmark. The function does the
+setup that is shared by every repetition of the case and returns a pair
+of callables (setup, run):
+
+setup() is called before each repetition and is not timed. It returns a
+tuple of arguments for run().
+
+run(*args) is the code being measured.
+
+Cases that read the project inputs use the ge15_public project from
+project_input_template, so the benchmarks need no inputs beyond those in
+the repository. Other cases use the generators in synthetic.py.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from landbosse.api import InMemoryRunner
+from landbosse.excelio import XlsxReader
+from landbosse.excelio import XlsxDataframeCache
+from landbosse.excelio import XlsxFileOperations
+from landbosse.excelio import RunConfiguration
+from landbosse.excelio import XlsxGenerator
+from landbosse.excelio import CsvGenerator
+from landbosse.model import Manager
+from landbosse.model import FoundationCost
+from landbosse.model import SitePreparationCost
+from landbosse.model import SubstationCost
+from landbosse.model import GridConnectionCost
+from landbosse.model import ArraySystem
+from landbosse.model import DevelopmentCost
+from landbosse.model import ErectionCost
+from landbosse.model import ManagementCost
+from landbosse.model import WeatherDelay
+from landbosse.model import BatchClosedFormCost
+from landbosse.model import foundation_loads, size_foundations
+from landbosse.model.ErectionCost import Point, point_in_polygon
+
+from . import synthetic
+
+# CASES holds every registered case in the order they are defined.
+CASES = []
+
+# The project in project_input_template that the project cases run.
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'project_input_template')
+TEMPLATE_PROJECT_ID = 'foundation_validation_ge15'
+
+
+class BenchmarkCase:
+    """
+    A registered benchmark case.
+    """
+
+    def __init__(self, name, factory, quick):
+        """
+        Parameters
+        ----------
+        name : str
+            The name of the case, such as 'model.Manager.execute_landbosse'.
+
+        factory : callable
+            The decorated function that returns (setup, run).
+
+        quick : bool
+            True if the case is included in --quick runs.
+        """
+        self.name = name
+        self.factory = factory
+        self.quick = quick
+
+
+def benchmark(name, quick=True):
+    """
+    Decorator that registers a benchmark case.
+
+    Parameters
+    ----------
+    name : str
+        The name of the case. Names are grouped by a prefix such as
+        'model.' or 'io.' so that they can be selected with --filter.
+
+    quick : bool
+        False for cases that are too slow for --quick runs.
+    """
+    def register(factory):
+        CASES.append(BenchmarkCase(name, factory, quick))
+        return factory
+    return register
+
+
+def no_setup():
+    """
+    Setup for cases that need no arguments.
+    """
+    return ()
+
+
+@lru_cache(maxsize=None)
+def template_project():
+    """
+    Reads the project parameters and project data of the template project.
+    The result is cached so the .xlsx files are only read once per run.
+
+    Returns
+    -------
+    pandas.Series, dict
+        The project parameters and the project data sheets.
+    """
+    xlsx_reader = XlsxReader()
+    project_list = pd.read_excel(os.path.join(TEMPLATE_DIR, 'project_list.xlsx'))
+    parametric_value_list = xlsx_reader.create_parametric_value_list(pd.DataFrame())
+    extended_project_list = xlsx_reader.outer_join_projects_to_parametric_values(project_list, parametric_value_list)
+    project_parameters = extended_project_list.set_index('Project ID', drop=False).loc[TEMPLATE_PROJECT_ID]
+    project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(
+        project_parameters['Project data file'],
+        os.path.join(TEMPLATE_DIR, 'project_data')
+    )
+    return project_parameters, project_data_sheets
+
+
+def master_input_dict():
+    """
+    Makes a fresh master input dictionary for the template project. Each
+    call copies the project data, because the modules modify it.
+
+    Returns
+    -------
+    dict
+        The master input dictionary.
+    """
+    project_parameters, project_data_sheets = template_project()
+    xlsx_reader = XlsxReader()
+    sheets = XlsxDataframeCache.copy_dataframes(project_data_sheets)
+    return xlsx_reader.create_master_input_dictionary(sheets, project_parameters.copy())
+
+
+@lru_cache(maxsize=None)
+def manager_state():
+    """
+    Runs Manager once on the template project to get the state of the
+    input and output dictionaries after all the modules have run. The
+    module cases start from this state, so each module sees the inputs it
+    would see inside a full run.
+
+    Returns
+    -------
+    dict, dict
+        The input and output dictionaries after the run.
+    """
+    input_dict = master_input_dict()
+    output_dict = dict()
+    status = Manager(input_dict=input_dict, output_dict=output_dict).execute_landbosse(TEMPLATE_PROJECT_ID)
+    if status != 0:
+        raise RuntimeError(f'Template project {TEMPLATE_PROJECT_ID} failed: {output_dict["failures"]}')
+    return input_dict, output_dict
+
+
+@benchmark('model.Manager.execute_landbosse')
+def manager_execute_landbosse():
+    def setup():
+        return master_input_dict(), dict()
+
+    def run(input_dict, output_dict):
+        Manager(input_dict=input_dict, output_dict=output_dict).execute_landbosse(TEMPLATE_PROJECT_ID)
+
+    return setup, run
+
+
+@benchmark('model.Manager.execute_landbosse_threads')
+def manager_execute_landbosse_threads():
+    def setup():
+        return master_input_dict(), dict()
+
+    def run(input_dict, output_dict):
+        Manager(input_dict=input_dict, output_dict=output_dict, max_workers=4).execute_landbosse(TEMPLATE_PROJECT_ID)
+
+    return setup, run
+
+
+@benchmark('model.Manager.recompute')
+def manager_recompute():
+    def setup():
+        input_dict, output_dict = master_input_dict(), dict()
+        Manager(input_dict=input_dict, output_dict=output_dict).execute_landbosse(TEMPLATE_PROJECT_ID)
+        input_dict['interconnect_voltage_kV'] = input_dict['interconnect_voltage_kV'] * 2
+        return input_dict, output_dict
+
+    def run(input_dict, output_dict):
+        Manager(input_dict=input_dict, output_dict=output_dict).recompute(TEMPLATE_PROJECT_ID, ['interconnect_voltage_kV'])
+
+    return setup, run
+
+
+@benchmark('api.InMemoryRunner.run')
+def in_memory_runner_run():
+    project_parameters, project_data_sheets = template_project()
+    runner = InMemoryRunner(project_data_sheets)
+
+    def run():
+        runner.run(project_parameters)
+
+    return no_setup, run
+
+
+@benchmark('api.InMemoryRunner.run_without_details')
+def in_memory_runner_run_without_details():
+    project_parameters, project_data_sheets = template_project()
+    runner = InMemoryRunner(project_data_sheets, detail_level='none')
+
+    def run():
+        runner.run(project_parameters)
+
+    return no_setup, run
+
+
+@benchmark('model.XlsxReader.create_master_input_dictionary')
+def reader_create_master_input_dictionary():
+    project_parameters, project_data_sheets = template_project()
+
+    def setup():
+        return XlsxDataframeCache.copy_dataframes(project_data_sheets), project_parameters.copy()
+
+    def run(sheets, parameters):
+        XlsxReader().create_master_input_dictionary(sheets, parameters)
+
+    return setup, run
+
+
+def module_case(cost_module):
+    """
+    Makes a case that runs one cost module in isolation, starting from the
+    state of the dictionaries after a full run of the template project.
+
+    Parameters
+    ----------
+    cost_module : type
+        The CostModule subclass to run.
+
+    Returns
+    -------
+    callable
+        The case factory.
+    """
+    def factory():
+        input_dict, output_dict = manager_state()
+
+        def setup():
+            return dict(input_dict), dict(output_dict)
+
+        def run(module_input_dict, module_output_dict):
+            status, error = cost_module(module_input_dict, module_output_dict, TEMPLATE_PROJECT_ID).run_module()
+            if status != 0:
+                raise RuntimeError(f'{cost_module.__name__} failed: {error}')
+
+        return setup, run
+
+    return factory
+
+
+for _cost_module in [FoundationCost, SitePreparationCost, SubstationCost, GridConnectionCost, ArraySystem,
+                     DevelopmentCost, ErectionCost, ManagementCost]:
+    benchmark(f'model.{_cost_module.__name__}.run_module')(module_case(_cost_module))
+
+
+@benchmark('model.BatchClosedFormCost.run_modules_1e5')
+def batch_closed_form_cost():
+    projects = synthetic.closed_form_projects(num_projects=100000)
+    _, project_data_sheets = template_project()
+    site_facility_building_area_df = project_data_sheets['site_facility_building_area']
+
+    def run():
+        BatchClosedFormCost(projects, site_facility_building_area_df).run_modules()
+
+    return no_setup, run
+
+
+@benchmark('model.FoundationSizing.size_foundations_1e5')
+def foundation_sizing():
+    input_dict, _ = manager_state()
+    rng = np.random.RandomState(101)
+    num_projects = 100000
+    gust_velocity = rng.uniform(30, 70, num_projects)
+    rated_thrust = rng.uniform(2e5, 1e6, num_projects)
+    depth = rng.uniform(2, 4, num_projects)
+    bearing_pressure = rng.uniform(1.5e5, 4e5, num_projects)
+
+    def run():
+        loads = foundation_loads(input_dict, gust_velocity)
+        size_foundations(loads['f_dead'], loads['f_lat'], loads['m_overturn'], loads['lever_arm_max'],
+                         rated_thrust, depth, bearing_pressure)
+
+    return no_setup, run
+
+
+@benchmark('model.WeatherDelay')
+def weather_delay():
+    weather_window = synthetic.weather_window(num_hours=8760)
+
+    def run():
+        WeatherDelay(input_dict={
+            'start_delay_hours': 0,
+            'mission_time_hours': 8000,
+            'critical_wind_speed_m_per_s': 10.0,
+            'wind_height_of_interest_m': 100,
+            'wind_shear_exponent': 0.2,
+            'weather_window': weather_window,
+        }, output_dict=dict())
+
+    return no_setup, run
+
+
+@benchmark('model.ErectionCost.calculate_erection_operation_time')
+def erection_operation_time():
+    input_dict, output_dict = manager_state()
+
+    def setup():
+        return dict(input_dict), dict(output_dict)
+
+    def run(module_input_dict, module_output_dict):
+        ErectionCost(module_input_dict, module_output_dict, TEMPLATE_PROJECT_ID).calculate_erection_operation_time()
+
+    return setup, run
+
+
+@benchmark('model.ErectionCost.find_minimum_cost_cranes_3000')
+def erection_minimum_cost_cranes():
+    rng = np.random.RandomState(103)
+    num_cranes = 3000
+    cost_columns = ['Labor cost USD without management', 'Subtotal for hourly labor (non-management) USD',
+                    'Subtotal for per diem labor (non-management) USD', 'Equipment rental cost USD',
+                    'Fuel cost USD', 'Mobilization cost USD', 'Total cost USD']
+    separate_basetop = pd.DataFrame({
+        'Operation': np.repeat(['Base', 'Top', 'Offload'], num_cranes),
+        'Crane name': np.tile([f'Crane {index // 3}' for index in range(num_cranes)], 3),
+        'Boom system': np.tile([f'Boom {index % 3}' for index in range(num_cranes)], 3),
+    })
+    for column in cost_columns:
+        separate_basetop[column] = rng.uniform(1e5, 1e6, len(separate_basetop)).round(-3)
+    same_basetop = separate_basetop.loc[separate_basetop['Operation'] == 'Base'].reset_index(drop=True)
+    same_basetop['Operation'] = 'Base + Top'
+    input_dict = {'allow_same_flag': True}
+    output_dict = {'separate_basetop': separate_basetop, 'same_basetop': same_basetop}
+
+    def run():
+        ErectionCost(input_dict, output_dict, TEMPLATE_PROJECT_ID).find_minimum_cost_cranes()
+
+    return no_setup, run
+
+
+@benchmark('model.ErectionCost.point_in_polygon')
+def crane_lift_point_in_polygon():
+    rng = np.random.RandomState(101)
+    polygon = [Point(0, 0), Point(0, 120), Point(50, 120), Point(400, 60), Point(400, 0)]
+    points = [Point(float(x), float(y)) for x, y in zip(rng.uniform(0, 500, 500), rng.uniform(0, 150, 500))]
+
+    def run():
+        for point in points:
+            point_in_polygon(point, polygon)
+
+    return no_setup, run
+
+
+@benchmark('io.read_project_data_xlsx')
+def read_project_data_xlsx():
+    xlsx_filename = os.path.join(TEMPLATE_DIR, 'project_data', 'ge15_public.xlsx')
+
+    def run():
+        xlsx = pd.ExcelFile(xlsx_filename)
+        {sheet_name: xlsx.parse(sheet_name) for sheet_name in xlsx.sheet_names}
+
+    return no_setup, run
+
+
+def grid_expansion_case(num_points):
+    """
+    Makes a case that expands a parametric list into a grid of num_points
+    projects and joins it to a project list.
+
+    Parameters
+    ----------
+    num_points : int
+        The number of points on the grid.
+
+    Returns
+    -------
+    callable
+        The case factory.
+    """
+    def factory():
+        parametric_list = synthetic.parametric_list(num_points)
+        project_list = pd.DataFrame([{'Project ID': 'project_1', 'Project data file': 'project_1_data'}])
+
+        def run():
+            xlsx_reader = XlsxReader()
+            parametric_value_list = xlsx_reader.create_parametric_value_list(parametric_list)
+            xlsx_reader.outer_join_projects_to_parametric_values(project_list, parametric_value_list)
+
+        return no_setup, run
+
+    return factory
+
+
+benchmark('io.parametric_grid_expansion_1e3')(grid_expansion_case(1000))
+benchmark('io.parametric_grid_expansion_1e5', quick=False)(grid_expansion_case(100000))
+
+
+@benchmark('io.write_costs_and_details_csv')
+def write_costs_and_details_csv():
+    costs = synthetic.cost_rows(num_projects=100)
+    details = synthetic.detail_rows(num_rows=20000)
+    output_dir = tempfile.mkdtemp(prefix='landbosse-benchmark-')
+    csv_generator = CsvGenerator(file_ops=None)
+
+    def run():
+        costs_df = csv_generator.create_costs_dataframe(costs)
+        costs_df.to_csv(os.path.join(output_dir, 'landbosse-costs.csv'), index=False)
+        details_df = csv_generator.create_details_dataframe(details)
+        details_df.to_csv(os.path.join(output_dir, 'landbosse-details.csv'), index=False)
+
+    return no_setup, run
+
+
+@benchmark('io.write_output_xlsx')
+def write_output_xlsx():
+    costs = synthetic.cost_rows(num_projects=100)
+    details = synthetic.detail_rows(num_rows=20000)
+
+    # The benchmark writes to a temporary directory.
+    output_dir = tempfile.mkdtemp(prefix='landbosse-benchmark-')
+    file_ops = XlsxFileOperations(RunConfiguration(output_dir=output_dir))
+
+    def run():
+        with XlsxGenerator('landbosse-output', file_ops) as xlsx:
+            xlsx.tab_costs_by_module_type_operation(rows=costs)
+            xlsx.tab_details(rows=details)
+
+    return no_setup, run
+
+
+def import_in_new_process(module_name):
+    """
+    Makes a case that imports a module in a new Python process. The time
+    includes starting the interpreter, which is the same for every case,
+    so the differences between cases are the import times.
+    """
+    repo_dir = os.path.dirname(TEMPLATE_DIR)
+
+    def run():
+        subprocess.run([sys.executable, '-c', f'import {module_name}'], cwd=repo_dir, check=True)
+
+    return no_setup, run
+
+
+@benchmark('startup.import_landbosse_model')
+def import_landbosse_model():
+    return import_in_new_process('landbosse.model')
+
+
+@benchmark('startup.import_landbosse_excelio')
+def import_landbosse_excelio():
+    return import_in_new_process('landbosse.excelio')
+
+
+@benchmark('startup.import_SubstationCost')
+def import_substation_cost():
+    return import_in_new_process('landbosse.model.SubstationCost')
+
+
+@benchmark('startup.import_FoundationSizing')
+def import_foundation_sizing():
+    return import_in_new_process('landbosse.model.FoundationSizing')
@@ -0,0 +1,238 @@
+"""
+This script runs the benchmark cases in cases.py and keeps a history of
+the results so that the performance of the model can be compared from
+one commit to the next.
+
+Run it from the root of the repository:
+
+python -m benchmarks.run_benchmarks [--filter text] [--quick] [--repeat n]
+                                    [--compare results.json] [--threshold fraction]
+                                    [--no-save]
+
+--filter runs only the cases whose names contain the text. --quick skips
+the slowest cases and repeats each case fewer times. --repeat sets the
+number of timed repetitions of each case.
+
+The results of each run are saved as a JSON file in benchmarks/results,
+named after the time of the run and the git commit. Each file records the
+machine, the versions of Python, pandas and NumPy, and the minimum,
+median, mean and standard deviation of the wall time of every case.
+
+After a run, the results are compared against the results file given with
+--compare or, if that option is missing, the most recent results file in
+benchmarks/results. Cases whose median time grew by more than the
+threshold (0.1, meaning 10%, by default) are reported as regressions and
+the script exits with status 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .cases import CASES
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def git_commit():
+    """
+    Returns
+    -------
+    str
+        The short hash of the commit checked out in the repository, with
+        '+dirty' appended if there are uncommitted changes. 'unknown' if
+        git is not available.
+    """
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=repo_dir,
+                                         stderr=subprocess.DEVNULL).decode('utf-8').strip()
+        status = subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=repo_dir,
+                                         stderr=subprocess.DEVNULL).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{commit}+dirty' if status else commit
+
+
+def machine_info():
+    """
+    Returns
+    -------
+    dict
+        Description of the machine and software the benchmarks ran on.
+        Results are only comparable between runs with the same machine.
+    """
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+    }
+
+
+def time_case(case, repeat):
+    """
+    Runs one case and times each repetition.
+
+    The first call of run() is a warm up that is not timed, so that
+    one time costs like filling caches are not counted. The output that
+    the model prints while the case runs is discarded.
+
+    Parameters
+    ----------
+    case : BenchmarkCase
+        The case to run.
+
+    repeat : int
+        The number of timed repetitions.
+
+    Returns
+    -------
+    dict
+        The timing statistics of the case, in seconds.
+    """
+    times = []
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull), warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        setup, run = case.factory()
+        run(*setup())
+
+        for _ in range(repeat):
+            args = setup()
+            start = time.perf_counter()
+            run(*args)
+            times.append(time.perf_counter() - start)
+
+    return {
+        'repeat': repeat,
+        'min_seconds': min(times),
+        'median_seconds': statistics.median(times),
+        'mean_seconds': statistics.mean(times),
+        'stdev_seconds': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'times_seconds': times,
+    }
+
+
+def latest_results_path():
+    """
+    Returns
+    -------
+    str or None
+        The path of the most recent results file or None if there are no
+        results yet.
+    """
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    filenames = sorted(f for f in os.listdir(RESULTS_DIR) if f.endswith('.json'))
+    return os.path.join(RESULTS_DIR, filenames[-1]) if filenames else None
+
+
+def compare(current, baseline, threshold):
+    """
+    Compares the median times of two sets of results.
+
+    Parameters
+    ----------
+    current : dict
+        Results of this run.
+
+    baseline : dict
+        Results of the run to compare against.
+
+    threshold : float
+        The fractional increase of the median time above which a case is
+        a regression.
+
+    Returns
+    -------
+    pandas.DataFrame, list
+        A table with one row per case that is in both sets of results and
+        the names of the cases that regressed.
+    """
+    rows = []
+    for name, result in current['cases'].items():
+        if name not in baseline['cases']:
+            continue
+        baseline_median = baseline['cases'][name]['median_seconds']
+        current_median = result['median_seconds']
+        rows.append({
+            'Case': name,
+            'Baseline median s': baseline_median,
+            'Current median s': current_median,
+            'Ratio': current_median / baseline_median if baseline_median > 0 else float('nan'),
+        })
+    comparison = pd.DataFrame(rows, columns=['Case', 'Baseline median s', 'Current median s', 'Ratio'])
+    regressions = list(comparison.loc[comparison['Ratio'] > 1 + threshold, 'Case'])
+    return comparison, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the LandBOSSE benchmarks.')
+    parser.add_argument('--filter', default='', help='Run only cases whose names contain this text.')
+    parser.add_argument('--quick', action='store_true', help='Skip slow cases and repeat fewer times.')
+    parser.add_argument('--repeat', type=int, default=None, help='Number of timed repetitions of each case.')
+    parser.add_argument('--compare', default=None, help='Results file to compare against.')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Fractional slowdown of the median time that counts as a regression.')
+    parser.add_argument('--no-save', action='store_true', help='Do not save the results of this run.')
+    args = parser.parse_args(argv)
+
+    repeat = args.repeat if args.repeat is not None else (3 if args.quick else 7)
+    cases = [case for case in CASES if args.filter in case.name and (case.quick or not args.quick)]
+
+    baseline_path = args.compare if args.compare is not None else latest_results_path()
+
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'machine': machine_info(),
+        'cases': dict(),
+    }
+
+    for case in cases:
+        print(f'>>> {case.name}', flush=True)
+        result = time_case(case, repeat)
+        results['cases'][case.name] = result
+        print(f'    median {result["median_seconds"]:.4f} s, min {result["min_seconds"]:.4f} s')
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        commit = results['commit'].replace('+', '-')
+        results_path = os.path.join(RESULTS_DIR, f'{timestamp}_{commit}.json')
+        with open(results_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'>>> Results saved to {results_path}')
+
+    if baseline_path is None:
+        return 0
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    comparison, regressions = compare(results, baseline, args.threshold)
+    print(f'>>> Compared with {baseline_path} (commit {baseline["commit"]})')
+    if baseline['machine'] != results['machine']:
+        print('>>> Warning: the baseline ran on a different machine or software versions.')
+    print(comparison.to_string(index=False))
+
+    if regressions:
+        print(f'>>> Regressions of more than {args.threshold:.0%}: {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
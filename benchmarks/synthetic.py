@@ -0,0 +1,209 @@
+"""
+This module generates synthetic inputs for the benchmarks. Every generator
+is seeded so that each run of the benchmarks measures the same work.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def parametric_list(num_points, project_id='project_1', num_axes=None):
+    """
+    Makes a parametric list, in the format of the "Parametric list" sheet
+    of project_list.xlsx, that expands to num_points points on the grid.
+
+    Each axis of the grid has 10 values, so num_points should be a power
+    of 10.
+
+    Parameters
+    ----------
+    num_points : int
+        The number of points on the grid, such as 1000 or 100000.
+
+    project_id : str
+        The Project ID the parametric variables belong to.
+
+    num_axes : int
+        The number of parametric variables. If None, it is calculated
+        from num_points.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The parametric list.
+    """
+    if num_axes is None:
+        num_axes = int(round(np.log10(num_points)))
+    rows = []
+    for axis in range(num_axes):
+        rows.append({
+            'Project ID': project_id,
+            'Dataframe name': 'components',
+            'Row name': f'Component {axis}',
+            'Column name': 'Mass tonne',
+            'Min': 10.0,
+            'Max': 19.0,
+            'Step': 1.0,
+        })
+    return pd.DataFrame(rows)
+
+
+def cost_rows(num_projects, seed=101):
+    """
+    Makes rows for the costs outputs, in the format of the lists under the
+    keys ending in '_module_type_operation' in the output dictionaries.
+
+    Parameters
+    ----------
+    num_projects : int
+        The number of projects. Each project has one row for each module
+        and type of cost.
+
+    seed : int
+        The seed for the random number generator.
+
+    Returns
+    -------
+    list
+        The list of cost rows.
+    """
+    rng = np.random.RandomState(seed)
+    modules = ['Collection', 'Development', 'Erection', 'Foundation', 'Grid connection',
+               'Management', 'Site preparation', 'Substation']
+    types_of_cost = ['Equipment rental', 'Labor', 'Materials', 'Mobilization', 'Other']
+    rows = []
+    for project in range(num_projects):
+        for module in modules:
+            for type_of_cost in types_of_cost:
+                cost_per_project = rng.uniform(1e4, 1e7)
+                rows.append({
+                    'operation_id': f'{module} operation',
+                    'type_of_cost': type_of_cost,
+                    'raw_cost': cost_per_project,
+                    'turbine_rating_MW': 2.5,
+                    'num_turbines': 100,
+                    'rotor_diameter_m': 120.0,
+                    'project_id_with_serial': f'project_{project:06d}',
+                    'module': module,
+                    'raw_cost_total_or_per_turbine': 'total',
+                    'cost_per_turbine': cost_per_project / 100,
+                    'cost_per_project': cost_per_project,
+                    'usd_per_kw_per_project': cost_per_project / 250000,
+                })
+    return rows
+
+
+def detail_rows(num_rows, seed=101):
+    """
+    Makes rows for the details outputs, in the format of the lists under
+    the keys ending in '_csv' in the output dictionaries. About a third of
+    the rows are non-numeric.
+
+    Parameters
+    ----------
+    num_rows : int
+        The number of rows.
+
+    seed : int
+        The seed for the random number generator.
+
+    Returns
+    -------
+    list
+        The list of detail rows.
+    """
+    rng = np.random.RandomState(seed)
+    values = rng.uniform(0, 1e6, num_rows)
+    rows = []
+    for index in range(num_rows):
+        row = {
+            'project_id_with_serial': f'project_{index // 200:06d}',
+            'module': 'FoundationCost',
+            'type': 'variable',
+            'variable_df_key_col_name': f'Variable {index % 200}',
+            'unit': 'usd',
+        }
+        if index % 3 == 0:
+            row['value'] = f'Operation {index} <--> {values[index]}'
+            row['last_number'] = values[index]
+        else:
+            row['value'] = values[index]
+        rows.append(row)
+    return rows
+
+
+def weather_window(num_hours, seed=101):
+    """
+    Makes a weather window in the format returned by read_weather_window(),
+    with wind speeds drawn from a Weibull distribution.
+
+    Parameters
+    ----------
+    num_hours : int
+        The number of hours in the weather window.
+
+    seed : int
+        The seed for the random number generator.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The weather window.
+    """
+    rng = np.random.RandomState(seed)
+    hours = pd.date_range('2011-01-01', periods=num_hours, freq='H')
+    seasons = {12: 'winter', 1: 'winter', 2: 'winter', 3: 'spring', 4: 'spring', 5: 'spring',
+               6: 'summer', 7: 'summer', 8: 'summer', 9: 'fall', 10: 'fall', 11: 'fall'}
+    return pd.DataFrame({
+        'Date UTC': hours,
+        'Hour': hours.hour,
+        'Time window': np.where((hours.hour >= 7) & (hours.hour < 17), 'normal', 'long'),
+        'Season': hours.month.map(seasons),
+        'Speed m per s': 8.0 * rng.weibull(2.0, num_hours),
+        'Pressure atm': 1.0,
+        'Temp C': 15.0,
+    })
+
+
+def closed_form_projects(num_projects, seed=101):
+    """
+    Makes a table of projects for BatchClosedFormCost, with sizes and
+    costs drawn at random across the utility and distributed ranges.
+
+    Parameters
+    ----------
+    num_projects : int
+        The number of projects.
+
+    seed : int
+        The seed for the random number generator.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The projects table.
+    """
+    rng = np.random.RandomState(seed)
+    num_turbines = rng.randint(1, 300, num_projects)
+    turbine_rating_MW = rng.choice([1.5, 2.0, 2.5, 3.0, 4.0], num_projects)
+    return pd.DataFrame({
+        'project_id_with_serial': [f'project_{index:06d}' for index in range(num_projects)],
+        'num_turbines': num_turbines,
+        'turbine_rating_MW': turbine_rating_MW,
+        'rotor_diameter_m': 120.0,
+        'project_size_megawatts': num_turbines * turbine_rating_MW,
+        'interconnect_voltage_kV': rng.choice([34.5, 69, 138, 230, 345], num_projects),
+        'distance_to_interconnect_mi': rng.uniform(0, 50, num_projects),
+        'new_switchyard': rng.rand(num_projects) > 0.5,
+        'development_labor_cost_usd': rng.uniform(1e5, 1e7, num_projects),
+        'project_value_usd': rng.uniform(1e7, 1e9, num_projects),
+        'foundation_cost_usd': rng.uniform(1e6, 1e8, num_projects),
+        'actual_construction_months': rng.randint(6, 40, num_projects),
+        'num_hwy_permits': 10,
+        'hub_height_meters': rng.uniform(60, 140, num_projects),
+        'markup_contingency': 0.03,
+        'markup_warranty_management': 0.0002,
+        'markup_sales_and_use_tax': 0,
+        'markup_overhead': 0.05,
+        'markup_profit_margin': 0.05,
+    })
@@ -0,0 +1,409 @@
+"""
+This module is a long running evaluation server for LandBOSSE. It is meant
+for optimizers and other programs that evaluate thousands of projects and
+cannot afford to start Python, import pandas and parse the project data
+.xlsx files for every evaluation.
+
+The server reads JSON-RPC 2.0 requests from stdin, one per line, and
+writes one response per line to stdout. Start it with the input folder
+whose project_data .xlsx files should be loaded:
+
+python -m landbosse.api.EvaluationServer --input-dir project_input_template --workers 4
+
+Every .xlsx file in the project_data folder is read when the server starts,
+in the server process and in each worker process, so evaluations do not
+read any files. The methods are:
+
+evaluate
+    params: {"projects": [parameters, ...], "details": false}
+
+    Each element of projects is a dictionary with the same names as the
+    columns of project_list.xlsx, including 'Project data file'. The result
+    is a list with one element per project, in the same order, with the
+    keys project_id_with_serial, costs (a list of rows with the columns of
+    landbosse-costs.csv), failures, elapsed_seconds and, if details is
+    true, details (a list of rows with the columns of
+    landbosse-details.csv).
+
+preload
+    params: {"project_data_file": "ge15_public"}
+
+    Reads a project data file that was added after the server started.
+    The result is the list of its sheet names.
+
+shutdown
+    Stops the server after responding.
+
+With --workers greater than 0, the projects of a batch are spread over
+that many worker processes, which are started once and kept for the life
+of the server. With --workers 0, projects run in the server process.
+
+The cost modules print their progress. stdout is reserved for responses,
+so that output is sent to stderr instead.
+"""
+
+import argparse
+import inspect
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+
+from ..excelio import XlsxDataframeCache
+from ..excelio import XlsxReader
+from ..model import Manager
+from .InMemoryRunner import InMemoryRunner
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# _project_data_dir is the folder that project data files are read from in
+# this process. It is set by preload_project_data().
+_project_data_dir = None
+
+
+def preload_project_data(project_data_dir, stdout_to_stderr=False):
+    """
+    Reads every .xlsx file in a project data folder into
+    XlsxDataframeCache. This runs in the server process and once in each
+    worker process when the worker starts.
+
+    Parameters
+    ----------
+    project_data_dir : str
+        The project data folder.
+
+    stdout_to_stderr : bool
+        True to send output that would go to stdout to stderr from here
+        on. Worker processes do this because stdout carries the responses
+        of the server.
+    """
+    global _project_data_dir
+    _project_data_dir = project_data_dir
+    if stdout_to_stderr:
+        sys.stdout = sys.stderr
+    for filename in sorted(os.listdir(project_data_dir)):
+        if filename.endswith('.xlsx') and not filename.startswith('~$'):
+            XlsxDataframeCache.read_all_sheets_from_xlsx(filename[:-len('.xlsx')], project_data_dir)
+
+
+def evaluate_project(project_parameters, include_details=False):
+    """
+    Runs one project with the project data preloaded in this process.
+
+    Parameters
+    ----------
+    project_parameters : dict
+        The parameters of the project, including 'Project data file'.
+
+    include_details : bool
+        True to include the details in the result.
+
+    Returns
+    -------
+    dict
+        The result of the project, ready to be serialized as JSON.
+    """
+    start = time.perf_counter()
+    try:
+        project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_parameters['Project data file'],
+                                                                           _project_data_dir)
+    except Exception as error:
+        # A project data file that cannot be read, such as one that does
+        # not exist, fails only this project, as XlsxReader failures do in
+        # InMemoryRunner.run(), and the rest of the batch still runs.
+        traceback.print_exc()
+        project_id_with_serial = XlsxReader().project_id_with_serial(pd.Series(project_parameters))
+        failure = Manager.failure_record(project_id_with_serial, 'XlsxReader', error, time.perf_counter() - start)
+        result = {
+            'project_id_with_serial': project_id_with_serial,
+            'costs': pd.DataFrame(),
+            'details': pd.DataFrame(),
+            'failures': [failure],
+        }
+    else:
+        # Without details, the cost modules skip making them.
+        detail_level = 'full' if include_details else 'none'
+        result = InMemoryRunner(project_data_sheets, detail_level=detail_level).run(project_parameters)
+    response = {
+        'project_id_with_serial': result['project_id_with_serial'],
+        'costs': to_records(result['costs']),
+        'failures': [{key: failure[key] for key in ['module', 'exception', 'message', 'traceback']}
+                     for failure in result['failures']],
+        'elapsed_seconds': time.perf_counter() - start,
+    }
+    if include_details:
+        response['details'] = to_records(result['details'])
+    return response
+
+
+def to_records(dataframe):
+    """
+    Converts a dataframe to a list of rows for a response. Missing values,
+    like the Non-numeric value of a detail that is a number, become None,
+    which is written as null, because NaN is not valid JSON.
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame
+        The costs or details of a project.
+
+    Returns
+    -------
+    list
+        One dictionary per row.
+    """
+    return dataframe.astype(object).where(dataframe.notna(), None).to_dict(orient='records')
+
+
+def to_json_value(value):
+    """
+    Converts the NumPy and pandas values that json cannot serialize.
+    Used as the default argument of json.dumps().
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class RpcError(Exception):
+    """
+    Raised by the methods of EvaluationServer to respond with a JSON-RPC
+    error.
+    """
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class EvaluationServer:
+    """
+    Answers JSON-RPC requests to evaluate projects. See the module
+    documentation for the methods.
+    """
+
+    def __init__(self, input_dir, workers=0):
+        """
+        Reads the project data and starts the worker processes.
+
+        Parameters
+        ----------
+        input_dir : str
+            The input folder. Its project_data folder holds the project
+            data .xlsx files.
+
+        workers : int
+            The number of worker processes. 0 runs projects in the server
+            process.
+        """
+        self.project_data_dir = os.path.join(input_dir, 'project_data')
+        preload_project_data(self.project_data_dir)
+        self.workers = workers
+        self.executor = self.create_executor() if workers > 0 else None
+        self.running = True
+
+    def create_executor(self):
+        """
+        Starts the worker processes, each of which reads the project data
+        when it starts.
+
+        Returns
+        -------
+        concurrent.futures.ProcessPoolExecutor
+            The pool of worker processes.
+        """
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=preload_project_data,
+                                   initargs=(self.project_data_dir, True))
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def evaluate(self, projects, details=False):
+        """
+        Runs a batch of projects.
+
+        Parameters
+        ----------
+        projects : list
+            The parameters of each project.
+
+        details : bool
+            True to include the details of each project.
+
+        Returns
+        -------
+        list
+            The result of each project. See evaluate_project().
+
+        Raises
+        ------
+        RpcError
+            If the parameters are invalid, or a worker process died while
+            the batch ran. The worker processes are restarted in that case,
+            so the next batches run.
+        """
+        if not isinstance(projects, list) or not all(isinstance(project, dict) for project in projects):
+            raise RpcError(INVALID_PARAMS, 'projects must be a list of objects')
+        missing = [index for index, project in enumerate(projects) if 'Project data file' not in project]
+        if missing:
+            raise RpcError(INVALID_PARAMS, f"Projects at positions {missing} have no 'Project data file'")
+
+        if self.executor is None or len(projects) == 1:
+            return [evaluate_project(project, details) for project in projects]
+        try:
+            return list(self.executor.map(evaluate_project, projects, [details] * len(projects)))
+        except BrokenProcessPool as error:
+            # A worker process that dies, as when it runs out of memory,
+            # breaks the pool, which then refuses all work. It is replaced
+            # with a new pool and only this batch fails. The futures of the
+            # broken pool have already failed, so there is nothing to cancel.
+            self.executor.shutdown(wait=False)
+            self.executor = self.create_executor()
+            raise RpcError(INTERNAL_ERROR, f'A worker process died while evaluating the batch: {error}')
+
+    def preload(self, project_data_file):
+        """
+        Reads a project data file in the server process. Worker processes
+        read it when they first need it.
+
+        Parameters
+        ----------
+        project_data_file : str
+            The name of the project data file, without .xlsx.
+
+        Returns
+        -------
+        list
+            The names of the sheets in the file.
+        """
+        try:
+            sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_file, self.project_data_dir)
+        except FileNotFoundError as error:
+            raise RpcError(INVALID_PARAMS, str(error))
+        return list(sheets.keys())
+
+    def shutdown(self):
+        """
+        Stops the server after this request.
+        """
+        self.running = False
+        return None
+
+    def handle(self, line):
+        """
+        Answers one request.
+
+        Parameters
+        ----------
+        line : str
+            The JSON text of the request.
+
+        Returns
+        -------
+        dict or None
+            The response, or None if the request is a notification, which
+            has no id and gets no response.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            return {'jsonrpc': '2.0', 'id': None, 'error': {'code': PARSE_ERROR, 'message': str(error)}}
+
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return {'jsonrpc': '2.0', 'id': None, 'error': {'code': INVALID_REQUEST, 'message': 'Invalid request'}}
+
+        request_id = request.get('id')
+        methods = {'evaluate': self.evaluate, 'preload': self.preload, 'shutdown': self.shutdown}
+        try:
+            if request['method'] not in methods:
+                raise RpcError(METHOD_NOT_FOUND, f'Method {request["method"]} not found')
+            params = request.get('params', dict())
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, 'params must be an object')
+            # Only parameters that do not match the method are invalid. A
+            # TypeError raised inside the method is an internal error.
+            method = methods[request['method']]
+            try:
+                inspect.signature(method).bind(**params)
+            except TypeError as error:
+                raise RpcError(INVALID_PARAMS, str(error))
+            result = method(**params)
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+        except RpcError as error:
+            response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': error.code, 'message': error.message}}
+        except Exception as error:
+            response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': INTERNAL_ERROR, 'message': repr(error)}}
+
+        return response if 'id' in request else None
+
+    def serve(self, instream, outstream):
+        """
+        Answers requests, one per line, until instream ends or shutdown is
+        requested.
+
+        Parameters
+        ----------
+        instream : file
+            The stream requests are read from.
+
+        outstream : file
+            The stream responses are written to.
+        """
+        for line in instream:
+            if not line.strip():
+                continue
+            with redirect_stdout(sys.stderr):
+                response = self.handle(line)
+            if response is not None:
+                try:
+                    text = json.dumps(response, default=to_json_value, allow_nan=False)
+                except ValueError as error:
+                    # A result with a value that is not finite, like an
+                    # infinite cost, cannot be written as strict JSON.
+                    text = json.dumps({'jsonrpc': '2.0', 'id': response['id'],
+                                       'error': {'code': INTERNAL_ERROR, 'message': repr(error)}})
+                outstream.write(text + '\n')
+                outstream.flush()
+            if not self.running:
+                break
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Evaluate LandBOSSE projects with JSON-RPC over stdin and stdout.')
+    parser.add_argument('--input-dir', required=True, help='Input folder with a project_data folder.')
+    parser.add_argument('--workers', type=int, default=0, help='Number of worker processes. 0 runs in this process.')
+    args = parser.parse_args(argv)
+
+    # Anything printed while the project data is read goes to stderr, so
+    # stdout only carries responses.
+    with redirect_stdout(sys.stderr):
+        server = EvaluationServer(args.input_dir, args.workers)
+    try:
+        server.serve(sys.stdin, sys.stdout)
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
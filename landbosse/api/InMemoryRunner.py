@@ -0,0 +1,196 @@
+import time
+import traceback
+
+import pandas as pd
+
+from ..excelio import XlsxReader
+from ..excelio import XlsxDataframeCache
+from ..excelio import CsvGenerator
+from ..model import Manager
+
+
+class InMemoryRunner:
+    """
+    InMemoryRunner runs LandBOSSE projects from data that is already in
+    memory. It is meant for embedding LandBOSSE in other programs, such as
+    an optimizer that calls it many times with different parameters.
+
+    Unlike the XlsxManagerRunner subclasses, it does not read
+    project_list.xlsx or the project data .xlsx files, does not look at
+    the command line or environment variables and does not write any
+    files. The project data sheets are given once, when the runner is
+    created, and each call of run() gives the parameters of one project:
+
+    sheets = XlsxDataframeCache.read_all_sheets_from_xlsx('ge15_public', 'project_data')
+    runner = InMemoryRunner(sheets)
+    result = runner.run({'Project ID': 'ge15', 'Number of turbines': 100, ...})
+    result['costs']
+
+    The parameters are the columns of a row of project_list.xlsx. The
+    project data sheets are copied for each run, because creating the
+    master input dictionary modifies them, so the sheets given to the
+    runner are never changed.
+    """
+
+    def __init__(self, project_data_sheets, module_threads=1, detail_level='full', detail_modules=None):
+        """
+        Parameters
+        ----------
+        project_data_sheets : dict
+            The project data. Keys are the names of the sheets of a project
+            data .xlsx file and values are the dataframes of those sheets.
+
+        module_threads : int
+            The number of threads Manager runs the cost modules on.
+
+        detail_level : str
+            'none', 'summary' or 'full'. Callers that only use the costs
+            can skip making the details with 'none'. See
+            CostModule.detail_level().
+
+        detail_modules : iterable
+            The names of the only modules that make details, or None for
+            all of them.
+        """
+        self.project_data_sheets = project_data_sheets
+        self.module_threads = module_threads
+        self.detail_level = detail_level
+        self.detail_modules = detail_modules
+        self.xlsx_reader = XlsxReader()
+        # CsvGenerator does not use its file operations to make
+        # dataframes, so it does not need any.
+        self.csv_generator = CsvGenerator(file_ops=None)
+
+    def run(self, project_parameters, enable_cost_and_scaling_modifications=False):
+        """
+        Runs one project.
+
+        Parameters
+        ----------
+        project_parameters : dict or pandas.Series
+            The parameters of the project, under the same names as the
+            columns of project_list.xlsx. This is not modified.
+
+        enable_cost_and_scaling_modifications : bool
+            True to apply the cost and scaling modifications of the scaling
+            study to the parameters before the run.
+
+        Returns
+        -------
+        dict
+            project_id_with_serial : str
+                The Project ID with serial, or the Project ID if the
+                parameters have no serial.
+
+            costs : pandas.DataFrame
+                The costs, with the same columns as landbosse-costs.csv.
+                Empty if the project failed.
+
+            details : pandas.DataFrame
+                The details, with the same columns as landbosse-details.csv.
+                Empty if the project failed.
+
+            failures : list
+                Failure records of the project. See Manager.failure_record().
+                Empty if the project ran successfully.
+
+            output_dict : dict
+                The output dictionary of the project. It can be given to
+                Manager.recompute() along with the master input dictionary.
+
+            input_dict : dict
+                The master input dictionary of the project.
+        """
+        project_parameters = pd.Series(project_parameters).copy()
+        if enable_cost_and_scaling_modifications:
+            self.xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
+        project_id_with_serial = self.xlsx_reader.project_id_with_serial(project_parameters)
+
+        output_dict = dict()
+        input_dict = None
+        start = time.perf_counter()
+        try:
+            sheets = XlsxDataframeCache.copy_dataframes(self.project_data_sheets)
+            input_dict = self.xlsx_reader.create_master_input_dictionary(sheets, project_parameters)
+        except Exception as error:
+            traceback.print_exc()
+            elapsed_seconds = time.perf_counter() - start
+            output_dict['failures'] = [Manager.failure_record(project_id_with_serial, 'XlsxReader', error, elapsed_seconds)]
+        else:
+            manager = Manager(input_dict=input_dict, output_dict=output_dict, max_workers=self.module_threads,
+                              detail_level=self.detail_level, detail_modules=self.detail_modules)
+            manager.execute_landbosse(project_name=project_id_with_serial)
+
+        return self.result(project_id_with_serial, input_dict, output_dict)
+
+    def recompute(self, result, changed_inputs):
+        """
+        Runs a project again after some values in its master input
+        dictionary have changed, running only the cost modules that read
+        them. See Manager.recompute().
+
+        Parameters
+        ----------
+        result : dict
+            The result of a previous call of run() or recompute(). The
+            changed values must already be set in result['input_dict'].
+            The input and output dictionaries of the result are reused and
+            modified.
+
+        changed_inputs : iterable
+            The keys of the master input dictionary that changed.
+
+        Returns
+        -------
+        dict
+            See run() for the keys.
+        """
+        input_dict = result['input_dict']
+        output_dict = result['output_dict']
+        if input_dict is None:
+            raise ValueError('The master input dictionary of a project that failed in XlsxReader cannot be recomputed')
+        project_id_with_serial = result['project_id_with_serial']
+        manager = Manager(input_dict=input_dict, output_dict=output_dict, max_workers=self.module_threads,
+                          detail_level=self.detail_level, detail_modules=self.detail_modules)
+        manager.recompute(project_id_with_serial, changed_inputs)
+        return self.result(project_id_with_serial, input_dict, output_dict)
+
+    def result(self, project_id_with_serial, input_dict, output_dict):
+        """
+        Makes the cost and detail tables of a project from its output
+        dictionary.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The Project ID with serial of the project.
+
+        input_dict : dict
+            The master input dictionary of the project.
+
+        output_dict : dict
+            The output dictionary of the project.
+
+        Returns
+        -------
+        dict
+            See run() for the keys.
+        """
+        failures = output_dict['failures']
+        costs = []
+        details = []
+        if len(failures) == 0:
+            for key, value in output_dict.items():
+                if key.endswith('_module_type_operation'):
+                    costs.extend(value)
+                elif key.endswith('_csv'):
+                    details.extend(value)
+
+        return {
+            'project_id_with_serial': project_id_with_serial,
+            'costs': self.csv_generator.create_costs_dataframe(costs),
+            'details': self.csv_generator.create_details_dataframe(details),
+            'failures': failures,
+            'output_dict': output_dict,
+            'input_dict': input_dict,
+        }
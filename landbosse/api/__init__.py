@@ -0,0 +1,7 @@
+from ..lazy import lazy_exports
+
+# The classes exported by this package and the modules that define them.
+# See landbosse/lazy.py.
+lazy_exports(__name__, {
+    'InMemoryRunner': 'InMemoryRunner',
+})
@@ -0,0 +1,145 @@
+from .XlsxOperationException import XlsxOperationException
+
+
+class BaselineComparison:
+    """
+    This class compares the costs of every project of a run with the costs
+    of a baseline project, as
+    post_processing_scripts/sql_queries/everything_against_baseline.sql
+    does in PostgreSQL, without loading the results into a database.
+
+    The baseline is either a project named by its Project ID with serial,
+    or the one project of the extended project list that matches a filter,
+    which is a pandas query() expression on its columns. Column names with
+    spaces are quoted with backticks:
+
+    `Hub height m` == 90 and `Turbine rating MW` == 2.5 and `Number of turbines` * `Turbine rating MW` == 150
+
+    Each cost row is joined with the cost of the baseline for the same
+    Module and Type of cost. For each of Cost per turbine, Cost per
+    project and Cost per kW, the comparison has the baseline cost, the
+    difference from it (the delta) and the ratio to it. The ratio is
+    missing where the baseline cost is zero, and all three are missing for
+    costs that the baseline does not have.
+
+    Once the baseline costs are set, compare() joins any number of cost
+    rows in one vectorized merge, so the costs can be compared all at once
+    or in chunks as they are read.
+
+    comparison = BaselineComparison(baseline_filter='`Hub height m` == 90')
+    baseline_id = comparison.find_baseline(extended_project_list)
+    comparison.set_baseline_costs(costs)
+    compared = comparison.compare(costs)
+    """
+
+    # The costs that are compared, and the prefixes of the columns of the
+    # comparison.
+    cost_columns = ['Cost per turbine', 'Cost per project', 'Cost per kW']
+    key_columns = ['Module', 'Type of cost']
+
+    def __init__(self, baseline_project=None, baseline_filter=None):
+        """
+        Exactly one of baseline_project and baseline_filter must be given.
+
+        Parameters
+        ----------
+        baseline_project : str
+            The Project ID with serial of the baseline project.
+
+        baseline_filter : str
+            A query() expression that matches the baseline project in the
+            extended project list.
+        """
+        if (baseline_project is None) == (baseline_filter is None):
+            raise ValueError('Exactly one of baseline_project and baseline_filter must be given.')
+        self.baseline_project = baseline_project
+        self.baseline_filter = baseline_filter
+        self.baseline_id = baseline_project
+        self.baseline_costs = None
+
+    def find_baseline(self, extended_project_list):
+        """
+        Finds the baseline project in the extended project list.
+
+        Parameters
+        ----------
+        extended_project_list : pandas.DataFrame
+            The extended project list of the run. Projects without a
+            Project ID with serial are matched by their Project ID.
+
+        Returns
+        -------
+        str
+            The Project ID with serial of the baseline.
+
+        Raises
+        ------
+        XlsxOperationException
+            If no project, or more than one project, matches.
+        """
+        projects = extended_project_list.copy()
+        if 'Project ID with serial' in projects.columns:
+            projects['Project ID with serial'] = projects['Project ID with serial'].fillna(projects['Project ID'])
+        else:
+            projects['Project ID with serial'] = projects['Project ID']
+
+        if self.baseline_filter is not None:
+            matches = projects.query(self.baseline_filter)
+            description = f'the baseline filter {self.baseline_filter}'
+        else:
+            matches = projects[projects['Project ID with serial'] == self.baseline_project]
+            description = f'the baseline project {self.baseline_project}'
+
+        matching_ids = list(matches['Project ID with serial'].unique())
+        if len(matching_ids) != 1:
+            raise XlsxOperationException(f'{len(matching_ids)} projects match {description}. '
+                                         f'Exactly one must match: {matching_ids}')
+        self.baseline_id = matching_ids[0]
+        return self.baseline_id
+
+    def set_baseline_costs(self, costs):
+        """
+        Takes the costs of the baseline from cost rows that include them.
+
+        Parameters
+        ----------
+        costs : pandas.DataFrame
+            Cost rows, as made by CsvGenerator.create_costs_dataframe(),
+            including those of the baseline project.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the costs have no rows of the baseline, as when the
+            baseline project failed.
+        """
+        baseline_costs = costs.loc[costs['Project ID with serial'] == self.baseline_id,
+                                   self.key_columns + self.cost_columns]
+        if len(baseline_costs) == 0:
+            raise XlsxOperationException(f'There are no costs of the baseline project {self.baseline_id}.')
+        self.baseline_costs = baseline_costs.rename(
+            columns={column: f'Baseline {column[0].lower()}{column[1:]}' for column in self.cost_columns})
+
+    def compare(self, costs):
+        """
+        Compares cost rows with the baseline.
+
+        Parameters
+        ----------
+        costs : pandas.DataFrame
+            Cost rows, as made by CsvGenerator.create_costs_dataframe().
+
+        Returns
+        -------
+        pandas.DataFrame
+            The cost rows in the same order, with the Baseline project ID
+            with serial and the baseline, delta and ratio of each cost.
+        """
+        compared = costs.merge(self.baseline_costs, on=self.key_columns, how='left', sort=False)
+        compared.insert(len(costs.columns), 'Baseline project ID with serial', self.baseline_id)
+        for column in self.cost_columns:
+            name = f'{column[0].lower()}{column[1:]}'
+            baseline = compared[f'Baseline {name}']
+            compared[f'Delta {name}'] = compared[column] - baseline
+            compared[f'Ratio {name}'] = compared[column] / baseline.where(baseline != 0)
+        return compared
@@ -88,6 +88,32 @@ class CsvGenerator:
         costs_df = pd.DataFrame(new_rows)
         return costs_df
 
+    def create_failures_dataframe(self, failures):
+        """
+        Parameters
+        ----------
+        failures : list[dict]
+            The list of failure records. See Manager.failure_record()
+
+        Returns
+        -------
+        pd.DataFrame
+            A dataframe to be written as a .csv
+        """
+        new_rows = []
+        for row in failures:
+            new_row = {
+                "Project ID with serial": row["project_id_with_serial"],
+                "Module": row["module"],
+                "Exception": row["exception"],
+                "Message": row["message"],
+                "Elapsed seconds": row["elapsed_seconds"],
+                "Traceback": row["traceback"]
+            }
+            new_rows.append(new_row)
+        failures_df = pd.DataFrame(new_rows)
+        return failures_df
+
     def _is_numeric(self, value):
         """
         This method tests if a value is a numeric (that is, can be parsed
@@ -0,0 +1,120 @@
+import pandas as pd
+
+
+class LcoeCalculator:
+    """
+    This class calculates the levelized cost of energy (LCOE) of every
+    project of a run from its balance-of-system costs, in the same way as
+    post_processing_scripts/lcoe.py, but from the costs in memory rather
+    than from landbosse-output.xlsx.
+
+    The annual energy production (AEP) and the turbine capital cost (TCC)
+    of each turbine come from two tables keyed by Rating [kW] and Rotor
+    Diam [m]:
+
+    aep
+        With the column AEP [kWh/yr], the energy produced by one turbine in
+        a year.
+
+    tcc
+        With the column TCC [USD/kW], the capital cost of the turbine.
+
+    With the fixed charge rate (FCR) and the operating expenses (Opex) per
+    kW of capacity per year, the LCOE of a project is:
+
+    ((BOS Capex + Turbine Capex) * FCR + Total Opex) / (AEP * Number of turbines)
+
+    where BOS Capex is the sum of the Cost per project of all the costs of
+    the project, Turbine Capex is TCC * Rating * Number of turbines and
+    Total Opex is Opex * Rating * Number of turbines.
+
+    calculate() does this for all the projects at once, with one groupby
+    of the costs and one merge with the AEP and TCC.
+    """
+
+    key_columns = ['Rating [kW]', 'Rotor Diam [m]']
+
+    def __init__(self, aep, tcc, fcr=0.079, opex_usd_per_kw=52.0):
+        """
+        Parameters
+        ----------
+        aep : pandas.DataFrame
+            The AEP table.
+
+        tcc : pandas.DataFrame
+            The TCC table.
+
+        fcr : float
+            The fixed charge rate.
+
+        opex_usd_per_kw : float
+            The operating expenses per kW of capacity per year.
+        """
+        # The AEP and TCC of each turbine are joined once, as the tables
+        # are the same for every run.
+        self.aep_tcc = aep.merge(tcc, on=self.key_columns)
+        self.fcr = fcr
+        self.opex_usd_per_kw = opex_usd_per_kw
+
+    @classmethod
+    def from_csv(cls, aep_csv, tcc_csv, fcr=0.079, opex_usd_per_kw=52.0):
+        """
+        Reads the AEP and TCC tables from .csv files.
+
+        Parameters
+        ----------
+        aep_csv : str
+            The path of the AEP .csv file.
+
+        tcc_csv : str
+            The path of the TCC .csv file.
+
+        fcr : float
+            The fixed charge rate.
+
+        opex_usd_per_kw : float
+            The operating expenses per kW of capacity per year.
+
+        Returns
+        -------
+        LcoeCalculator
+            The calculator.
+        """
+        return cls(pd.read_csv(aep_csv), pd.read_csv(tcc_csv), fcr, opex_usd_per_kw)
+
+    def calculate(self, costs):
+        """
+        Calculates the LCOE of every project.
+
+        Parameters
+        ----------
+        costs : pandas.DataFrame
+            The costs, as made by CsvGenerator.create_costs_dataframe().
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per project, in the order of the costs, with its BOS
+            Capex, AEP, TCC, FCR, Opex and LCOE [USD/kWh]. Projects whose
+            rating and rotor diameter are not in the AEP and TCC tables
+            have a missing LCOE.
+        """
+        bos = costs.groupby(['Project ID with serial', 'Number of turbines', 'Turbine rating MW', 'Rotor diameter m'],
+                            sort=False)['Cost per project'].sum().reset_index()
+        # The rating is rounded so that ratings like 2.3 MW match 2300 kW
+        # exactly after the conversion.
+        bos['Rating [kW]'] = (bos['Turbine rating MW'] * 1000).round(6)
+        bos = bos.rename(columns={'Rotor diameter m': 'Rotor Diam [m]', 'Cost per project': 'BOS Capex [USD]'})
+        bos = bos[['Project ID with serial', 'Number of turbines', 'Rating [kW]', 'Rotor Diam [m]', 'BOS Capex [USD]']]
+
+        lcoe = bos.merge(self.aep_tcc, on=self.key_columns, how='left', sort=False)
+        lcoe['FCR'] = self.fcr
+        lcoe['Opex [USD/kW]'] = self.opex_usd_per_kw
+
+        capacity_kw = lcoe['Rating [kW]'] * lcoe['Number of turbines']
+        lcoe['Total Opex [USD]'] = lcoe['Opex [USD/kW]'] * capacity_kw
+        lcoe['Turbine Capex [USD]'] = lcoe['TCC [USD/kW]'] * capacity_kw
+        capex_times_fcr = (lcoe['BOS Capex [USD]'] + lcoe['Turbine Capex [USD]']) * lcoe['FCR']
+        aep_all_turbines = lcoe['AEP [kWh/yr]'] * lcoe['Number of turbines']
+        lcoe['LCOE [USD/kWh]'] = (capex_times_fcr + lcoe['Total Opex [USD]']) / aep_all_turbines
+        return lcoe
@@ -0,0 +1,240 @@
+import hashlib
+import os
+import pickle
+
+import pandas as pd
+
+
+class ProjectResultCache:
+    """
+    This class is a content addressed cache of project results that
+    lives on disk.
+
+    Each project gets a fingerprint that is a SHA-256 hash of three
+    things:
+
+    1. The row of project parameters after the parametric modifications
+       (and, if enabled, the cost and scaling modifications) have been
+       applied to it.
+
+    2. Every project_data sheet the project consumes, also after the
+       parametric modifications have been applied.
+
+    3. The version of the model code, which is a hash of the source of
+       every .py file in the landbosse package.
+
+    Runs with less than the full details (see CostModule.detail_level())
+    also hash the detail level and modules, so that they neither reuse
+    nor replace the results of runs with all the details.
+
+    If any of these change, the fingerprint changes and the project is
+    calculated again. If none of them change, the cost and detail rows
+    calculated on a previous run are read from the cache instead of being
+    calculated again.
+
+    Only the rows that end up in the outputs are stored. These are the
+    values under the keys of the output dictionary that end in
+    '_module_type_operation' and '_csv'. See
+    XlsxManagerRunner.extract_module_type_operation_lists() and
+    XlsxManagerRunner.extract_details_lists() for how those are used.
+    """
+
+    # _code_version is a class attribute so the landbosse source is only
+    # hashed once per process.
+    _code_version = None
+
+    def __init__(self, cache_dir):
+        """
+        Parameters
+        ----------
+        cache_dir : str
+            The directory that holds the cached results. It is created
+            if it does not exist.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def code_version(cls):
+        """
+        This hashes all the Python source files in the landbosse package so
+        that any change to the model invalidates the cached results. The
+        tests are excluded because they do not change the results.
+
+        Returns
+        -------
+        str
+            Hex digest of the hash of the source code.
+        """
+        if cls._code_version is None:
+            package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            sha = hashlib.sha256()
+            for dirpath, dirnames, filenames in os.walk(package_dir):
+                # Walk in a deterministic order and skip the tests.
+                dirnames[:] = sorted(d for d in dirnames if d not in ('tests', '__pycache__'))
+                for filename in sorted(filenames):
+                    if filename.endswith('.py'):
+                        path = os.path.join(dirpath, filename)
+                        sha.update(os.path.relpath(path, package_dir).encode('utf-8'))
+                        with open(path, 'rb') as f:
+                            sha.update(f.read())
+            cls._code_version = sha.hexdigest()
+        return cls._code_version
+
+    @staticmethod
+    def hash_dataframe(df):
+        """
+        Hashes the column names, types and contents of a dataframe.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The dataframe to hash.
+
+        Returns
+        -------
+        bytes
+            The digest of the dataframe.
+        """
+        sha = hashlib.sha256()
+        sha.update(repr(list(df.columns)).encode('utf-8'))
+        sha.update(repr([str(dtype) for dtype in df.dtypes]).encode('utf-8'))
+        try:
+            sha.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+        except TypeError:
+            # Columns that have unhashable objects in them fall back to
+            # their text representation.
+            sha.update(df.to_csv().encode('utf-8'))
+        return sha.digest()
+
+    @classmethod
+    def fingerprint(cls, project_parameters, project_data_sheets, detail_level='full', detail_modules=None):
+        """
+        Calculates the fingerprint of one project. It does not need a
+        cache, so ProjectResultJournal uses it too.
+
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The project parameters, after all modifications have been
+            made to them.
+
+        project_data_sheets : dict
+            The project data dataframes, after all modifications have
+            been made to them. Keys are sheet names, values are the
+            dataframes.
+
+        detail_level : str
+            The detail level of the run.
+
+        detail_modules : iterable
+            The names of the only modules that make details in the run, or
+            None for all of them.
+
+        Returns
+        -------
+        str
+            The fingerprint as a hex digest.
+        """
+        sha = hashlib.sha256()
+        sha.update(cls.code_version().encode('utf-8'))
+
+        if detail_level != 'full' or detail_modules is not None:
+            modules = None if detail_modules is None else sorted(detail_modules)
+            sha.update(repr((detail_level, modules)).encode('utf-8'))
+
+        for name, value in project_parameters.items():
+            sha.update(repr((str(name), str(value))).encode('utf-8'))
+
+        for sheet_name in sorted(project_data_sheets.keys()):
+            sha.update(sheet_name.encode('utf-8'))
+            sha.update(cls.hash_dataframe(project_data_sheets[sheet_name]))
+
+        return sha.hexdigest()
+
+    @staticmethod
+    def result_rows(output_dict):
+        """
+        Selects the part of a project's output dictionary that is written
+        to the outputs.
+
+        Parameters
+        ----------
+        output_dict : dict
+            The output dictionary of the project after Manager has run.
+
+        Returns
+        -------
+        dict
+            The values from output_dict under keys that end in '_csv'
+            or '_module_type_operation'.
+        """
+        return {
+            key: value for key, value in output_dict.items()
+            if key.endswith('_csv') or key.endswith('_module_type_operation')
+        }
+
+    def path_for(self, fingerprint):
+        """
+        Returns the path of the cache file for a fingerprint. Files are
+        spread among subdirectories named after the first two characters
+        of the fingerprint so that no single directory gets too large.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the project.
+
+        Returns
+        -------
+        str
+            Path to the cache file.
+        """
+        return os.path.join(self.cache_dir, fingerprint[:2], f'{fingerprint}.pickle')
+
+    def load(self, fingerprint):
+        """
+        Loads the cached results for a fingerprint.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the project.
+
+        Returns
+        -------
+        dict or None
+            The result rows (see result_rows()) if the fingerprint is in
+            the cache. None if it is not in the cache or the cache file
+            cannot be read.
+        """
+        path = self.path_for(fingerprint)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            print(f'Ignoring unreadable cache entry {path}')
+            return None
+
+    def store(self, fingerprint, output_dict):
+        """
+        Stores the result rows of a project in the cache. The file is
+        written under a temporary name and then renamed so that a reader
+        never sees a partially written file.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the project.
+
+        output_dict : dict
+            The output dictionary of the project after Manager has run.
+        """
+        path = self.path_for(fingerprint)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump(self.result_rows(output_dict), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
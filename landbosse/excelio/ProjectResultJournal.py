@@ -0,0 +1,131 @@
+import os
+import pickle
+import shutil
+
+from .ProjectResultCache import ProjectResultCache
+
+
+class ProjectResultJournal:
+    """
+    This class checkpoints the results of finished projects to a journal
+    in the output directory while a run is in progress.
+
+    Without a journal, results are only written after every project in
+    the project list has been calculated. If a long parametric sweep is
+    interrupted (a worker runs out of memory, the machine is preempted or
+    someone presses Ctrl-C), all the projects that had already finished
+    are lost. With the journal, a run can be resumed with
+
+    --resume [output directory]
+
+    which reuses the output directory of the interrupted run and skips
+    every project whose Project ID with serial is already in the journal.
+
+    The journal is a single append only file of pickled records. Each
+    record holds the Project ID with serial, the fingerprint (see
+    ProjectResultCache.fingerprint()) and the result rows (see
+    ProjectResultCache.result_rows()) of one project. A resumed run only
+    reuses the results of a project if its fingerprint is unchanged, so a
+    project whose parameters, project data or detail level changed since
+    the run was interrupted is calculated again. Each record is flushed
+    to disk as soon as it is written. If the run is killed while a record
+    is being written, the partially written record at the end of the file
+    is removed when the journal is read.
+
+    Once a run has written its outputs, the journal is no longer needed
+    and main.py removes it with remove(), so only interrupted runs leave
+    a checkpoint directory behind.
+    """
+
+    def __init__(self, output_dir):
+        """
+        Parameters
+        ----------
+        output_dir : str
+            The output directory of the run. The journal is kept in a
+            subdirectory named checkpoint.
+        """
+        self.checkpoint_dir = os.path.join(output_dir, 'checkpoint')
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        self.journal_path = os.path.join(self.checkpoint_dir, 'project-results-journal.pickle')
+
+    def completed_results(self):
+        """
+        Reads every complete record in the journal.
+
+        Returns
+        -------
+        dict
+            Keys are Project IDs with serial. Values are dictionaries with
+            the fingerprint and the result rows of those projects, under
+            the keys 'fingerprint' and 'results'. If the journal does not
+            exist yet, the dictionary is empty.
+        """
+        completed = dict()
+        if not os.path.isfile(self.journal_path):
+            return completed
+
+        # end_of_complete_records is the offset just past the last record
+        # that could be read.
+        end_of_complete_records = 0
+        incomplete_record_found = False
+
+        with open(self.journal_path, 'rb') as f:
+            while True:
+                try:
+                    record = pickle.load(f)
+                except EOFError:
+                    # A clean end of file, or a record cut off right at its
+                    # start.
+                    incomplete_record_found = f.tell() != end_of_complete_records
+                    break
+                except (pickle.UnpicklingError, AttributeError, ValueError):
+                    incomplete_record_found = True
+                    break
+                completed[record['project_id_with_serial']] = {
+                    'fingerprint': record.get('fingerprint'),
+                    'results': record['results'],
+                }
+                end_of_complete_records = f.tell()
+
+        # A record that was cut off when the run was interrupted is removed,
+        # so that records appended by the resumed run can be read after it.
+        if incomplete_record_found:
+            print(f'Removing incomplete record at end of {self.journal_path}')
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(end_of_complete_records)
+
+        return completed
+
+    def append(self, project_id_with_serial, output_dict, fingerprint=None):
+        """
+        Appends the result rows of one finished project to the journal and
+        forces them to disk.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The Project ID with serial of the finished project.
+
+        output_dict : dict
+            The output dictionary of the project after Manager has run.
+
+        fingerprint : str
+            The fingerprint of the inputs of the project.
+        """
+        record = {
+            'project_id_with_serial': project_id_with_serial,
+            'fingerprint': fingerprint,
+            'results': ProjectResultCache.result_rows(output_dict),
+        }
+        with open(self.journal_path, 'ab') as f:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remove(self):
+        """
+        Deletes the journal and its checkpoint directory, after the outputs
+        of the run have been written.
+        """
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
@@ -0,0 +1,163 @@
+import json
+import os
+import zlib
+
+from .XlsxOperationException import XlsxOperationException
+
+
+class ProjectShard:
+    """
+    One of N shards of the extended project list, for running a sweep as
+    N separate processes, such as the tasks of a SLURM job array on many
+    nodes. With --shard i/N, main.py only runs the projects of shard i,
+    where i counts from 0 to N - 1:
+
+    sbatch --array=0-31 --wrap 'python main.py --shard $SLURM_ARRAY_TASK_ID/32 --output-formats csv'
+
+    Every shard reads the whole project list, so the shards must be run on
+    the same input. The projects are split in one of two ways:
+
+    range
+        The default. Shard i has the i-th of N contiguous ranges of the
+        project list, which differ in size by at most one project.
+
+    hash
+        A project belongs to shard crc32(Project ID with serial) mod N.
+        Each project stays in the same shard when other projects are added
+        to or removed from the project list, but the shards are only
+        approximately the same size.
+
+    Each shard writes its costs, details and extended project list to its
+    own output directory, as a run of the whole project list would, and a
+    manifest, landbosse-shard.json, that lists its projects and their
+    positions in the project list. ShardMerger combines the output
+    directories of all the shards into the output of the whole sweep.
+    """
+
+    methods = ('range', 'hash')
+    manifest_filename = 'landbosse-shard.json'
+
+    def __init__(self, index, count, by='range'):
+        """
+        Parameters
+        ----------
+        index : int
+            The shard, from 0 to count - 1.
+
+        count : int
+            The number of shards.
+
+        by : str
+            How the projects are split: 'range' or 'hash'.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the index is not between 0 and count - 1, or by is not one of
+            the methods.
+        """
+        if count < 1 or not 0 <= index < count:
+            raise XlsxOperationException(f'Shard {index}/{count} must be between 0/{count} and {count - 1}/{count}.')
+        if by not in self.methods:
+            raise XlsxOperationException(f'Shards are split by one of {self.methods}, not {by}.')
+        self.index = index
+        self.count = count
+        self.by = by
+
+    @classmethod
+    def parse(cls, shard, by='range'):
+        """
+        Parameters
+        ----------
+        shard : str
+            The shard as i/N, like 3/32.
+
+        by : str
+            How the projects are split: 'range' or 'hash'.
+
+        Returns
+        -------
+        ProjectShard
+            The shard.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the shard is not of the form i/N.
+        """
+        try:
+            index, count = (int(part) for part in shard.split('/'))
+        except ValueError:
+            raise XlsxOperationException(f'Shard {shard} must be of the form i/N, like 0/4.')
+        return cls(index, count, by)
+
+    @staticmethod
+    def project_ids_with_serial(extended_project_list):
+        """
+        Returns the Project ID with serial of each project, or its Project
+        ID if the project has no serial.
+        """
+        return extended_project_list['Project ID with serial'].fillna(extended_project_list['Project ID'])
+
+    def mask(self, extended_project_list):
+        """
+        Parameters
+        ----------
+        extended_project_list : pandas.DataFrame
+            The whole extended project list.
+
+        Returns
+        -------
+        numpy.ndarray
+            True for the projects of this shard.
+        """
+        num_projects = len(extended_project_list)
+        if self.by == 'range':
+            positions = extended_project_list.reset_index(drop=True).index.values
+            return positions * self.count // max(num_projects, 1) == self.index
+        project_ids = self.project_ids_with_serial(extended_project_list)
+        shards = project_ids.map(lambda project_id: zlib.crc32(str(project_id).encode('utf-8')) % self.count)
+        return shards.values == self.index
+
+    def select(self, extended_project_list):
+        """
+        Selects the projects of this shard and remembers them for the
+        manifest.
+
+        Parameters
+        ----------
+        extended_project_list : pandas.DataFrame
+            The whole extended project list.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The projects of this shard, in the order of the project list.
+        """
+        mask = self.mask(extended_project_list)
+        project_ids = self.project_ids_with_serial(extended_project_list)
+        self.num_projects_total = len(extended_project_list)
+        self.project_positions = {str(project_id): int(position)
+                                  for position, project_id in zip(mask.nonzero()[0], project_ids[mask])}
+        print(f'Shard {self.index}/{self.count} has {mask.sum()} of {len(extended_project_list)} projects')
+        return extended_project_list[mask]
+
+    def write_manifest(self, output_dir):
+        """
+        Writes the manifest of the shard to its output directory. select()
+        must have been called.
+
+        Parameters
+        ----------
+        output_dir : str
+            The output directory of the shard.
+        """
+        manifest = {
+            'shard': self.index,
+            'count': self.count,
+            'by': self.by,
+            'num_projects_total': self.num_projects_total,
+            'project_positions': self.project_positions,
+        }
+        with open(os.path.join(output_dir, self.manifest_filename), 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
@@ -0,0 +1,404 @@
+import io
+
+import pandas as pd
+
+from .SqliteResultStore import quote
+
+
+class ResultLoader:
+    """
+    This class streams tables of results, like the costs and details of a
+    run joined with the extended project list, into a database in chunks
+    of bounded size. Only one chunk is in memory at a time, so tables of
+    tens of millions of rows load in constant memory.
+
+    The database is reached through a backend, which creates the tables,
+    copies the chunks into them and, once every chunk has been copied,
+    creates the indexes and partitions of the tables:
+
+    PostgresLoaderBackend
+        Copies each chunk with COPY ... FROM STDIN. Tables can be
+        partitioned by the values of one column.
+
+    SqliteLoaderBackend
+        Inserts each chunk with executemany(). SQLite has no partitions,
+        so tables are not partitioned. It stands in for PostgreSQL when
+        loading on a computer without a database server, and in tests.
+
+    Creating the indexes and partitions after the rows are loaded is much
+    faster than updating them on every row.
+
+    For example, to load the details of a run into SQLite, 100,000 rows
+    at a time:
+
+    loader = ResultLoader(SqliteLoaderBackend(sqlite3.connect('results.sqlite')), chunksize=100000)
+    chunks = loader.read_csv_chunks('landbosse-details.csv', right=extended_project_list,
+                                    dtype=ResultLoader.details_dtypes)
+    loader.load('landbosse_details', chunks, indexes=[['Project ID with serial'], ['Module']])
+    """
+
+    # The types of the columns of landbosse-costs.csv and
+    # landbosse-details.csv, to read them with. The types of the columns
+    # of a table are taken from its first chunk, so columns that can be
+    # empty in a whole chunk, like the Non-numeric value of details that
+    # are all numbers, must have their types given. Otherwise an empty
+    # column is read as float in one chunk and as text in another. The
+    # Numeric value of the details is text, because some details, like the
+    # phases of construction of DevelopmentCost, have text in it. The
+    # Project ID with serial is never empty and keeps the type it is read
+    # with, which is the type it is joined with the project list on.
+    costs_dtypes = {
+        'Module': str,
+        'Type of cost': str,
+        'Cost per turbine': float,
+        'Cost per project': float,
+        'Cost per kW': float,
+    }
+    details_dtypes = {
+        'Module': str,
+        'Variable name': str,
+        'Unit': str,
+        'Numeric value': str,
+        'Non-numeric value': str,
+    }
+
+    def __init__(self, backend, chunksize=100000):
+        """
+        Parameters
+        ----------
+        backend : PostgresLoaderBackend or SqliteLoaderBackend
+            The backend of the database to load into.
+
+        chunksize : int
+            The number of rows read and copied at a time.
+        """
+        self.backend = backend
+        self.chunksize = chunksize
+
+    def read_csv_chunks(self, path, drop_columns=(), right=None, on='Project ID with serial', dtype=None):
+        """
+        Reads a .csv file chunksize rows at a time, optionally joining each
+        chunk with a small table, like the extended project list.
+
+        Parameters
+        ----------
+        path : str
+            The path of the .csv file.
+
+        drop_columns : list
+            Columns of the .csv file that are left out of the chunks.
+
+        right : pandas.DataFrame
+            If not None, each chunk is inner joined with this table on the
+            column on, so rows without a match in it are left out.
+
+        on : str
+            The column to join on.
+
+        dtype : dict
+            If not None, the types of columns of the .csv file, such as
+            costs_dtypes or details_dtypes. Columns that are not in the
+            file are ignored.
+
+        Returns
+        -------
+        iterator of pandas.DataFrame
+            The chunks.
+        """
+        for chunk in pd.read_csv(path, chunksize=self.chunksize, dtype=dtype):
+            if len(drop_columns) > 0:
+                chunk = chunk.drop(columns=list(drop_columns))
+            if right is not None:
+                chunk = chunk.merge(right=right, on=on)
+            yield chunk
+
+    def load(self, table, chunks, indexes=(), partition_by=None):
+        """
+        Replaces a table with the rows of an iterator of dataframes.
+
+        The columns of the table and their types are those of the first
+        chunk, so the chunks should be read with the types of any columns
+        that can be empty in a chunk. See costs_dtypes and details_dtypes.
+        Later chunks are reordered to those columns. Integer columns
+        whose values are read as floats in a later chunk, because some of
+        them are missing, are converted back to integers if they are whole
+        numbers.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        chunks : iterator of pandas.DataFrame
+            The rows to load, such as the chunks of read_csv_chunks().
+
+        indexes : list
+            Each index to create after loading is a list of columns.
+
+        partition_by : str
+            If not None, the column the table is partitioned by, if the
+            backend supports partitions.
+
+        Returns
+        -------
+        int
+            The number of rows loaded. If there are no chunks, no table is
+            made and 0 is returned.
+        """
+        columns = None
+        num_rows = 0
+        for chunk in chunks:
+            if columns is None:
+                columns = {column: self.backend.sql_type(dtype) for column, dtype in chunk.dtypes.items()}
+                self.backend.create_table(table, columns, partition_by)
+            chunk = chunk.reindex(columns=list(columns.keys()))
+            for column, sql_type in columns.items():
+                values = chunk[column]
+                if sql_type == self.backend.integer_type and values.dtype.kind == 'f' \
+                        and (values.dropna() % 1 == 0).all():
+                    chunk[column] = values.astype('Int64')
+            self.backend.copy_chunk(table, chunk)
+            num_rows += len(chunk)
+
+        if columns is None:
+            return 0
+
+        self.backend.finish_table(table, columns, indexes, partition_by)
+        return num_rows
+
+
+class SqliteLoaderBackend:
+    """
+    Loads tables into SQLite through an sqlite3 connection. See
+    ResultLoader.
+    """
+
+    integer_type = 'INTEGER'
+
+    def __init__(self, connection):
+        """
+        Parameters
+        ----------
+        connection : sqlite3.Connection
+            The connection to load through. Each table is committed when it
+            is finished.
+        """
+        self.connection = connection
+
+    def sql_type(self, dtype):
+        """
+        Parameters
+        ----------
+        dtype : numpy.dtype
+            The type of a column of a dataframe.
+
+        Returns
+        -------
+        str
+            The type of the column in the database.
+        """
+        if dtype.kind in 'iub':
+            return self.integer_type
+        elif dtype.kind == 'f':
+            return 'REAL'
+        return 'TEXT'
+
+    def create_table(self, table, columns, partition_by=None):
+        """
+        Replaces a table with an empty one. SQLite has no partitions, so
+        partition_by is ignored.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        columns : dict
+            Keys are the names of the columns and values are their types.
+
+        partition_by : str
+            Ignored.
+        """
+        definitions = ', '.join(f'{quote(column)} {sql_type}' for column, sql_type in columns.items())
+        self.connection.execute(f'DROP TABLE IF EXISTS {quote(table)}')
+        self.connection.execute(f'CREATE TABLE {quote(table)} ({definitions})')
+
+    def copy_chunk(self, table, chunk):
+        """
+        Inserts a chunk of rows. Missing values are inserted as NULL.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        chunk : pandas.DataFrame
+            The rows, with the columns of the table in order.
+        """
+        placeholders = ', '.join('?' for _ in chunk.columns)
+        # Converting to objects turns NumPy numbers into Python numbers,
+        # which is what sqlite3 accepts.
+        rows = chunk.astype(object)
+        rows = rows.where(rows.notna(), None)
+        self.connection.executemany(f'INSERT INTO {quote(table)} VALUES ({placeholders})',
+                                    rows.itertuples(index=False, name=None))
+
+    def finish_table(self, table, columns, indexes=(), partition_by=None):
+        """
+        Creates the indexes of a table and commits it.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        columns : dict
+            Keys are the names of the columns and values are their types.
+
+        indexes : list
+            Each index is a list of columns.
+
+        partition_by : str
+            Ignored.
+        """
+        for index_columns in indexes:
+            name = f'{table}_{"_".join(index_columns)}'.lower().replace(' ', '_')
+            column_list = ', '.join(quote(column) for column in index_columns)
+            self.connection.execute(f'CREATE INDEX {quote(name)} ON {quote(table)} ({column_list})')
+        self.connection.commit()
+
+
+class PostgresLoaderBackend:
+    """
+    Loads tables into PostgreSQL through a psycopg2 connection. See
+    ResultLoader.
+
+    Each chunk is written to an in-memory .csv buffer and copied with
+    COPY ... FROM STDIN, which is much faster than inserting the rows.
+
+    A table that is partitioned is loaded into an unpartitioned table
+    first. When every chunk has been copied, the table is made with one
+    list partition for each value of the partition column, the rows are
+    moved into it and the unpartitioned table is dropped. All of this
+    happens in the database, so it does not use any memory of the loader.
+    """
+
+    integer_type = 'BIGINT'
+
+    def __init__(self, connection):
+        """
+        Parameters
+        ----------
+        connection : psycopg2.extensions.connection
+            The connection to load through. Each table is committed when it
+            is finished.
+        """
+        self.connection = connection
+        # The table that the rows of each table are copied into, which is
+        # the table itself unless it is partitioned.
+        self.load_tables = dict()
+
+    def sql_type(self, dtype):
+        """
+        Parameters
+        ----------
+        dtype : numpy.dtype
+            The type of a column of a dataframe.
+
+        Returns
+        -------
+        str
+            The type of the column in the database.
+        """
+        if dtype.kind in 'iu':
+            return self.integer_type
+        elif dtype.kind == 'b':
+            return 'BOOLEAN'
+        elif dtype.kind == 'f':
+            return 'DOUBLE PRECISION'
+        return 'TEXT'
+
+    def create_table(self, table, columns, partition_by=None):
+        """
+        Replaces a table with an empty one, or with an empty unpartitioned
+        table to load into if it is partitioned.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        columns : dict
+            Keys are the names of the columns and values are their types.
+
+        partition_by : str
+            If not None, the column the table is partitioned by.
+        """
+        definitions = ', '.join(f'{quote(column)} {sql_type}' for column, sql_type in columns.items())
+        load_table = table if partition_by is None else f'{table}_load'
+        self.load_tables[table] = load_table
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {quote(table)} CASCADE')
+            cursor.execute(f'DROP TABLE IF EXISTS {quote(load_table)} CASCADE')
+            cursor.execute(f'CREATE TABLE {quote(load_table)} ({definitions})')
+
+    def copy_chunk(self, table, chunk):
+        """
+        Copies a chunk of rows. Missing values are copied as NULL.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        chunk : pandas.DataFrame
+            The rows, with the columns of the table in order.
+        """
+        buffer = io.StringIO()
+        chunk.to_csv(buffer, header=False, index=False)
+        buffer.seek(0)
+        column_list = ', '.join(quote(column) for column in chunk.columns)
+        with self.connection.cursor() as cursor:
+            cursor.copy_expert(f'COPY {quote(self.load_tables[table])} ({column_list}) '
+                               f"FROM STDIN WITH (FORMAT csv, NULL '')", buffer)
+
+    def finish_table(self, table, columns, indexes=(), partition_by=None):
+        """
+        Partitions a table, creates its indexes and commits it.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        columns : dict
+            Keys are the names of the columns and values are their types.
+
+        indexes : list
+            Each index is a list of columns. On a partitioned table, each
+            partition gets the indexes.
+
+        partition_by : str
+            If not None, the column the table is partitioned by.
+        """
+        with self.connection.cursor() as cursor:
+            if partition_by is not None:
+                load_table = self.load_tables[table]
+                definitions = ', '.join(f'{quote(column)} {sql_type}' for column, sql_type in columns.items())
+                cursor.execute(f'CREATE TABLE {quote(table)} ({definitions}) PARTITION BY LIST ({quote(partition_by)})')
+                cursor.execute(f'SELECT DISTINCT {quote(partition_by)} FROM {quote(load_table)} '
+                               f'WHERE {quote(partition_by)} IS NOT NULL ORDER BY 1')
+                values = [value for (value,) in cursor.fetchall()]
+                for i, value in enumerate(values):
+                    cursor.execute(f'CREATE TABLE {quote(f"{table}_{i}")} PARTITION OF {quote(table)} '
+                                   f'FOR VALUES IN (%s)', (value,))
+                cursor.execute(f'CREATE TABLE {quote(f"{table}_default")} PARTITION OF {quote(table)} DEFAULT')
+                cursor.execute(f'INSERT INTO {quote(table)} SELECT * FROM {quote(load_table)}')
+                cursor.execute(f'DROP TABLE {quote(load_table)}')
+
+            for index_columns in indexes:
+                name = f'{table}_{"_".join(index_columns)}'.lower().replace(' ', '_')
+                column_list = ', '.join(quote(column) for column in index_columns)
+                cursor.execute(f'CREATE INDEX {quote(name)} ON {quote(table)} ({column_list})')
+            cursor.execute(f'ANALYZE {quote(table)}')
+        self.connection.commit()
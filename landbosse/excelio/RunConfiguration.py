@@ -0,0 +1,263 @@
+import argparse
+import os
+from dataclasses import dataclass
+
+from .XlsxOperationException import XlsxOperationException
+from .ProjectShard import ProjectShard
+
+
+@dataclass(frozen=True)
+class RunConfiguration:
+    """
+    The configuration of a LandBOSSE run. main.py parses the command line
+    into a RunConfiguration once, at the start of the run, and passes it
+    to XlsxFileOperations, which the runners, readers and writers get
+    their paths and options from. The configuration cannot be changed
+    after it is made.
+
+    The command line options are:
+
+    -i, --input [input directory]
+        Falls back to the LANDBOSSE_INPUT_DIR environment variable, then
+        to 'input'.
+
+    -o, --output [output directory]
+        Falls back to the LANDBOSSE_OUTPUT_DIR environment variable, then
+        to 'output'. Each run writes to a timestamped folder inside it.
+
+    -v, --validate
+        Compares the costs with landbosse-expected-validation-data.xlsx in
+        the input directory.
+
+    -s, --scaling
+        Applies the cost and scaling modifications of
+        XlsxReader.apply_cost_and_scaling_modifications_to_project_parameters().
+        Cannot be combined with --validate.
+
+    --serial
+        Runs the projects one after another with XlsxSerialManagerRunner
+        instead of in parallel with XlsxParallelManagerRunner.
+
+    --workers [number of processes]
+        The number of worker processes of a parallel run. One per CPU if
+        the option is missing.
+
+    --module-threads [number of threads]
+        The number of threads that run the cost modules of each project.
+        See Manager.
+
+    --output-formats [format ...]
+        The formats the costs and details are written in: any of xlsx, csv
+        and sqlite. xlsx and csv are the default. sqlite writes an indexed
+        database, see SqliteResultStore.
+
+    --detail-level [none, summary or full]
+        How many rows the cost modules make for the details. full, the
+        default, makes all of them. summary makes only the rows of single
+        values. none makes no details, for runs that only need the costs.
+        See CostModule.detail_level().
+
+    --detail-modules [module ...]
+        Only these modules, named as in the Module column of the costs,
+        make details. All the modules do if the option is missing.
+
+    --baseline [Project ID with serial]
+        Compares the costs of every project with those of this project and
+        writes the comparison to landbosse-baseline-comparison.csv. See
+        BaselineComparison.
+
+    --baseline-filter [expression]
+        Like --baseline, but the baseline is the one project of the
+        extended project list that matches this pandas query() expression.
+        Cannot be combined with --baseline.
+
+    --aep [AEP .csv file], --tcc [TCC .csv file]
+        Calculates the LCOE of every project from its costs and the AEP and
+        TCC in these files, and writes it to landbosse-lcoe.csv. Must be
+        given together. See LcoeCalculator.
+
+    --fcr [fixed charge rate]
+        The fixed charge rate of the LCOE. 0.079 if the option is missing.
+
+    --opex [USD per kW per year]
+        The operating expenses of the LCOE. 52.0 if the option is missing.
+
+    --shard [i/N]
+        Calculates only shard i, from 0 to N - 1, of N shards of the
+        extended project list, and writes a manifest of the shard with its
+        outputs. Requires csv in --output-formats and cannot be combined
+        with --validate. See ProjectShard and ShardMerger.
+
+    --shard-by [range or hash]
+        How the projects are split into shards. range, the default, splits
+        them into contiguous ranges. hash splits them by a hash of their
+        Project ID with serial.
+
+    --cache [cache directory]
+        Falls back to the LANDBOSSE_CACHE_DIR environment variable. See
+        ProjectResultCache.
+
+    --resume [output directory]
+        Continues an interrupted run. See ProjectResultJournal.
+
+    --profile
+        Times each stage of each project with StageTimer.
+
+    --cprofile
+        Runs each project under cProfile.
+    """
+
+    input_dir: str = 'input'
+    output_dir: str = 'output'
+    validate: bool = False
+    scaling: bool = False
+    parallel: bool = True
+    workers: int = None
+    module_threads: int = 1
+    output_formats: tuple = ('xlsx', 'csv')
+    detail_level: str = 'full'
+    detail_modules: tuple = None
+    baseline_project: str = None
+    baseline_filter: str = None
+    aep_csv: str = None
+    tcc_csv: str = None
+    fcr: float = 0.079
+    opex_usd_per_kw: float = 52.0
+    shard: str = None
+    shard_by: str = 'range'
+    cache_dir: str = None
+    resume_dir: str = None
+    profile: bool = False
+    cprofile: bool = False
+
+    @staticmethod
+    def create_parser():
+        """
+        Makes the parser of the command line of main.py.
+
+        Returns
+        -------
+        argparse.ArgumentParser
+            The parser.
+        """
+        parser = argparse.ArgumentParser(description='Calculate the balance-of-system costs of land-based wind projects.')
+        parser.add_argument('-i', '--input', help='Input directory. Defaults to LANDBOSSE_INPUT_DIR or input.')
+        parser.add_argument('-o', '--output', help='Output directory. Defaults to LANDBOSSE_OUTPUT_DIR or output.')
+        parser.add_argument('-v', '--validate', action='store_true',
+                            help='Compare the costs with landbosse-expected-validation-data.xlsx in the input directory.')
+        parser.add_argument('-s', '--scaling', action='store_true',
+                            help='Apply the cost and scaling modifications to the project parameters.')
+        parser.add_argument('--serial', action='store_true', help='Run the projects one after another.')
+        parser.add_argument('--workers', type=int, help='Number of worker processes. Defaults to one per CPU.')
+        parser.add_argument('--module-threads', type=int, default=1,
+                            help='Number of threads that run the cost modules of each project.')
+        parser.add_argument('--output-formats', nargs='+', choices=['xlsx', 'csv', 'sqlite'], default=['xlsx', 'csv'],
+                            help='Formats to write the costs and details in.')
+        parser.add_argument('--detail-level', choices=['none', 'summary', 'full'], default='full',
+                            help='How many rows of details the cost modules make.')
+        parser.add_argument('--detail-modules', nargs='+',
+                            help='Only these modules, as named in the costs, make details. Defaults to all modules.')
+        baseline = parser.add_mutually_exclusive_group()
+        baseline.add_argument('--baseline', help='Project ID with serial of the project to compare the costs with.')
+        baseline.add_argument('--baseline-filter',
+                              help='pandas query() expression that matches the project to compare the costs with.')
+        parser.add_argument('--aep', help='AEP .csv file to calculate the LCOE with. Requires --tcc.')
+        parser.add_argument('--tcc', help='TCC .csv file to calculate the LCOE with. Requires --aep.')
+        parser.add_argument('--fcr', type=float, default=0.079, help='Fixed charge rate of the LCOE.')
+        parser.add_argument('--opex', type=float, default=52.0, help='Operating expenses of the LCOE in USD/kW/yr.')
+        parser.add_argument('--shard', help='Calculate only shard i of N shards of the projects, given as i/N.')
+        parser.add_argument('--shard-by', choices=['range', 'hash'], default='range',
+                            help='Split the projects into shards by range or hash.')
+        parser.add_argument('--cache', help='Result cache directory. Defaults to LANDBOSSE_CACHE_DIR.')
+        parser.add_argument('--resume', help='Output directory of an interrupted run to continue.')
+        parser.add_argument('--profile', action='store_true', help='Time each stage of each project.')
+        parser.add_argument('--cprofile', action='store_true', help='Run each project under cProfile.')
+        return parser
+
+    @classmethod
+    def from_argv(cls, argv=None, environ=None):
+        """
+        Parses a command line into a RunConfiguration.
+
+        Parameters
+        ----------
+        argv : list
+            The command line arguments, without the program name. If None,
+            sys.argv[1:] is parsed.
+
+        environ : dict
+            The environment variables that missing options fall back to.
+            If None, os.environ is used.
+
+        Returns
+        -------
+        RunConfiguration
+            The configuration.
+
+        Raises
+        ------
+        XlsxOperationException
+            If --validate and --scaling are both given, or only one of
+            --aep and --tcc is, or --validate and --shard are both given,
+            or --shard is given without csv in --output-formats, or the
+            shard is not of the form i/N.
+        """
+        environ = os.environ if environ is None else environ
+        args = cls.create_parser().parse_args(argv)
+
+        if args.validate and args.scaling:
+            raise XlsxOperationException('--scaling and --validate cannot be enabled at the same time.')
+
+        if (args.aep is None) != (args.tcc is None):
+            raise XlsxOperationException('--aep and --tcc must be given together.')
+
+        if args.shard is not None:
+            if args.validate:
+                raise XlsxOperationException('--shard and --validate cannot be enabled at the same time.')
+            if 'csv' not in args.output_formats:
+                raise XlsxOperationException('--shard requires csv in --output-formats, which ShardMerger merges.')
+            ProjectShard.parse(args.shard, args.shard_by)
+
+        return cls(
+            input_dir=args.input if args.input is not None else environ.get('LANDBOSSE_INPUT_DIR', 'input'),
+            output_dir=args.output if args.output is not None else environ.get('LANDBOSSE_OUTPUT_DIR', 'output'),
+            validate=args.validate,
+            scaling=args.scaling,
+            parallel=not args.serial,
+            workers=args.workers,
+            module_threads=args.module_threads,
+            output_formats=tuple(args.output_formats),
+            detail_level=args.detail_level,
+            detail_modules=tuple(args.detail_modules) if args.detail_modules is not None else None,
+            baseline_project=args.baseline,
+            baseline_filter=args.baseline_filter,
+            aep_csv=args.aep,
+            tcc_csv=args.tcc,
+            fcr=args.fcr,
+            opex_usd_per_kw=args.opex,
+            shard=args.shard,
+            shard_by=args.shard_by,
+            cache_dir=args.cache if args.cache is not None else environ.get('LANDBOSSE_CACHE_DIR'),
+            resume_dir=args.resume,
+            profile=args.profile,
+            cprofile=args.cprofile,
+        )
+
+    @classmethod
+    def from_environment(cls, environ=None):
+        """
+        Makes a RunConfiguration from the environment variables alone, with
+        the defaults for every other option. This is the configuration of
+        an XlsxFileOperations that is made without one.
+
+        Parameters
+        ----------
+        environ : dict
+            The environment variables. If None, os.environ is used.
+
+        Returns
+        -------
+        RunConfiguration
+            The configuration.
+        """
+        return cls.from_argv([], environ)
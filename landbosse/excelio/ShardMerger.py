@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+
+import pandas as pd
+
+from .ProjectShard import ProjectShard
+from .RunConfiguration import RunConfiguration
+from .XlsxFileOperations import XlsxFileOperations
+from .XlsxOperationException import XlsxOperationException
+
+
+class ShardMerger:
+    """
+    This class merges the output directories of the shards of a sweep,
+    run with --shard i/N, into the output of the whole sweep, as if it had
+    been run at once. main.py runs it with the merge command:
+
+    python main.py merge [shard output directory ...] -o [output directory]
+
+    The shards must have been written with csv in their --output-formats.
+    The merged landbosse-costs.csv, landbosse-details.csv,
+    landbosse-failures.csv and calculated_parametric_inputs/extended_project_list.csv
+    are written to a timestamped directory in the output directory, with
+    the projects in the order of the project list.
+
+    Before merging, the manifests of the shards are checked: there must be
+    one output directory for each of the N shards, all split the same way,
+    and together they must have every project exactly once.
+    """
+
+    # The tables of each shard that are merged, and the paths of their
+    # .csv files in the output directories.
+    tables = {
+        'costs': 'landbosse-costs.csv',
+        'details': 'landbosse-details.csv',
+        'failures': 'landbosse-failures.csv',
+        'extended_project_list': os.path.join('calculated_parametric_inputs', 'extended_project_list.csv'),
+    }
+
+    def __init__(self, shard_dirs):
+        """
+        Parameters
+        ----------
+        shard_dirs : list
+            The output directories of the shards, in any order.
+        """
+        self.shard_dirs = list(shard_dirs)
+
+    @staticmethod
+    def create_parser():
+        """
+        Makes the parser of the command line of python main.py merge.
+
+        Returns
+        -------
+        argparse.ArgumentParser
+            The parser.
+        """
+        parser = argparse.ArgumentParser(prog='main.py merge',
+                                         description='Merge the output directories of the shards of a sweep.')
+        parser.add_argument('shard_dirs', nargs='+', help='Output directories of the shards.')
+        parser.add_argument('-o', '--output', help='Output directory. Defaults to LANDBOSSE_OUTPUT_DIR or output.')
+        return parser
+
+    def read_manifests(self):
+        """
+        Reads and checks the manifests of the shards.
+
+        Returns
+        -------
+        dict
+            Keys are the Project ID with serial of every project and values
+            are their positions in the project list.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a manifest is missing, shards are missing or repeated, the
+            shards were split differently or projects are missing or
+            repeated.
+        """
+        manifests = []
+        for shard_dir in self.shard_dirs:
+            manifest_path = os.path.join(shard_dir, ProjectShard.manifest_filename)
+            if not os.path.isfile(manifest_path):
+                raise XlsxOperationException(f'{shard_dir} has no {ProjectShard.manifest_filename}. '
+                                             f'Was it run with --shard?')
+            with open(manifest_path) as manifest_file:
+                manifests.append(json.load(manifest_file))
+
+        splits = {(manifest['count'], manifest['by'], manifest['num_projects_total']) for manifest in manifests}
+        if len(splits) != 1:
+            raise XlsxOperationException(f'The shards were split in different ways: {sorted(splits)}')
+        count, _, num_projects_total = splits.pop()
+
+        shards = sorted(manifest['shard'] for manifest in manifests)
+        if shards != list(range(count)):
+            raise XlsxOperationException(f'Expected one output directory for each of shards 0 to {count - 1}, '
+                                         f'got shards {shards}')
+
+        project_positions = dict()
+        for manifest in manifests:
+            project_positions.update(manifest['project_positions'])
+        if len(project_positions) != num_projects_total or \
+                sorted(project_positions.values()) != list(range(num_projects_total)):
+            raise XlsxOperationException(f'The shards have {len(project_positions)} distinct projects of '
+                                         f'{num_projects_total} in the project list.')
+        return project_positions
+
+    # The tables that a shard only writes if it has rows for them.
+    optional_tables = {'failures'}
+
+    def read_table(self, shard_dir, table):
+        """
+        Reads a table of a shard. Empty tables, such as the costs of a
+        shard without any projects, and missing optional tables, such as
+        the failures of a shard without any, are read as empty dataframes.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the shard has no .csv file of a table that is not optional,
+            as when it was run without csv in its --output-formats.
+        """
+        path = os.path.join(shard_dir, self.tables[table])
+        if not os.path.isfile(path):
+            if table in self.optional_tables:
+                return pd.DataFrame()
+            raise XlsxOperationException(f'{shard_dir} has no {self.tables[table]}. '
+                                         f'Shards must be run with csv in their --output-formats.')
+        try:
+            return pd.read_csv(path)
+        except pd.errors.EmptyDataError:
+            return pd.DataFrame()
+
+    def merge_table(self, table, project_positions):
+        """
+        Concatenates a table of all the shards and sorts its rows by the
+        positions of their projects in the project list. The rows of each
+        project keep their order.
+
+        Parameters
+        ----------
+        table : str
+            One of the keys of tables.
+
+        project_positions : dict
+            The positions of the projects, from read_manifests().
+
+        Returns
+        -------
+        pandas.DataFrame
+            The merged table.
+        """
+        frames = [self.read_table(shard_dir, table) for shard_dir in self.shard_dirs]
+        frames = [frame for frame in frames if len(frame.columns) > 0]
+        if len(frames) == 0:
+            return pd.DataFrame()
+        merged = pd.concat(frames, ignore_index=True)
+        if table == 'extended_project_list':
+            project_ids = ProjectShard.project_ids_with_serial(merged)
+        else:
+            project_ids = merged['Project ID with serial']
+        order = project_ids.astype(str).map(project_positions).argsort(kind='stable')
+        return merged.iloc[order].reset_index(drop=True)
+
+    def merge(self, output_dir):
+        """
+        Merges the shards.
+
+        Parameters
+        ----------
+        output_dir : str
+            The output directory, in which the merged tables are written to
+            a timestamped directory like that of a run.
+
+        Returns
+        -------
+        str
+            The timestamped directory of the merged tables.
+        """
+        project_positions = self.read_manifests()
+        merged_tables = {table: self.merge_table(table, project_positions) for table in self.tables}
+        os.makedirs(output_dir, exist_ok=True)
+        file_ops = XlsxFileOperations(RunConfiguration(output_dir=output_dir))
+        merged_dir = file_ops.landbosse_output_dir()
+
+        for table, filename in self.tables.items():
+            merged = merged_tables[table]
+            if table == 'failures' and len(merged) == 0:
+                continue
+            if table == 'extended_project_list':
+                path = os.path.join(file_ops.extended_project_list_path(), 'extended_project_list.csv')
+            else:
+                path = os.path.join(merged_dir, filename)
+            merged.to_csv(path, index=False)
+            print(f'Merged {len(merged)} rows of {table} from {len(self.shard_dirs)} shards')
+        return merged_dir
+
+    @classmethod
+    def main(cls, argv=None, environ=None):
+        """
+        Runs python main.py merge.
+
+        Parameters
+        ----------
+        argv : list
+            The command line arguments after merge.
+
+        environ : dict
+            The environment variables that a missing --output falls back
+            to. If None, os.environ is used.
+
+        Returns
+        -------
+        str
+            The timestamped directory of the merged tables.
+        """
+        environ = os.environ if environ is None else environ
+        args = cls.create_parser().parse_args(argv)
+        output_dir = args.output if args.output is not None else environ.get('LANDBOSSE_OUTPUT_DIR', 'output')
+        return cls(args.shard_dirs).merge(output_dir)
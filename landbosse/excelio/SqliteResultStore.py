@@ -0,0 +1,230 @@
+import os
+import sqlite3
+
+
+def quote(name):
+    """
+    Quotes a table or column name for SQL, so names with spaces and
+    parentheses, like "Turbine rating MW", can be used as they are.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SqliteResultStore:
+    """
+    This class writes the results of a run to an indexed SQLite database
+    in the output directory, landbosse-results.sqlite, when sqlite is one
+    of the --output-formats. The costs and details can then be queried
+    without loading the .csv files into a database first.
+
+    The tables are:
+
+    projects
+        One row per project with every column of the extended project
+        list, that is the parameters of the project after the parametric
+        modifications. "Project ID with serial" is the primary key.
+
+    costs
+        The costs of landbosse-costs.csv, without the project parameters
+        that are in the projects table.
+
+    details
+        The details of landbosse-details.csv.
+
+    The costs and details are indexed by "Project ID with serial", and by
+    "Module" and "Type of cost" or "Variable name". The views
+    landbosse_costs and landbosse_details join the costs and details with
+    the parameters of their projects, in the same way that
+    post_processing_scripts/extended_landbosse_output_to_csv_and_pgsql.py
+    joins the .csv files, so queries like
+    post_processing_scripts/sql_queries/everything_against_baseline_sqlite.sql
+    can be run on them directly.
+
+    The indexes and views are made when the store is closed, after all
+    the rows have been inserted, which is faster than updating the
+    indexes on every insert.
+
+    with SqliteResultStore('landbosse-results.sqlite') as store:
+        store.write_projects(extended_project_list)
+        store.write_costs(costs)
+        store.write_details(details)
+    """
+
+    # The columns of the costs and details tables and their types. The
+    # costs leave out the number of turbines, turbine rating and rotor
+    # diameter, which are in the projects table.
+    costs_columns = {
+        'Project ID with serial': 'TEXT',
+        'Module': 'TEXT',
+        'Type of cost': 'TEXT',
+        'Cost per turbine': 'REAL',
+        'Cost per project': 'REAL',
+        'Cost per kW': 'REAL',
+    }
+    details_columns = {
+        'Project ID with serial': 'TEXT',
+        'Module': 'TEXT',
+        'Variable name': 'TEXT',
+        'Unit': 'TEXT',
+        'Numeric value': 'REAL',
+        'Non-numeric value': 'TEXT',
+    }
+
+    # The indexes made on each table when the store is closed.
+    indexes = {
+        'costs': [['Project ID with serial'], ['Module', 'Type of cost']],
+        'details': [['Project ID with serial'], ['Module', 'Variable name']],
+    }
+
+    # Rows are inserted this many at a time.
+    batch_size = 10000
+
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path : str
+            The path of the database file. An existing file is replaced.
+        """
+        self.path = path
+        self.connection = None
+        self.project_columns = []
+
+    def __enter__(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.connection = sqlite3.connect(self.path)
+        # The database is written once, start to finish, so there is
+        # nothing to recover if the run is interrupted while it is being
+        # written.
+        self.connection.execute('PRAGMA journal_mode = OFF')
+        self.connection.execute('PRAGMA synchronous = OFF')
+        self.create_table('costs', self.costs_columns)
+        self.create_table('details', self.details_columns)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                self.create_indexes_and_views()
+                self.connection.commit()
+        finally:
+            self.connection.close()
+            self.connection = None
+
+    def create_table(self, table, columns, primary_key=None):
+        """
+        Creates a table.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        columns : dict
+            Keys are the column names and values are their SQL types.
+
+        primary_key : str
+            The column that is the primary key, if any.
+        """
+        definitions = []
+        for column, sql_type in columns.items():
+            definition = f'{quote(column)} {sql_type}'
+            if column == primary_key:
+                definition += ' PRIMARY KEY'
+            definitions.append(definition)
+        self.connection.execute(f'CREATE TABLE {quote(table)} ({", ".join(definitions)})')
+
+    def insert(self, table, columns, df):
+        """
+        Inserts the rows of a dataframe into a table, batch_size rows at a
+        time. Missing values are inserted as NULL.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        columns : list
+            The columns of the table to insert, which are also the columns
+            of the dataframe to read.
+
+        df : pandas.DataFrame
+            The rows to insert. Columns that are not in columns are
+            ignored, and columns that are missing are inserted as NULL.
+        """
+        df = df.reindex(columns=columns)
+        statement = f'INSERT INTO {quote(table)} ({", ".join(quote(column) for column in columns)}) ' \
+                    f'VALUES ({", ".join("?" for _ in columns)})'
+        for start in range(0, len(df), self.batch_size):
+            # Converting to objects turns NumPy numbers into Python
+            # numbers, which is what sqlite3 accepts.
+            batch = df.iloc[start:start + self.batch_size].astype(object)
+            batch = batch.where(batch.notna(), None)
+            self.connection.executemany(statement, batch.itertuples(index=False, name=None))
+
+    def write_projects(self, extended_project_list):
+        """
+        Writes the projects table.
+
+        Parameters
+        ----------
+        extended_project_list : pandas.DataFrame
+            The extended project list of the run. Projects without a
+            "Project ID with serial" are stored under their Project ID.
+        """
+        projects = extended_project_list.copy()
+        if 'Project ID with serial' not in projects.columns:
+            projects['Project ID with serial'] = projects['Project ID']
+        else:
+            projects['Project ID with serial'] = projects['Project ID with serial'].fillna(projects['Project ID'])
+
+        columns = dict()
+        for column, dtype in projects.dtypes.items():
+            if dtype.kind in 'iub':
+                columns[column] = 'INTEGER'
+            elif dtype.kind == 'f':
+                columns[column] = 'REAL'
+            else:
+                columns[column] = 'TEXT'
+        self.create_table('projects', columns, primary_key='Project ID with serial')
+        self.project_columns = list(columns.keys())
+        self.insert('projects', self.project_columns, projects)
+
+    def write_costs(self, costs):
+        """
+        Parameters
+        ----------
+        costs : pandas.DataFrame
+            The costs, as made by CsvGenerator.create_costs_dataframe().
+        """
+        self.insert('costs', list(self.costs_columns.keys()), costs)
+
+    def write_details(self, details):
+        """
+        Parameters
+        ----------
+        details : pandas.DataFrame
+            The details, as made by CsvGenerator.create_details_dataframe().
+        """
+        self.insert('details', list(self.details_columns.keys()), details)
+
+    def create_indexes_and_views(self):
+        """
+        Indexes the costs and details and makes the views that join them
+        with their projects.
+        """
+        for table, indexes in self.indexes.items():
+            for columns in indexes:
+                name = f'{table}_{"_".join(columns)}'.lower().replace(' ', '_')
+                column_list = ', '.join(quote(column) for column in columns)
+                self.connection.execute(f'CREATE INDEX {quote(name)} ON {quote(table)} ({column_list})')
+
+        for table in ['costs', 'details']:
+            table_columns = list(self.costs_columns if table == 'costs' else self.details_columns)
+            selected = [f'r.{quote(column)}' for column in table_columns]
+            selected += [f'p.{quote(column)}' for column in self.project_columns if column not in table_columns]
+            join = 'LEFT JOIN projects p ON p."Project ID with serial" = r."Project ID with serial"' \
+                if len(self.project_columns) > 0 else ''
+            self.connection.execute(f'CREATE VIEW {quote("landbosse_" + table)} AS '
+                                    f'SELECT {", ".join(selected)} FROM {quote(table)} r {join}')
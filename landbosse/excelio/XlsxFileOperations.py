@@ -1,9 +1,10 @@
 import os
-import sys
 from datetime import datetime
 from shutil import copy2
 from shutil import copytree
 
+from .RunConfiguration import RunConfiguration
+from .ProjectShard import ProjectShard
 from .XlsxOperationException import XlsxOperationException
 
 
@@ -12,155 +13,211 @@ class XlsxFileOperations:
     This class is made to handle file naming and copying.
     """
 
-    def __init__(self):
+    def __init__(self, config=None):
         """
         The __init__() method just makes a timestamp that will be used throughout
         the lifetime of this instance.
+
+        Parameters
+        ----------
+        config : RunConfiguration
+            The configuration of the run, which has the input and output
+            directories and the options. If None, the configuration comes
+            from the environment variables and defaults. See
+            RunConfiguration.from_environment().
         """
         dt = datetime.now()
         self.timestamp = f'{dt.year}-{dt.month}-{dt.day}-{dt.hour}-{dt.minute}-{dt.second}'
+        self.config = config if config is not None else RunConfiguration.from_environment()
 
-    def get_input_output_paths_from_argv_or_env(self):
-        """
-        This uses the sys.argv object to inspect the command line to find input
-        and output paths as specified on the command line. It expects the
-        command line to have options in the following form:
-
-        -i [input file] -o [output file]
-
-        If one or both of these is missing, then it is filled with the defaults
-        from the environment variables LANDBOSSE_INPUT_DIR or LANDBOSSE_OUTPUT_DIR
-
-        If all of them are missing the method defaults to 'inputs/' and 'outputs/'
-
-        There is a third option this method looks for:
+        # Directories that have been checked or created already. Each is
+        # only checked once, however often it is asked for.
+        self._directories = set()
 
-        --validate or -v
+        # The shard of the project list this run calculates, if --shard
+        # is given. It is made once so that the projects it selects are
+        # remembered for its manifest.
+        self._project_shard = None
+        if self.config.shard is not None:
+            self._project_shard = ProjectShard.parse(self.config.shard, self.config.shard_by)
 
-        If that parameter is present, then --output or -o is optional. If enabled,
-        validation mode will accept an input directory with --input that must also have a
-        landbosse-output.xlsx file. The model will then run on the inputs. Instead
-        of writing a file of the output, the output will stay in memory. The
-        landbosse-output.xlsx will then be loaded and compared against the in
-        memory output. If the outputs are the same, the validation passes
-        because the results were reproduced. Otherwise, the validation failed
-        because something broke in the model.
-
-        There is a fourth option this method looks for:
+    def landbosse_input_dir(self):
+        """
+        Returns
+        -------
+        str
+            The input directory.
+        """
+        return self.config.input_dir
 
-        --scaling or -s
+    def result_cache_dir(self):
+        """
+        Returns the directory of the project result cache, given with
+        --cache or the LANDBOSSE_CACHE_DIR environment variable. See
+        ProjectResultCache for how the cache works.
 
-        This enables auto scaling of input parameters as found in XlsxReader's
-        apply_cost_and_scaling_modifications_to_project_parameters() method.
+        Returns
+        -------
+        str or None
+            The path to the cache directory or None if caching is disabled.
+        """
+        return self.config.cache_dir
 
-        Parameters
-        ----------
-        This function takes no parameters.
+    def resume_dir(self):
+        """
+        Returns the output directory of an interrupted run to resume, given
+        with --resume. See ProjectResultJournal for how runs are resumed.
 
         Returns
         -------
-        str, str, bool
-            The first two strings are paths to the input and output files
-            respectively. The third bool is True if validation mode is
-            enabled, False for normal operation.
+        str or None
+            The output directory of the run to resume or None if no run
+            is being resumed.
         """
+        return self.config.resume_dir
 
-        # Get the fallback paths from the environment variables and set their
-        # defaults. These defualts are used
-
-        input_path_from_env = os.environ.get('LANDBOSSE_INPUT_DIR', 'input')
-        output_path_from_env = os.environ.get('LANDBOSSE_OUTPUT_DIR', 'output')
+    def profiling_enabled(self):
+        """
+        If --profile is given, the time spent in each stage of each project
+        is recorded with StageTimer and written to timing tables in the
+        output directory.
 
-        # input and output paths from command line are initially set to None
-        # to indicate they have not been found yet.
+        Returns
+        -------
+        bool
+            True if profiling is enabled.
+        """
+        return self.config.profile
 
-        input_path_from_arg = None
-        output_path_from_arg = None
+    def module_threads(self):
+        """
+        Returns the number of threads that run the cost modules of each
+        project, given with --module-threads.
 
-        # This is for validation option detection
-        validation_enabled =  '--validate' in sys.argv or '-v' in sys.argv
+        Cost modules that do not depend on each other run at the same time
+        on these threads. See Manager. This mostly helps runs of a few
+        large projects; runs of many projects are already spread over all
+        the cores by XlsxParallelManagerRunner.
 
-        # This is for scaling study operation
-        enable_scaling_study = '--scaling' in sys.argv or '-s' in sys.argv
+        Returns
+        -------
+        int
+            The number of threads. 1, meaning the modules run one after
+            another, if the option is missing.
+        """
+        return self.config.module_threads
 
-        # If validation and scaling study are simultaneously enabled, raise
-        # an error
+    def cprofile_enabled(self):
+        """
+        If --cprofile is given, each project is run under cProfile and the
+        statistics are dumped to the folder returned by
+        cprofile_output_path(). This is separate from --profile because
+        cProfile slows down the run and would distort the timing tables.
 
-        if validation_enabled and enable_scaling_study:
-            raise XlsxOperationException('--scaling-study and --validate cannot be enabled at the same time.')
+        Returns
+        -------
+        bool
+            True if profiling with cProfile is enabled.
+        """
+        return self.config.cprofile
 
-        # Look for the input path on command line
-        if '--input' in sys.argv and sys.argv.index('--input') + 1 < len(sys.argv):
-            input_idx = sys.argv.index('--input') + 1
-            input_path_from_arg = sys.argv[input_idx]
+    def project_shard(self):
+        """
+        Returns the shard of the project list given with --shard i/N, whose
+        projects are the only ones this run calculates. See ProjectShard.
 
-        if '-i' in sys.argv and sys.argv.index('-i') + 1 < len(sys.argv):
-            input_idx = sys.argv.index('-i') + 1
-            input_path_from_arg = sys.argv[input_idx]
+        Returns
+        -------
+        ProjectShard or None
+            The shard, or None if the whole project list is calculated.
+        """
+        return self._project_shard
 
-        # Look for the output path on command line
-        if '--output' in sys.argv and sys.argv.index('--output') + 1 < len(sys.argv):
-            output_idx = sys.argv.index('--output') + 1
-            output_path_from_arg = sys.argv[output_idx]
+    def directory(self, path, description):
+        """
+        Returns a directory, creating it and any missing parents the first
+        time it is asked for. Later calls return the path without touching
+        the file system.
 
-        if '-o' in sys.argv and sys.argv.index('-o') + 1 < len(sys.argv):
-            output_idx = sys.argv.index('-o') + 1
-            output_path_from_arg = sys.argv[output_idx]
+        Parameters
+        ----------
+        path : str
+            The path to the directory.
 
-        # Find the final input and output paths. If a command line argument was
-        # found for input and/or output, that is used. If it wasn't found,
-        # the value from the environment variable search is returned, which includes
-        # the default if the environment variable itself wasn't found.
+        description : str
+            What is written to the directory, for the error message.
 
-        input_path = input_path_from_arg if input_path_from_arg is not None else input_path_from_env
-        output_path = output_path_from_arg if output_path_from_arg is not None else output_path_from_env
+        Returns
+        -------
+        str
+            The path.
 
-        # Return the state of the command line arguments.
-        return input_path, output_path, validation_enabled, enable_scaling_study
+        Raises
+        ------
+        XlsxOperationException
+            If the path exists and is not a directory.
+        """
+        if path not in self._directories:
+            if os.path.exists(path) and not os.path.isdir(path):
+                raise XlsxOperationException(f'Attempt to write {description} to {path} failed. File exists and is not a directory.')
+            os.makedirs(path, exist_ok=True)
+            self._directories.add(path)
+        return path
 
-    def landbosse_input_dir(self):
+    def cprofile_output_path(self):
         """
-        See the get_input_output_paths_from_argv_or_env() function above. This
-        function is simply a wrapper around that function to get the input
-        path.
+        Returns the path to the folder for cProfile statistics. If the
+        folder does not exist, it is created.
 
         Returns
         -------
         str
-            The input directory.
+            Path to the cProfile statistics folder.
         """
-
-        # The last three elements of the returned tuple are not used here.
-        # See get_input_output_paths_from_argv_or_env() docstring for more
-        # details.
-
-        input_path, _, _, _ = self.get_input_output_paths_from_argv_or_env()
-        return input_path
+        return self.directory(os.path.join(self.landbosse_output_dir(), 'profiles'), 'profiles')
 
     def landbosse_output_dir(self):
         """
-        See the get_input_output_paths_from_argv_or_env() function above. This
-        method gets the base path from there. Then, it checks for a timestamped
-        directory that matches the timestamp in this instance. If it finds that
-        directory, it simply returns the path to that directory. If it does
-        not find that directory, it creates the directory and returns the path
-        to the newly created directory.
+        Returns the timestamped directory inside the output directory of
+        the configuration that matches the timestamp in this instance. The
+        first call creates it; later calls return the path without
+        touching the file system.
+
+        If a run is being resumed (see resume_dir() above), the output
+        directory of that run is returned instead. It must already exist.
 
         Returns
         -------
         str
             The output directory.
-        """
-        _, output_base_path, _, _ = self.get_input_output_paths_from_argv_or_env()
-        output_path = os.path.join(output_base_path, f'landbosse-{self.timestamp}')
 
-        if os.path.exists(output_path) and not os.path.isdir(output_path):
-            raise FileExistsError(f'Cannot overwrite {output_path} with LandBOSSE data.')
-        elif not os.path.exists(output_path):
-            os.mkdir(output_path)
-            return output_path
-        else:
-            return output_path
+        Raises
+        ------
+        XlsxOperationException
+            If the output directory of the run to resume does not exist.
+        """
+        resume_path = self.resume_dir()
+        if resume_path is not None:
+            if resume_path not in self._directories:
+                if not os.path.isdir(resume_path):
+                    raise XlsxOperationException(f'Cannot resume run in {resume_path}. It is not a directory.')
+                self._directories.add(resume_path)
+            return resume_path
+
+        # The shards of a sweep usually start at the same time, so each
+        # writes to a directory named after its shard.
+        output_name = f'landbosse-{self.timestamp}'
+        if self._project_shard is not None:
+            output_name += f'-shard-{self._project_shard.index}-of-{self._project_shard.count}'
+        output_path = os.path.join(self.config.output_dir, output_name)
+
+        if output_path not in self._directories:
+            if os.path.exists(output_path) and not os.path.isdir(output_path):
+                raise FileExistsError(f'Cannot overwrite {output_path} with LandBOSSE data.')
+            elif not os.path.exists(output_path):
+                os.mkdir(output_path)
+            self._directories.add(output_path)
+        return output_path
 
     def parametric_project_data_output_path(self):
         """
@@ -177,12 +234,7 @@ class XlsxFileOperations:
             Path to project data output folder.
         """
         path = os.path.join(self.landbosse_output_dir(), 'calculated_parametric_inputs', 'parametric_project_data')
-
-        if os.path.exists(path) and not os.path.isdir(path):
-            raise XlsxOperationException(f'Attempt to write project data to {path} failed. File exists and is not a directory.')
-
-        os.makedirs(path, exist_ok=True)
-        return path
+        return self.directory(path, 'project data')
 
     def extended_project_list_path(self):
         """
@@ -198,12 +250,7 @@ class XlsxFileOperations:
             list.
         """
         path = os.path.join(self.landbosse_output_dir(), 'calculated_parametric_inputs')
-
-        if os.path.exists(path) and not os.path.isdir(path):
-            raise XlsxOperationException(f'Attempt to write project data to {path} failed. File exists and is not a directory.')
-
-        os.makedirs(path, exist_ok=True)
-        return path
+        return self.directory(path, 'project data')
 
     def copy_input_data(self):
         """
@@ -220,7 +267,10 @@ class XlsxFileOperations:
         dst_project_data_dir = os.path.join(dst_inputs_copy_path, 'project_data')
 
         copy2(src_project_list_xlsx, dst_project_list_xlsx)
-        copytree(src_project_data_dir, dst_project_data_dir)
+
+        # A resumed run may have copied the project data already.
+        if not os.path.isdir(dst_project_data_dir):
+            copytree(src_project_data_dir, dst_project_data_dir)
 
         src_expected_validation_data = os.path.join(self.landbosse_input_dir(),
                                                     'landbosse-expected-validation-data.xlsx')
@@ -1,5 +1,3 @@
-import xlsxwriter
-from xlsxwriter.utility import xl_rowcol_to_cell
 import pandas as pd
 import os
 import traceback
@@ -17,9 +15,20 @@ class XlsxGenerator:
 
     Each method call on the context manager makes one or more tabs on the
     output Excel workbook.
+
+    By default, the workbook is written in xlsxwriter's constant_memory
+    mode, which streams each row to disk as soon as the next row is
+    started, so memory use does not grow with the number of rows. In this
+    mode the rows of each tab must be written in order, which the tab
+    methods do. A tab with more rows than fit on an Excel worksheet is
+    continued on more worksheets, named with a suffix: details, details_2,
+    details_3 and so on.
     """
 
-    def __init__(self, output_xlsx, file_ops):
+    # The number of rows on an Excel worksheet, including the header row.
+    max_excel_rows = 1048576
+
+    def __init__(self, output_xlsx, file_ops, constant_memory=True, max_rows_per_sheet=None):
         """
         This constructor sets the name of the .xlsx file for writing
 
@@ -35,6 +44,15 @@ class XlsxGenerator:
 
         file_ops : XlsxFileOperations
             An instance of XlsxFileOperations to manage file names.
+
+        constant_memory : bool
+            True to stream the rows to disk as they are written. False to
+            keep the whole workbook in memory until it is closed.
+
+        max_rows_per_sheet : int
+            The number of rows, including the header row, after which a
+            tab is continued on another worksheet. Defaults to the Excel
+            limit of max_excel_rows.
         """
 
         # Set all instance attributes to None first in the constructor as good
@@ -45,6 +63,8 @@ class XlsxGenerator:
         self.percent_format = None
         self.output_xlsx_path = os.path.join(file_ops.landbosse_output_dir(), f'{output_xlsx}.xlsx')
         self.file_ops = file_ops
+        self.constant_memory = constant_memory
+        self.max_rows_per_sheet = max_rows_per_sheet if max_rows_per_sheet is not None else self.max_excel_rows
 
     @classmethod
     def write_project_data(cls, project_data_dataframes, project_data_output_xlsx_path):
@@ -79,7 +99,12 @@ class XlsxGenerator:
         self
             Returns self for easy use in the context manager.
         """
-        self.workbook = xlsxwriter.Workbook(self.output_xlsx_path, {'nan_inf_to_errors': True})
+        # xlsxwriter is only imported when a workbook is written.
+        import xlsxwriter
+        self.workbook = xlsxwriter.Workbook(self.output_xlsx_path, {
+            'nan_inf_to_errors': True,
+            'constant_memory': self.constant_memory,
+        })
         self.set_workbook_formats()
         return self
 
@@ -127,6 +152,78 @@ class XlsxGenerator:
         self.accounting_format = self.workbook.add_format()
         self.accounting_format.set_num_format('$ #,##0')
 
+    def split_worksheets(self, name, header, column_widths):
+        """
+        Makes the worksheets of a tab as they are needed. Each worksheet
+        gets the header row, the column widths and a frozen header before
+        any of its rows are written.
+
+        Parameters
+        ----------
+        name : str
+            The name of the first worksheet. Later worksheets have a suffix
+            of _2, _3 and so on, with the name shortened if needed to fit
+            the 31 character limit of Excel.
+
+        header : list
+            The names of the columns.
+
+        column_widths : list
+            Tuples of (first column, last column, width).
+
+        Yields
+        ------
+        worksheet, int
+            A worksheet and the index of its first row of data. Each
+            worksheet has room for max_rows_per_sheet - 1 rows of data.
+        """
+        sheet_number = 1
+        while True:
+            # Excel sheet names are at most 31 characters, so the name is
+            # shortened to make room for the suffix.
+            suffix = '' if sheet_number == 1 else f'_{sheet_number}'
+            sheet_name = f'{name[:31 - len(suffix)]}{suffix}'
+            worksheet = self.workbook.add_worksheet(sheet_name)
+            for first_col, last_col, width in column_widths:
+                worksheet.set_column(first_col, last_col, width)
+            worksheet.freeze_panes(1, 0)  # Freeze the first row.
+            worksheet.write_row(0, 0, header, self.header_format)
+            yield worksheet
+            sheet_number += 1
+
+    def write_split_rows(self, name, header, column_widths, rows, write_row):
+        """
+        Writes rows to a tab, continuing on another worksheet whenever a
+        worksheet is full. See split_worksheets().
+
+        Parameters
+        ----------
+        name : str
+            The name of the tab.
+
+        header : list
+            The names of the columns.
+
+        column_widths : list
+            Tuples of (first column, last column, width).
+
+        rows : iterable
+            The rows to write.
+
+        write_row : callable
+            Called as write_row(worksheet, row_idx, row) to write each row.
+        """
+        rows_per_sheet = self.max_rows_per_sheet - 1
+        worksheets = self.split_worksheets(name, header, column_widths)
+        worksheet = next(worksheets)
+        row_idx = 0
+        for row in rows:
+            if row_idx == rows_per_sheet:
+                worksheet = next(worksheets)
+                row_idx = 0
+            write_row(worksheet, row_idx + 1, row)
+            row_idx += 1
+
     def tab_costs_by_module_type_operation(self, rows):
         """
         This writes the costs_by_module_type_operation tab.
@@ -137,32 +234,30 @@ class XlsxGenerator:
             List of dictionaries that are each row in the output
             sheet.
         """
-        worksheet = self.workbook.add_worksheet('costs_by_module_type_operation')
-        for idx, col_name in enumerate(['Project ID with serial',
-                                        'Number of turbines',
-                                        'Turbine rating MW',
-                                        'Rotor diameter m',
-                                        'Module',
-                                        'Operation ID',
-                                        'Type of cost',
-                                        'Cost per turbine',
-                                        'Cost per project',
-                                        'USD/kW per project']):
-            worksheet.write(0, idx, col_name, self.header_format)
-        for row_idx, row in enumerate(rows):
-            worksheet.write(row_idx + 1, 0, row['project_id_with_serial'])
-            worksheet.write(row_idx + 1, 1, row['num_turbines'])
-            worksheet.write(row_idx + 1, 2, row['turbine_rating_MW'])
-            worksheet.write(row_idx + 1, 3, row['rotor_diameter_m'])
-            worksheet.write(row_idx + 1, 4, row['module'])
-            worksheet.write(row_idx + 1, 5, row['operation_id'])
-            worksheet.write(row_idx + 1, 6, row['type_of_cost'])
-            worksheet.write(row_idx + 1, 7, row['cost_per_turbine'], self.accounting_format)
-            worksheet.write(row_idx + 1, 8, row['cost_per_project'], self.accounting_format)
-            worksheet.write(row_idx + 1, 9, row['usd_per_kw_per_project'], self.accounting_format)
-            worksheet.set_column(0, 5, 25)
-            worksheet.set_column(6, 10, 17)
-        worksheet.freeze_panes(1, 0)  # Freeze the first row.
+        header = ['Project ID with serial',
+                  'Number of turbines',
+                  'Turbine rating MW',
+                  'Rotor diameter m',
+                  'Module',
+                  'Operation ID',
+                  'Type of cost',
+                  'Cost per turbine',
+                  'Cost per project',
+                  'USD/kW per project']
+
+        def write_row(worksheet, row_idx, row):
+            worksheet.write_row(row_idx, 0, [row['project_id_with_serial'],
+                                             row['num_turbines'],
+                                             row['turbine_rating_MW'],
+                                             row['rotor_diameter_m'],
+                                             row['module'],
+                                             row['operation_id'],
+                                             row['type_of_cost']])
+            worksheet.write_row(row_idx, 7, [row['cost_per_turbine'],
+                                             row['cost_per_project'],
+                                             row['usd_per_kw_per_project']], self.accounting_format)
+
+        self.write_split_rows('costs_by_module_type_operation', header, [(0, 5, 25), (6, 10, 17)], rows, write_row)
 
     def tab_details(self, rows):
         """
@@ -178,45 +273,40 @@ class XlsxGenerator:
         rows : list
             list of dicts. See above.
         """
-        worksheet = self.workbook.add_worksheet('details')
-        worksheet.set_column(3, 3, 66)
-        worksheet.set_column(4, 4, 17)
-        worksheet.set_column(5, 5, 66)
-        worksheet.set_column(0, 2, 17)
+        header = ['Project ID with serial', 'Module', 'Variable or DataFrame', 'name', 'unit', 'Numeric value', 'Non-numeric value']
 
-        for idx, col_name in enumerate(['Project ID with serial', 'Module', 'Variable or DataFrame', 'name', 'unit', 'Numeric value', 'Non-numeric value']):
-            worksheet.write(0, idx, col_name, self.header_format)
-
-        # Go through each row and create Excel rows from each of those rows.
-        for row_idx, row in enumerate(rows):
-            worksheet.write(row_idx + 1, 0, row['project_id_with_serial'])
-            worksheet.write(row_idx + 1, 1, row['module'])
-            worksheet.write(row_idx + 1, 2, row['type'])
-            worksheet.write(row_idx + 1, 3, row['variable_df_key_col_name'])
-            worksheet.write(row_idx + 1, 4, row['unit'])
+        def write_row(worksheet, row_idx, row):
+            worksheet.write_row(row_idx, 0, [row['project_id_with_serial'],
+                                             row['module'],
+                                             row['type'],
+                                             row['variable_df_key_col_name'],
+                                             row['unit']])
 
             value = row['value']
             value_is_number = self._is_numeric(value)
-            if value_is_number:
-                worksheet.write(row_idx + 1, 5, value, self.scientific_format)
-            else:
-                worksheet.write(row_idx + 1, 6, value)
+            numeric_value = value if value_is_number else None
+            non_numeric_value = None if value_is_number else value
 
             # If there is a last_number, which means this is a dataframe row that has a number
             # at the end, write this into the numeric value column. This overrides automatic
             # type detection.
 
             if 'last_number' in row:
-                worksheet.write(row_idx + 1, 5, row['last_number'], self.scientific_format)
+                numeric_value = row['last_number']
 
             # Certain data are pairs of numeric and non-numeric values. If a key of
             # "non_numeric_value" exists, put that in column 6.
             # An example is mobilization of an LB75-SL3F-Offload at some numeric cost
 
             if 'non_numeric_value' in row:
-                worksheet.write(row_idx + 1, 6, row['non_numeric_value'])
+                non_numeric_value = row['non_numeric_value']
+
+            if numeric_value is not None:
+                worksheet.write(row_idx, 5, numeric_value, self.scientific_format)
+            if non_numeric_value is not None:
+                worksheet.write(row_idx, 6, non_numeric_value)
 
-        worksheet.freeze_panes(1, 0)  # Freeze the first row.
+        self.write_split_rows('details', header, [(3, 3, 66), (4, 4, 17), (5, 5, 66), (0, 2, 17)], rows, write_row)
 
     def _is_numeric(self, value):
         """
@@ -1,7 +1,15 @@
+import cProfile
+import os
+import time
+import traceback
+
 import pandas as pd
 
+from ..model import Manager
+from ..model import StageTimer
 from .XlsxDataframeCache import XlsxDataframeCache
 from .XlsxFileOperations import XlsxFileOperations
+from .ProjectResultCache import ProjectResultCache
 from .XlsxReader import XlsxReader
 
 
@@ -14,7 +22,7 @@ class XlsxManagerRunner:
     or parallel manager runner is needed.
     """
 
-    def __init__(self, file_ops=None):
+    def __init__(self, file_ops=None, result_cache=None, journal=None):
         """
         The constructor simply creates an XlsxFileOperations instance
         to live throughout the lifetime of the instance
@@ -25,8 +33,26 @@ class XlsxManagerRunner:
             The file operation instance used to create filenames. If this
             is left at the default of None, a new instance of
             XlsxFileOperations is created.
+
+        result_cache : ProjectResultCache
+            The cache of project results from previous runs. Projects
+            found in this cache are not calculated again. If this is
+            left at the default of None, every project is calculated.
+
+        journal : ProjectResultJournal
+            The journal to which the results of each project are
+            checkpointed as soon as the project finishes. Projects already
+            in the journal (because a run is being resumed) are not
+            calculated again. If this is left at the default of None,
+            results are not checkpointed.
         """
         self.file_ops = file_ops if file_ops is not None else XlsxFileOperations()
+        self.result_cache = result_cache
+        self.journal = journal
+
+        # Records of timed stages (see StageTimer) collected from all the
+        # projects, including those run in worker processes.
+        self.stage_timings = []
 
     def run_from_project_list_xlsx(self, projects_xlsx,  enable_cost_and_scaling_modifications=True):
         """
@@ -55,15 +81,16 @@ class XlsxManagerRunner:
 
         Returns
         -------
-        OrderedDict or dict, list
-            First element of tuple is an ordered dict that is the result of
-            all the runs. Each key is the name of a project and each value
-            is the output dictionary of that project. The second element
-            is the list of rows for the csv. The third element is the list
-            of costs for the spreadsheets. For the first element, serial
-            processes implement an OrderedDict (because order can be guaranteed)
-            and for the second element processes implement a dict (because
-            order cannot be guaranteed).
+        dict
+            A dictionary with the following keys. 'details_list' is the
+            list of rows for the details. 'module_type_operation_list' is
+            the list of rows for the costs. 'extended_project_list' is the
+            dataframe of the project list with all the parametric values.
+            'failures' is the list of failure records of projects that
+            failed (see Manager.failure_record()). Projects that failed have
+            no rows in the details or costs. 'stage_timings' is the list of
+            records of timed stages (see StageTimer), which is empty unless
+            StageTimer is enabled.
 
         Raises
         ------
@@ -127,6 +154,280 @@ class XlsxManagerRunner:
                     runs_for_csv.extend(value)
         return runs_for_csv
 
+    def profile_path(self, project_id_with_serial):
+        """
+        Returns the path to dump the cProfile statistics of a project to,
+        if profiling with cProfile is enabled.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The Project ID with serial of the project.
+
+        Returns
+        -------
+        str or None
+            The path to the profile statistics file, or None if profiling
+            with cProfile is not enabled.
+        """
+        if not self.file_ops.cprofile_enabled():
+            return None
+        return os.path.join(self.file_ops.cprofile_output_path(), f'{project_id_with_serial}.prof')
+
+    def collected_stage_timings(self):
+        """
+        Returns the records of all timed stages of the run: those collected
+        from the projects and those made in this process outside of the
+        projects, such as writing the project data sheets.
+
+        Returns
+        -------
+        list
+            The stage records. See StageTimer.
+        """
+        self.stage_timings.extend(StageTimer.drain_records())
+        return self.stage_timings
+
+    def completed_results_from_journal(self):
+        """
+        Reads the results of projects that finished before the run was
+        interrupted. See ProjectResultJournal for details.
+
+        Returns
+        -------
+        dict
+            Keys are Project IDs with serial and values are the records of
+            the completed projects. See
+            ProjectResultJournal.completed_results(). Empty if no journal
+            is in use.
+        """
+        if self.journal is None:
+            return dict()
+        completed_results = self.journal.completed_results()
+        if len(completed_results) > 0:
+            print(f'Resuming run: {len(completed_results)} projects already completed')
+        return completed_results
+
+    @staticmethod
+    def completed_result(completed_results, project_id_with_serial, fingerprint):
+        """
+        Finds the results of a project that finished before the run was
+        interrupted, if its inputs have not changed since.
+
+        Parameters
+        ----------
+        completed_results : dict
+            The completed projects, from completed_results_from_journal().
+
+        project_id_with_serial : str
+            The Project ID with serial of the project.
+
+        fingerprint : str
+            The fingerprint of the project in this run.
+
+        Returns
+        -------
+        dict or None
+            The result rows of the project, or None if it did not finish
+            or its fingerprint has changed, in which case it must be
+            calculated again.
+        """
+        completed = completed_results.get(project_id_with_serial)
+        if completed is None:
+            return None
+        if completed['fingerprint'] != fingerprint:
+            print(f'>>> Inputs of {project_id_with_serial} changed since it was completed, calculating it again')
+            return None
+        return completed['results']
+
+    def checkpoint(self, project_id_with_serial, output_dict, fingerprint):
+        """
+        Appends the results of a finished project to the journal, if a
+        journal is in use.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The Project ID with serial of the finished project.
+
+        output_dict : dict
+            The output dictionary of the finished project.
+
+        fingerprint : str
+            The fingerprint of the project.
+        """
+        if self.journal is not None:
+            self.journal.append(project_id_with_serial, output_dict, fingerprint)
+
+    @staticmethod
+    def run_project(project_id_with_serial, project_data_sheets, project_parameters, profile_path=None,
+                    module_threads=1, detail_level='full', detail_modules=None):
+        """
+        Creates the master input dictionary of one project and runs
+        Manager on it.
+
+        Failures are captured rather than raised. If the master input
+        dictionary cannot be created, or a module fails, the failure
+        records are in the list under the 'failures' key of the returned
+        output dictionary. See Manager.execute_landbosse() for details.
+
+        If StageTimer is enabled, the records of the stages that ran in
+        this process are under the 'stage_timings' key of the returned
+        output dictionary.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The Project ID with serial of the project.
+
+        project_data_sheets : dict
+            The project data dataframes after all modifications.
+
+        project_parameters : pandas.Series
+            The project parameters after all modifications.
+
+        profile_path : str
+            If this is not None, the project is run under cProfile and
+            the profile statistics are dumped to this path. They can be
+            read with the pstats module or a viewer such as snakeviz.
+
+        module_threads : int
+            The number of threads Manager runs the cost modules on.
+
+        detail_level : str
+            How many rows of details the cost modules make. See
+            CostModule.detail_level().
+
+        detail_modules : tuple
+            The names of the only modules that make details, or None for
+            all of them.
+
+        Returns
+        -------
+        dict
+            The output dictionary of the project.
+        """
+        output_dict = dict()
+        output_dict['project_series'] = project_parameters
+        profiler = cProfile.Profile() if profile_path is not None else None
+        if profiler is not None:
+            profiler.enable()
+        start = time.perf_counter()
+
+        try:
+            xlsx_reader = XlsxReader()
+            with StageTimer.stage(project_id_with_serial, 'XlsxReader.create_master_input_dictionary'):
+                master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_parameters)
+        except Exception as error:
+            traceback.print_exc()
+            elapsed_seconds = time.perf_counter() - start
+            output_dict['failures'] = [Manager.failure_record(project_id_with_serial, 'XlsxReader', error, elapsed_seconds)]
+        else:
+            mc = Manager(input_dict=master_input_dict, output_dict=output_dict, max_workers=module_threads,
+                         detail_level=detail_level, detail_modules=detail_modules)
+            mc.execute_landbosse(project_name=project_id_with_serial)
+
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+
+        if StageTimer.is_enabled():
+            output_dict['stage_timings'] = StageTimer.drain_records()
+
+        return output_dict
+
+    def collect_project_result(self, project_id_with_serial, output_dict, fingerprint, runs_dict, failures):
+        """
+        Sorts the output dictionary of a project that has just been run
+        into the successful runs or the failures.
+
+        A project that ran successfully is put into runs_dict, checkpointed
+        to the journal and stored in the result cache. A project that failed
+        has its failure records (see Manager.failure_record()) added to
+        failures, and none of its partial results are kept. This way one bad
+        project does not stop or corrupt the rest of the run.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The Project ID with serial of the project.
+
+        output_dict : dict
+            The output dictionary of the project.
+
+        fingerprint : str
+            The fingerprint of the project for the journal and the result
+            cache, or None if neither is in use.
+
+        runs_dict : dict
+            The output dictionaries of successful projects, keyed by
+            Project ID with serial.
+
+        failures : list
+            The failure records of all the projects.
+        """
+        self.stage_timings.extend(output_dict.pop('stage_timings', []))
+
+        project_failures = output_dict.get('failures', [])
+        if len(project_failures) > 0:
+            for failure in project_failures:
+                print(f'Project {project_id_with_serial} failed in {failure["module"]}: '
+                      f'{failure["exception"]}: {failure["message"]}')
+            failures.extend(project_failures)
+            return
+
+        runs_dict[project_id_with_serial] = output_dict
+        self.checkpoint(project_id_with_serial, output_dict, fingerprint)
+        if self.result_cache is not None:
+            self.result_cache.store(fingerprint, output_dict)
+
+    def project_fingerprint(self, project_parameters, project_data_sheets):
+        """
+        Calculates the fingerprint of a project, with the detail level and
+        modules of the run, for the journal and the result cache. This must
+        be called after all modifications have been made to the project
+        parameters and project data sheets, but before the master input
+        dictionary is created from them.
+
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The project parameters after all modifications.
+
+        project_data_sheets : dict
+            The project data dataframes after all modifications.
+
+        Returns
+        -------
+        str
+            The fingerprint of the project, or None if neither a journal
+            nor a result cache is in use.
+        """
+        if self.journal is None and self.result_cache is None:
+            return None
+        config = self.file_ops.config
+        return ProjectResultCache.fingerprint(project_parameters, project_data_sheets,
+                                              config.detail_level, config.detail_modules)
+
+    def lookup_cached_result(self, fingerprint):
+        """
+        Looks up the results of a project in the result cache.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the project, from project_fingerprint().
+
+        Returns
+        -------
+        dict
+            The cached result rows, or None if the project has not been
+            calculated before or no result cache is in use.
+        """
+        if self.result_cache is None:
+            return None
+        return self.result_cache.load(fingerprint)
+
     def read_project_and_parametric_list_from_xlsx(self):
         """
         This method reads both the project and parametric list from the
@@ -151,7 +452,8 @@ class XlsxManagerRunner:
         -------
         pandas.DataFrame
             The enhanced project list that has support for all parametric
-            adjustments for each step.
+            adjustments for each step. With --shard, only the projects of
+            the shard are returned.
 
         Raises
         ------
@@ -185,4 +487,9 @@ class XlsxManagerRunner:
         extended_project_list = xlsx_reader.outer_join_projects_to_parametric_values(project_list,
                                                                                  parametric_value_list)
 
+        # With --shard, only the projects of the shard are run.
+        project_shard = self.file_ops.project_shard()
+        if project_shard is not None:
+            extended_project_list = project_shard.select(extended_project_list)
+
         return extended_project_list
@@ -1,10 +1,12 @@
 import os
+import time
 from concurrent import futures
+from concurrent.futures.process import BrokenProcessPool
 
 import pandas as pd
 
 from ..model import Manager
-from .XlsxFileOperations import XlsxFileOperations
+from ..model import StageTimer
 from .XlsxReader import XlsxReader
 from .XlsxManagerRunner import XlsxManagerRunner
 from .XlsxDataframeCache import XlsxDataframeCache
@@ -17,6 +19,10 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
     with a ProcessPoolExecutor.
     """
 
+    # The number of times a project is retried on a fresh process after
+    # a worker process crashed while running it.
+    max_crash_retries = 2
+
     def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False):
         """
         This function runs all the scenarios in the projects_xlsx file. It creates
@@ -52,9 +58,6 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
         print('Calculating parametric values')
         extended_project_list_before_parameter_modifications = self.read_project_and_parametric_list_from_xlsx()
 
-        # Prepare the file operations
-        file_ops = XlsxFileOperations()
-
         # Instantiate an XlsxReader to handle the parametrics and master input
         # dictionaries
         xlsx_reader = XlsxReader()
@@ -67,8 +70,17 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
         # for why this is more performant than appending to a dataframe.
         extended_project_list_after_parameter_modifications = []
 
-        # Prep all task for the executor
+        # Projects that finished before an interrupted run stopped.
+        completed_results = self.completed_results_from_journal()
+
+        # Prep all task for the executor. Projects that are already completed
+        # or found in the result cache are put in finished_runs instead of
+        # being made into tasks.
         all_tasks = []
+        project_order = []
+        finished_runs = dict()
+        fingerprints = dict()
+        project_data_dir = os.path.join(self.file_ops.landbosse_input_dir(), 'project_data')
         print(f'Found {len(extended_project_list_before_parameter_modifications)} projects for execution')
         for _, project_parameters in extended_project_list_before_parameter_modifications.iterrows():
 
@@ -85,7 +97,8 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
             project_data_basename = project_parameters['Project data file']
             task = dict()
 
-            task['project_data_sheets'] = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+            with StageTimer.stage(project_id_with_serial, 'XlsxDataframeCache.read_all_sheets_from_xlsx'):
+                task['project_data_sheets'] = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename, project_data_dir)
 
             # Transform the dataframes so that they have the right values for
             # the parametric variables.
@@ -98,22 +111,80 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
             # Append the modified project parameters
             extended_project_list_after_parameter_modifications.append(project_parameters)
 
+            # Keep the order of the projects in the project list, regardless
+            # of where the results come from.
+            project_order.append(project_id_with_serial)
+
+            # The fingerprint identifies the inputs of the project in the
+            # journal and the result cache.
+            fingerprint = self.project_fingerprint(project_parameters, task['project_data_sheets'])
+
+            # If a run is being resumed and this project already finished
+            # with the same inputs, use the results from the journal.
+            completed_result = self.completed_result(completed_results, project_id_with_serial, fingerprint)
+            if completed_result is not None:
+                print(f'Already completed {project_id_with_serial}')
+                completed_result['project_series'] = project_parameters
+                finished_runs[project_id_with_serial] = completed_result
+                continue
+
             # Write all project_data sheets
             parametric_project_data_path = \
-                os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
-            XlsxGenerator.write_project_data(task['project_data_sheets'], parametric_project_data_path)
+                os.path.join(self.file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
+            with StageTimer.stage(project_id_with_serial, 'XlsxGenerator.write_project_data'):
+                XlsxGenerator.write_project_data(task['project_data_sheets'], parametric_project_data_path)
+
+            # If the project was calculated before with the same inputs, reuse
+            # the result rows from the cache.
+            cached_result = self.lookup_cached_result(fingerprint)
+            if cached_result is not None:
+                print(f'Using cached result for {project_id_with_serial}')
+                cached_result['project_series'] = project_parameters
+                finished_runs[project_id_with_serial] = cached_result
+                self.checkpoint(project_id_with_serial, cached_result, fingerprint)
+                continue
 
             task['project_data_basename'] = project_data_basename
             task['project_id_with_serial'] = project_id_with_serial
             task['project_series'] = project_parameters
+            task['enable_stage_timer'] = StageTimer.is_enabled()
+            task['profile_path'] = self.profile_path(project_id_with_serial)
+            task['module_threads'] = self.file_ops.module_threads()
+            task['detail_level'] = self.file_ops.config.detail_level
+            task['detail_modules'] = self.file_ops.config.detail_modules
             all_tasks.append(task)
-
-        # Execute every project
-        with futures.ProcessPoolExecutor() as executor:
-            executor_result = executor.map(run_single_project, all_tasks)
-
-        # Get the output dictionary ready
-        runs_dict = {project_id_with_serial: result for project_id_with_serial, result in executor_result}
+            fingerprints[project_id_with_serial] = fingerprint
+
+        # Execute every remaining project. Results are checkpointed and
+        # cached as each project finishes, rather than after all of them
+        # finish, so that an interrupted run loses as little as possible.
+        failures = []
+        crashed_tasks = self.execute_tasks(all_tasks, fingerprints, finished_runs, failures,
+                                           max_workers=self.file_ops.config.workers)
+
+        # If a worker process crashed (for example, it ran out of memory or
+        # was killed), every project still running in the pool is lost, not
+        # just the one that caused the crash. Retry each of those projects
+        # on its own in a fresh process, so that only a project that crashes
+        # every time ends up in the failures.
+        for task in crashed_tasks:
+            start = time.perf_counter()
+            for attempt in range(self.max_crash_retries):
+                print(f'Retrying {task["project_id_with_serial"]} after worker crash (attempt {attempt + 1})')
+                if len(self.execute_tasks([task], fingerprints, finished_runs, failures, max_workers=1)) == 0:
+                    break
+            else:
+                error = BrokenProcessPool(f'Worker process crashed {self.max_crash_retries + 1} times')
+                failure = Manager.failure_record(task['project_id_with_serial'], 'Worker process', error,
+                                                 time.perf_counter() - start)
+                self.collect_project_result(task['project_id_with_serial'], {'failures': [failure]},
+                                            None, finished_runs, failures)
+
+        # Get the output dictionary ready, in the order of the project list.
+        # Projects that failed are left out.
+        runs_dict = {project_id_with_serial: finished_runs[project_id_with_serial]
+                     for project_id_with_serial in project_order
+                     if project_id_with_serial in finished_runs}
 
         # Assemble the dictionary with content for the details, details with inputs,
         #  cost_by_module_type_operation and cost_by_module_type_operation_with_input tabs
@@ -121,10 +192,57 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
         final_result['details_list'] = self.extract_details_lists(runs_dict)
         final_result['module_type_operation_list'] = self.extract_module_type_operation_lists(runs_dict)
         final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
+        final_result['failures'] = failures
+        final_result['stage_timings'] = self.collected_stage_timings()
 
         # Return the runs for all the scenarios.
         return final_result
 
+    def execute_tasks(self, tasks, fingerprints, runs_dict, failures, max_workers=None):
+        """
+        Runs tasks in a new ProcessPoolExecutor and collects the result
+        of each task as soon as it finishes. See collect_project_result()
+        in the superclass for how results are collected.
+
+        Parameters
+        ----------
+        tasks : list
+            The task dictionaries to run. See run_single_project() below.
+
+        fingerprints : dict
+            Fingerprints of the projects for the journal and the result
+            cache, keyed by Project ID with serial.
+
+        runs_dict : dict
+            Output dictionaries of successful projects are added to
+            this dictionary.
+
+        failures : list
+            Failure records of failed projects are added to this list.
+
+        max_workers : int
+            The number of worker processes. The default of None uses one
+            process per CPU.
+
+        Returns
+        -------
+        list
+            The tasks that did not finish because a worker process
+            crashed.
+        """
+        crashed_tasks = []
+        with futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            future_to_task = {executor.submit(run_single_project, task): task for task in tasks}
+            for future in futures.as_completed(future_to_task):
+                try:
+                    project_id_with_serial, output_dict = future.result()
+                except BrokenProcessPool:
+                    crashed_tasks.append(future_to_task[future])
+                    continue
+                fingerprint = fingerprints[project_id_with_serial]
+                self.collect_project_result(project_id_with_serial, output_dict, fingerprint, runs_dict, failures)
+        return crashed_tasks
+
 
 """
 The following function is deliberately defined outside of the class.
@@ -151,6 +269,23 @@ def run_single_project(task_dict):
     project_id : str
         The string that is the name of the project.
 
+    enable_stage_timer : bool
+        True if stages should be timed with StageTimer.
+
+    profile_path : str
+        The path to dump cProfile statistics to, or None to run without
+        cProfile.
+
+    module_threads : int
+        The number of threads Manager runs the cost modules on.
+
+    detail_level : str
+        How many rows of details the cost modules make.
+
+    detail_modules : tuple
+        The names of the only modules that make details, or None for all
+        of them.
+
     Basically, the map operation goes like this:
 
     task_dict -> master_input_dict -> master_output_dict
@@ -174,18 +309,21 @@ def run_single_project(task_dict):
     project_id_with_serial = task_dict['project_id_with_serial']
     project_data_sheets = task_dict['project_data_sheets']
 
+    # Worker processes that are started with spawn rather than fork do not
+    # inherit the state of StageTimer from the parent process. Those that
+    # are started with fork inherit the records the parent had made so far,
+    # which are dropped so they are not counted twice.
+    StageTimer.enable(task_dict['enable_stage_timer'])
+    StageTimer.drain_records()
+
     # Log each project. Use print because it works better for multiple processes.
     print(f'Start {project_id_with_serial}, project data in {project_data_basename}')
 
-    # Read the Excel
-    xlsx_reader = XlsxReader()
-    master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_series)
-
-    # Now run the manager and accumulate its result into the runs_dict
-    output_dict = dict()
-    output_dict['project_series'] = project_series
-    mc = Manager(input_dict=master_input_dict, output_dict=output_dict)
-    mc.execute_landbosse(project_name=project_id_with_serial)
+    # Create the master input dictionary and run the manager. Failures are
+    # returned in the output dictionary rather than raised.
+    output_dict = XlsxManagerRunner.run_project(project_id_with_serial, project_data_sheets, project_series,
+                                                task_dict['profile_path'], task_dict['module_threads'],
+                                                task_dict['detail_level'], task_dict['detail_modules'])
 
     print(f'End {project_id_with_serial}')
 
@@ -7,6 +7,7 @@ from math import ceil
 from .XlsxOperationException import XlsxOperationException
 from .WeatherWindowCSVReader import read_weather_window, extend_weather_window
 from ..model import DefaultMasterInputDict
+from ..model import StageTimer
 from .GridSearchTree import GridSearchTree
 
 
@@ -504,8 +505,9 @@ class XlsxReader:
         # from wind toolkit format to a dataframe.
         number_of_months_for_construction = int(project_parameters['Total project construction time (months)'])
         weather_window_input = project_data_dataframes['weather_window']
-        weather_window_intermediate = read_weather_window(weather_window_input)
-        extended_weather_window = extend_weather_window(weather_window_intermediate, number_of_months_for_construction)
+        with StageTimer.stage(self.project_id_with_serial(project_parameters), 'Weather window processing'):
+            weather_window_intermediate = read_weather_window(weather_window_input)
+            extended_weather_window = extend_weather_window(weather_window_intermediate, number_of_months_for_construction)
         incomplete_input_dict['weather_window'] = extended_weather_window
 
         # Now fill any missing values with sensible defaults.
@@ -513,6 +515,28 @@ class XlsxReader:
         master_input_dict = defaults.populate_input_dict(incomplete_input_dict=incomplete_input_dict)
         return master_input_dict
 
+    def project_id_with_serial(self, project_parameters):
+        """
+        Finds the identifier of a project. If project_parameters['Project ID with serial']
+        is null, that means there are no parametric modifications to the project data
+        dataframes. Hence, just the plain Project ID without a serial number is used.
+
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The project parameters.
+
+        Returns
+        -------
+        str
+            The Project ID with serial, or the Project ID if there is no
+            serial.
+        """
+        project_id_with_serial = project_parameters.get('Project ID with serial')
+        if pd.isnull(project_id_with_serial):
+            return project_parameters['Project ID']
+        return project_id_with_serial
+
     def apply_labor_multiplier_to_project_data_dict(self, project_data_dict, labor_cost_multiplier):
         """
         Applies the labor multiplier to the dataframes that contain the labor
@@ -544,20 +568,12 @@ class XlsxReader:
 
         rsmeans = project_data_dict['rsmeans']
 
-        # This function maps new labor rates in rsmeans. Used with an apply()
-        # call, it will create a new Series that can be mapped back onto the
-        # original dataframe.
-        #
-        # If the column "Type of cost" is "Labor" then return the current cost
-        # times the labor multiplier. If "Type of cost" isn't "Labor" then
-        # just return the current cost.
-        def map_labor_rates(row):
-            if row['Type of cost'] == 'Labor':
-                return row['Rate USD per unit'] * labor_cost_multiplier
-            else:
-                return row['Rate USD per unit']
-
-        rsmeans_new_labor_rates = rsmeans.apply(map_labor_rates, axis=1)
+        # Rows whose "Type of cost" is "Labor" get the current cost times the
+        # labor multiplier. Other rows keep the current cost. The column is
+        # dropped and added back, so it moves to the end of the dataframe.
+        is_labor = rsmeans['Type of cost'] == 'Labor'
+        rates = rsmeans['Rate USD per unit']
+        rsmeans_new_labor_rates = rates.where(~is_labor, rates * labor_cost_multiplier)
         rsmeans.drop(columns=['Rate USD per unit'], inplace=True)
         rsmeans['Rate USD per unit'] = rsmeans_new_labor_rates
 
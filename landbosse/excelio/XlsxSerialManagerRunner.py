@@ -3,8 +3,7 @@ import os
 
 import pandas as pd
 
-from ..model import Manager
-from .XlsxFileOperations import XlsxFileOperations
+from ..model import StageTimer
 from .XlsxReader import XlsxReader
 from .XlsxManagerRunner import XlsxManagerRunner
 from .XlsxDataframeCache import XlsxDataframeCache
@@ -54,12 +53,12 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
         extended_project_list_before_parameter_modifications = self.read_project_and_parametric_list_from_xlsx()
         print('>>> Project and parametric lists loaded')
 
-        # For file operations
-        file_ops = XlsxFileOperations()
-
         # Get the output dictionary ready
         runs_dict = OrderedDict()
 
+        # Failure records of projects that failed
+        failures = []
+
         # Instantiate and XlsxReader to assemble master input dictionary
         xlsx_reader = XlsxReader()
 
@@ -71,6 +70,12 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
         # for why this is more performant than appending to a dataframe.
         extended_project_list_after_parameter_modifications = []
 
+        # Projects that finished before an interrupted run stopped.
+        completed_results = self.completed_results_from_journal()
+
+        # The folder of the unmodified project data files.
+        project_data_dir = os.path.join(self.file_ops.landbosse_input_dir(), 'project_data')
+
         # Loop over every project
         for _, project_parameters in extended_project_list_before_parameter_modifications.iterrows():
 
@@ -85,7 +90,7 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
             project_data_basename = project_parameters['Project data file']
 
             # Input path for unmodified project input data.
-            project_data_xlsx = os.path.join(file_ops.landbosse_input_dir(), 'project_data', f'{project_data_basename}.xlsx')
+            project_data_xlsx = os.path.join(project_data_dir, f'{project_data_basename}.xlsx')
 
             # Log each project
             print(f'<><><><><><><><><><><><><><><><><><> {project_id_with_serial} <><><><><><><><><><><><><><><><><><>')
@@ -93,7 +98,8 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
             print('>>> Project data: {}'.format(project_data_xlsx))
 
             # Read the project data sheets.
-            project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+            with StageTimer.stage(project_id_with_serial, 'XlsxDataframeCache.read_all_sheets_from_xlsx'):
+                project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename, project_data_dir)
 
             # Transform the dataframes so that they have the right values for
             # the parametric variables.
@@ -106,25 +112,50 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
             # Append the modified project parameters
             extended_project_list_after_parameter_modifications.append(project_parameters)
 
+            # The fingerprint identifies the inputs of the project in the
+            # journal and the result cache.
+            fingerprint = self.project_fingerprint(project_parameters, project_data_sheets)
+
+            # If a run is being resumed and this project already finished
+            # with the same inputs, use the results from the journal.
+            completed_result = self.completed_result(completed_results, project_id_with_serial, fingerprint)
+            if completed_result is not None:
+                print(f'>>> Already completed {project_id_with_serial}')
+                completed_result['project_series'] = project_parameters
+                runs_dict[project_id_with_serial] = completed_result
+                continue
+
             # Write all project_data sheets
             parametric_project_data_path = \
-                os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
-            XlsxGenerator.write_project_data(project_data_sheets, parametric_project_data_path)
-
-            # Create the master input dictionary.
-            master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_parameters)
+                os.path.join(self.file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
+            with StageTimer.stage(project_id_with_serial, 'XlsxGenerator.write_project_data'):
+                XlsxGenerator.write_project_data(project_data_sheets, parametric_project_data_path)
+
+            # If the project was calculated before with the same inputs, reuse
+            # the result rows from the cache.
+            cached_result = self.lookup_cached_result(fingerprint)
+            if cached_result is not None:
+                print(f'>>> Using cached result for {project_id_with_serial}')
+                cached_result['project_series'] = project_parameters
+                runs_dict[project_id_with_serial] = cached_result
+                self.checkpoint(project_id_with_serial, cached_result, fingerprint)
+                continue
 
             # Now run the manager and accumulate its result into the runs_dict
-            output_dict = dict()
-            mc = Manager(input_dict=master_input_dict, output_dict=output_dict)
-            mc.execute_landbosse(project_name=project_id_with_serial)
-            output_dict['project_series'] = project_parameters
-            runs_dict[project_id_with_serial] = output_dict
+            # or, if the project failed, into the failures.
+            output_dict = self.run_project(project_id_with_serial, project_data_sheets, project_parameters,
+                                           self.profile_path(project_id_with_serial),
+                                           self.file_ops.module_threads(),
+                                           self.file_ops.config.detail_level,
+                                           self.file_ops.config.detail_modules)
+            self.collect_project_result(project_id_with_serial, output_dict, fingerprint, runs_dict, failures)
 
         final_result = dict()
         final_result['details_list'] = self.extract_details_lists(runs_dict)
         final_result['module_type_operation_list'] = self.extract_module_type_operation_lists(runs_dict)
         final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
+        final_result['failures'] = failures
+        final_result['stage_timings'] = self.collected_stage_timings()
 
         # Return the runs for all the projects.
         return final_result
@@ -1,9 +1,27 @@
-from .XlsxReader import XlsxReader
-from .XlsxGenerator import XlsxGenerator
-from .XlsxManagerRunner import XlsxManagerRunner
-from .XlsxSerialManagerRunner import XlsxSerialManagerRunner
-from .XlsxParallelManagerRunner import XlsxParallelManagerRunner
-from .XlsxFileOperations import XlsxFileOperations
-from .XlsxValidator import XlsxValidator
-from .XlsxDataframeCache import XlsxDataframeCache
-from .CsvGenerator import CsvGenerator
+from ..lazy import lazy_exports
+
+# The classes exported by this package and the modules that define them.
+# Each module is imported the first time its class is used. See
+# landbosse/lazy.py.
+lazy_exports(__name__, {
+    'XlsxReader': 'XlsxReader',
+    'XlsxGenerator': 'XlsxGenerator',
+    'XlsxManagerRunner': 'XlsxManagerRunner',
+    'XlsxSerialManagerRunner': 'XlsxSerialManagerRunner',
+    'XlsxParallelManagerRunner': 'XlsxParallelManagerRunner',
+    'XlsxFileOperations': 'XlsxFileOperations',
+    'RunConfiguration': 'RunConfiguration',
+    'XlsxValidator': 'XlsxValidator',
+    'XlsxDataframeCache': 'XlsxDataframeCache',
+    'CsvGenerator': 'CsvGenerator',
+    'ProjectResultCache': 'ProjectResultCache',
+    'ProjectResultJournal': 'ProjectResultJournal',
+    'SqliteResultStore': 'SqliteResultStore',
+    'ResultLoader': 'ResultLoader',
+    'SqliteLoaderBackend': 'ResultLoader',
+    'PostgresLoaderBackend': 'ResultLoader',
+    'BaselineComparison': 'BaselineComparison',
+    'LcoeCalculator': 'LcoeCalculator',
+    'ProjectShard': 'ProjectShard',
+    'ShardMerger': 'ShardMerger',
+})
@@ -0,0 +1,70 @@
+"""
+This module makes the names exported by a package load on first use.
+
+The packages of LandBOSSE export the classes of their modules, such as
+landbosse.model.SubstationCost. Importing all of them when the package is
+imported pulls in pandas, xlsxwriter and every cost module, even for a
+caller that needs one class, and every worker process pays that cost. With
+lazy_exports(), a module is only imported the first time one of its names
+is accessed on the package.
+
+lazy_exports() changes the class of the package module to LazyPackage
+rather than defining a module-level __getattr__ (PEP 562). A module-level
+__getattr__ is only called for names the package does not have, and
+importing a submodule sets the name of the submodule on the package,
+which would then hide the class of the same name. LazyPackage also
+overrides __setattr__ to ignore those assignments.
+"""
+
+import importlib
+import sys
+import types
+
+
+class LazyPackage(types.ModuleType):
+    """
+    The class of a package module whose exports load on first use.
+
+    When a submodule such as landbosse.model.FoundationCost is imported,
+    Python sets an attribute of the same name on the package to the
+    submodule. The package exports the class of that name, so those
+    assignments are ignored and the class is loaded on first access
+    instead.
+    """
+
+    def __getattr__(self, name):
+        exports = self.__dict__.get('_lazy_exports', dict())
+        if name not in exports:
+            raise AttributeError(f'module {self.__name__!r} has no attribute {name!r}')
+        module = importlib.import_module(f'.{exports[name]}', self.__name__)
+        value = getattr(module, name)
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name, value):
+        if isinstance(value, types.ModuleType) and name in self.__dict__.get('_lazy_exports', dict()):
+            return
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.__dict__.get('_lazy_exports', dict())))
+
+
+def lazy_exports(package_name, exports):
+    """
+    Makes the exports of a package load on first use. Call it from the
+    __init__.py of the package.
+
+    Parameters
+    ----------
+    package_name : str
+        The name of the package, which is __name__ in its __init__.py.
+
+    exports : dict
+        Keys are the names exported by the package and values are the
+        names of the modules in the package that define them.
+    """
+    package = sys.modules[package_name]
+    package._lazy_exports = exports
+    package.__all__ = list(exports)
+    package.__class__ = LazyPackage
@@ -0,0 +1,431 @@
+import numpy as np
+import pandas as pd
+
+
+class BatchClosedFormCost:
+    """
+    This class evaluates the cost modules that are closed form formulas for
+    many projects at once.
+
+    SubstationCost, GridConnectionCost, DevelopmentCost (when the
+    development labor cost is given in the project list) and ManagementCost
+    are curve fits of empirical data. Running them through Manager creates
+    one instance of each module and several small dataframes per project,
+    which takes far longer than the arithmetic itself. This class instead
+    takes a table with one row per project and evaluates each formula as
+    a NumPy expression over whole columns of that table.
+
+    The formulas are the same as in the scalar modules and the results
+    are returned as a dataframe with the same columns as the rows under
+    the '_module_type_operation' keys of the output dictionary. These can
+    be appended to the rows of the other modules and written with
+    CsvGenerator.create_costs_dataframe().
+
+    The columns of the projects table are named after the keys of the
+    master input dictionary that each module reads (see the docstrings of
+    the scalar modules). ManagementCost also needs these columns, which
+    are normally calculated by Manager from the results of the other
+    modules:
+
+    project_value_usd
+        (float) Sum of all other BOS costs
+
+    foundation_cost_usd
+        (float) Foundation cost of the project
+
+    actual_construction_months
+        (float) Construction time of the project in months
+
+    Every table must also have the column project_id_with_serial.
+    """
+
+    # Columns that every method needs.
+    common_columns = ['project_id_with_serial', 'num_turbines', 'turbine_rating_MW', 'rotor_diameter_m']
+
+    # Columns for each module, in addition to the common columns.
+    module_columns = {
+        'SubstationCost': ['interconnect_voltage_kV', 'project_size_megawatts'],
+        'GridConnectionCost': ['interconnect_voltage_kV', 'distance_to_interconnect_mi', 'new_switchyard'],
+        'DevelopmentCost': ['development_labor_cost_usd'],
+        'ManagementCost': [
+            'project_value_usd',
+            'foundation_cost_usd',
+            'actual_construction_months',
+            'num_hwy_permits',
+            'project_size_megawatts',
+            'hub_height_meters',
+            'markup_contingency',
+            'markup_warranty_management',
+            'markup_sales_and_use_tax',
+            'markup_overhead',
+            'markup_profit_margin'
+        ]
+    }
+
+    # Columns of the returned cost tables
+    cost_columns = [
+        'operation_id',
+        'type_of_cost',
+        'raw_cost',
+        'turbine_rating_MW',
+        'num_turbines',
+        'rotor_diameter_m',
+        'project_id_with_serial',
+        'module',
+        'raw_cost_total_or_per_turbine',
+        'cost_per_turbine',
+        'cost_per_project',
+        'usd_per_kw_per_project'
+    ]
+
+    def __init__(self, projects, site_facility_building_area_df=None):
+        """
+        Parameters
+        ----------
+        projects : pandas.DataFrame
+            One row per project. The columns are described in the class
+            docstring.
+
+        site_facility_building_area_df : pandas.DataFrame
+            The site_facility_building_area sheet of the project data,
+            which is shared by all the projects. It is only needed for
+            ManagementCost.
+        """
+        self.projects = projects.reset_index(drop=True)
+        self.site_facility_building_area_df = site_facility_building_area_df
+
+    def validate_inputs(self, module):
+        """
+        This method checks that the projects table has all the columns
+        needed by a module.
+
+        Parameters
+        ----------
+        module : str
+            The name of the scalar module, such as 'SubstationCost'
+
+        Raises
+        ------
+        ValueError
+            If one of the columns is missing, this method raises a ValueError
+        """
+        required_columns = set(self.common_columns + self.module_columns[module])
+        missing_columns = required_columns - set(self.projects.columns)
+        if module == 'ManagementCost' and self.site_facility_building_area_df is None:
+            missing_columns.add('site_facility_building_area_df')
+        if len(missing_columns) > 0:
+            err_msg = '{}: did not find all required columns for {} in projects table. Missing columns are {}'
+            raise ValueError(err_msg.format(type(self).__name__, module, missing_columns))
+
+    def column(self, name):
+        """
+        Returns a column of the projects table as a float array.
+
+        Parameters
+        ----------
+        name : str
+            The name of the column.
+
+        Returns
+        -------
+        numpy.ndarray
+            The column.
+        """
+        return self.projects[name].to_numpy(dtype=float)
+
+    def substation_cost(self):
+        """
+        Vectorized SubstationCost.calculate_costs()
+
+        Returns
+        -------
+        numpy.ndarray
+            Substation cost of each project in USD.
+        """
+        self.validate_inputs('SubstationCost')
+        interconnect_voltage_kV = self.column('interconnect_voltage_kV')
+        project_size_megawatts = self.column('project_size_megawatts')
+        utility_cost = 11652 * (interconnect_voltage_kV + project_size_megawatts) + \
+            11795 * (project_size_megawatts ** 0.3549) + 1526800
+
+        # Distributed mode if the number of turbines is <= 10
+        return np.where(self.column('num_turbines') > 10, utility_cost, 0.0)
+
+    def grid_connection_cost(self):
+        """
+        Vectorized GridConnectionCost.calculate_costs()
+
+        Returns
+        -------
+        numpy.ndarray
+            Transmission and distribution cost of each project in USD.
+        """
+        self.validate_inputs('GridConnectionCost')
+        num_turbines = self.column('num_turbines')
+        turbine_rating_MW = self.column('turbine_rating_MW')
+        interconnect_voltage_kV = self.column('interconnect_voltage_kV')
+        distance_to_interconnect_mi = self.column('distance_to_interconnect_mi')
+        new_switchyard = self.projects['new_switchyard'].to_numpy() == True
+
+        # Utility scale model for projects > 15 MW
+        interconnect_adder_usd = np.where(new_switchyard, 18115 * interconnect_voltage_kV + 165944, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            utility_cost = (1176 * interconnect_voltage_kV + 218257) * \
+                (distance_to_interconnect_mi ** -0.1063) * distance_to_interconnect_mi + interconnect_adder_usd
+        utility_cost = np.where(distance_to_interconnect_mi == 0, 0.0, utility_cost)
+
+        # Distributed model for projects <= 15 MW
+        project_size_kw = num_turbines * turbine_rating_MW * 1000
+        tower_to_point_of_interconnection_usd_per_kw = 1736.7 * (project_size_kw ** -0.272)
+        distributed_cost = project_size_kw * tower_to_point_of_interconnection_usd_per_kw
+
+        return np.where(turbine_rating_MW * num_turbines > 15, utility_cost, distributed_cost)
+
+    def development_cost(self):
+        """
+        Vectorized DevelopmentCost.calculate_costs() for projects that give
+        the development labor cost in the project list.
+
+        Returns
+        -------
+        numpy.ndarray
+            Development labor cost of each project in USD.
+        """
+        self.validate_inputs('DevelopmentCost')
+        return self.column('development_labor_cost_usd')
+
+    def management_costs(self):
+        """
+        Vectorized ManagementCost. Projects that have a value greater than
+        zero in an 'override_total_management_cost' column are calculated
+        in distributed mode, as in the scalar module.
+
+        Returns
+        -------
+        dict
+            Keys are the output keys of ManagementCost, such as
+            'insurance_usd'. Values are arrays with the cost of each project
+            in USD.
+        """
+        self.validate_inputs('ManagementCost')
+        project_value_usd = self.column('project_value_usd')
+        num_turbines = self.column('num_turbines')
+        project_size_megawatts = self.column('project_size_megawatts')
+        actual_construction_months = self.column('actual_construction_months')
+
+        costs = dict()
+        costs['insurance_usd'] = 0.0056 * project_value_usd
+        costs['construction_permitting_usd'] = 0.02 * self.column('foundation_cost_usd') + \
+            20000 * self.column('num_hwy_permits')
+        costs['bonding_usd'] = 0.01 * project_value_usd
+        costs['project_management_usd'] = np.where(
+            actual_construction_months < 28,
+            (53.333 * actual_construction_months ** 2 - 3442 * actual_construction_months + 209542) *
+            (actual_construction_months + 2),
+            (actual_construction_months + 2) * 155000
+        )
+        costs['markup_contingency_usd'] = (self.column('markup_contingency') +
+                                           self.column('markup_warranty_management') +
+                                           self.column('markup_sales_and_use_tax') +
+                                           self.column('markup_overhead') +
+                                           self.column('markup_profit_margin')) * project_value_usd
+
+        # Engineering for foundations and collection system, plus met masts.
+        # np.round() rounds halves to even, like round() in the scalar module.
+        development_engineering_cost = 7188.5 * num_turbines + \
+            np.round(3.4893 * np.log(num_turbines) - 7.3049) * 16800 + \
+            np.where(project_size_megawatts < 200, 165675, 327250)
+        num_met_masts_over_300 = np.round(project_size_megawatts / 100)
+        num_perm_met_mast = np.select(
+            [(project_size_megawatts >= 30) & (project_size_megawatts <= 300), project_size_megawatts > 300],
+            [2, num_met_masts_over_300],
+            default=1
+        )
+        num_temp_met_mast = np.select(
+            [(project_size_megawatts >= 30) & (project_size_megawatts <= 100),
+             (project_size_megawatts > 100) & (project_size_megawatts <= 300),
+             project_size_megawatts > 300],
+            [2, 4, num_met_masts_over_300 * 2],
+            default=1
+        )
+        low_hub = self.column('hub_height_meters') < 90
+        met_mast_cost = num_perm_met_mast * np.where(low_hub, 232600, 290000) + \
+            num_temp_met_mast * np.where(low_hub, 92600, 116800) + 200000
+        costs['engineering_usd'] = development_engineering_cost + met_mast_cost
+
+        # Site facility. Each project is matched to the row of the building
+        # area table whose size range contains the project size.
+        building_area_sq_ft = np.full(len(self.projects), np.nan)
+        for _, row in self.site_facility_building_area_df.iterrows():
+            in_range = (project_size_megawatts >= row['Size Min (MW)']) & (project_size_megawatts < row['Size Max (MW)'])
+            building_area_sq_ft = np.where(in_range, float(row['Building area (sq. ft.)']), building_area_sq_ft)
+        if np.isnan(building_area_sq_ft).any():
+            raise ValueError('{}: project size outside the site facility building area table'.format(type(self).__name__))
+        construction_building_cost = building_area_sq_ft * 125 + 176125
+        num_roads = np.where(num_turbines < 30, 1, np.round(0.05 * num_turbines))
+        access_road_cost = np.select([num_turbines < 30, num_turbines < 100], [30000, 240000], default=390000)
+        compound_security_cost = 9825 * num_roads + 29850 * actual_construction_months + access_road_cost + \
+            60 * project_size_megawatts + 62400
+        costs['site_facility_usd'] = construction_building_cost + compound_security_cost
+
+        costs['total_management_cost'] = sum(costs.values())
+
+        # Distributed mode overrides the total and zeros every item.
+        if 'override_total_management_cost' in self.projects.columns:
+            override = self.projects['override_total_management_cost'].fillna(0).to_numpy(dtype=float)
+            in_distributed_mode = override > 0
+            for key in costs:
+                costs[key] = np.where(in_distributed_mode, 0.0, costs[key])
+            costs['total_management_cost'] = np.where(in_distributed_mode, override, costs['total_management_cost'])
+
+        return costs
+
+    def cost_table(self, module, operation_id, costs_by_type, projects_mask=None):
+        """
+        Makes the cost rows of one module for every project. The rows of
+        each project are in the order of costs_by_type.
+
+        Parameters
+        ----------
+        module : str
+            The name of the module, such as 'SubstationCost'
+
+        operation_id : str
+            The operation, or phase of construction, of the costs.
+
+        costs_by_type : list
+            A list of (type of cost, numpy.ndarray) tuples. Each array has
+            the cost of each project in USD.
+
+        projects_mask : numpy.ndarray
+            Boolean array that selects the projects to make rows for. The
+            cost arrays have one element for each selected project. If
+            None, rows are made for every project.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The cost rows with the columns in cost_columns. The index is
+            the position of the project in the projects table.
+        """
+        projects = self.projects if projects_mask is None else self.projects[projects_mask]
+        num_types = len(costs_by_type)
+        num_turbines = np.repeat(projects['num_turbines'].to_numpy(dtype=float), num_types)
+        turbine_rating_MW = np.repeat(projects['turbine_rating_MW'].to_numpy(dtype=float), num_types)
+        raw_cost = np.column_stack([cost for _, cost in costs_by_type]).reshape(-1)
+
+        table = pd.DataFrame({
+            'operation_id': operation_id,
+            'type_of_cost': np.tile([type_of_cost for type_of_cost, _ in costs_by_type], len(projects)),
+            'raw_cost': raw_cost,
+            'turbine_rating_MW': np.repeat(projects['turbine_rating_MW'].to_numpy(), num_types),
+            'num_turbines': np.repeat(projects['num_turbines'].to_numpy(), num_types),
+            'rotor_diameter_m': np.repeat(projects['rotor_diameter_m'].to_numpy(), num_types),
+            'project_id_with_serial': np.repeat(projects['project_id_with_serial'].to_numpy(), num_types),
+            'module': module,
+            'raw_cost_total_or_per_turbine': 'total',
+            'cost_per_turbine': raw_cost / num_turbines,
+            'cost_per_project': raw_cost,
+            'usd_per_kw_per_project': raw_cost / (num_turbines * turbine_rating_MW * 1000)
+        }, index=np.repeat(projects.index.to_numpy(), num_types), columns=self.cost_columns)
+        return table
+
+    def substation_cost_table(self):
+        """
+        Returns
+        -------
+        pandas.DataFrame
+            The rows of SubstationCost for every project. See cost_table().
+        """
+        return self.cost_table('SubstationCost', 'Substation', [('Other', self.substation_cost())])
+
+    def grid_connection_cost_table(self):
+        """
+        Returns
+        -------
+        pandas.DataFrame
+            The rows of GridConnectionCost for every project. See
+            cost_table().
+        """
+        return self.cost_table('GridConnectionCost', 'Transmission and Distribution',
+                               [('Other', self.grid_connection_cost())])
+
+    def development_cost_table(self):
+        """
+        Returns
+        -------
+        pandas.DataFrame
+            The rows of DevelopmentCost for every project. See cost_table().
+        """
+        zeros = np.zeros(len(self.projects))
+        return self.cost_table('DevelopmentCost', 'Development', [
+            ('Equipment rental', zeros),
+            ('Labor', self.development_cost()),
+            ('Materials', zeros),
+            ('Mobilization', zeros),
+            ('Other', zeros)
+        ])
+
+    def management_cost_table(self):
+        """
+        Returns
+        -------
+        pandas.DataFrame
+            The rows of ManagementCost for every project. Projects in
+            distributed mode have one row for the total management cost
+            instead of one row for each item. See cost_table().
+        """
+        costs = self.management_costs()
+        if 'override_total_management_cost' in self.projects.columns:
+            in_distributed_mode = self.projects['override_total_management_cost'].fillna(0).to_numpy(dtype=float) > 0
+        else:
+            in_distributed_mode = np.zeros(len(self.projects), dtype=bool)
+        in_utility_mode = ~in_distributed_mode
+
+        utility = self.cost_table('ManagementCost', 'Management', [
+            ('insurance', costs['insurance_usd'][in_utility_mode]),
+            ('Construction Permitting', costs['construction_permitting_usd'][in_utility_mode]),
+            ('Project Management', costs['project_management_usd'][in_utility_mode]),
+            ('Bonding', costs['bonding_usd'][in_utility_mode]),
+            ('Markup Contingency', costs['markup_contingency_usd'][in_utility_mode]),
+            ('Engineering Foundation and Collections System (includes met mast)',
+             costs['engineering_usd'][in_utility_mode]),
+            ('Site Facility', costs['site_facility_usd'][in_utility_mode])
+        ], projects_mask=in_utility_mode)
+
+        if not in_distributed_mode.any():
+            return utility
+
+        distributed = self.cost_table('ManagementCost', 'Management', [
+            ('total_management_cost', costs['total_management_cost'][in_distributed_mode])
+        ], projects_mask=in_distributed_mode)
+        return pd.concat([utility, distributed]).sort_index(kind='mergesort')
+
+    def run_modules(self, modules=None):
+        """
+        Evaluates modules for all projects.
+
+        Parameters
+        ----------
+        modules : list
+            The names of the modules to evaluate. The default is all of
+            'SubstationCost', 'GridConnectionCost', 'DevelopmentCost' and
+            'ManagementCost'.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The cost rows of every module for every project, ordered by
+            project and then by module.
+        """
+        tables = {
+            'SubstationCost': self.substation_cost_table,
+            'GridConnectionCost': self.grid_connection_cost_table,
+            'DevelopmentCost': self.development_cost_table,
+            'ManagementCost': self.management_cost_table
+        }
+        if modules is None:
+            modules = list(tables.keys())
+
+        result = pd.concat([tables[module]() for module in modules])
+        return result.sort_index(kind='mergesort').reset_index(drop=True)
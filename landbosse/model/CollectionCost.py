@@ -18,6 +18,8 @@ import traceback
 import pandas as pd
 
 from .CostModule import CostModule
+from .RsMeansIndex import RsMeansIndex
+from .CrewRates import CrewRates
 from .WeatherDelay import WeatherDelay as WD
 
 
@@ -706,22 +708,16 @@ class ArraySystem(CostModule):
 
         collection_construction_time = construction_time_input_data['construct_duration'] * 1 / 3  # assumes collection construction occurs for one-third of project duration
 
-        throughput_operations = construction_time_input_data['rsmeans']
+        rsmeans_index = RsMeansIndex.for_input_dict(construction_time_input_data)
         trench_length_km = construction_time_output_data['trench_length_km']
         if construction_time_input_data['turbine_rating_MW'] >= 0.1:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Collection').dropna(
-                thresh=4)
-            # from rsmeans data, only read in Collection related data and filter out the rest:
-            cable_trenching = throughput_operations[throughput_operations.Module == 'Collection']
+            operation_data = rsmeans_index.operations('Collection')
         else:   #switch for small DW
-            operation_data = throughput_operations.where(
-                throughput_operations['Module'] == 'Small DW Collection').dropna(thresh=4)
-            # from rsmeans data, only read in Collection related data and filter out the rest:
-            cable_trenching = throughput_operations[throughput_operations.Module == 'Small DW Collection']
+            operation_data = rsmeans_index.operations('Small DW Collection')
         # operation_data = pd.merge()
 
         # from rsmeans data, only read in Collection related data and filter out the rest:
-        cable_trenching = throughput_operations[throughput_operations.Module == 'Collection']
+        cable_trenching = rsmeans_index.rows('Collection')
 
         # Storing data with labor related inputs:
         trenching_labor = cable_trenching[cable_trenching.values == 'Labor']
@@ -761,12 +757,8 @@ class ArraySystem(CostModule):
         # No 'management crew' in small DW
         if construction_time_input_data['turbine_rating_MW'] >= 0.1:
             # pull out management data
-            crew_cost = self.input_dict['crew_cost']
-            crew = self.input_dict['crew'][self.input_dict['crew']['Crew type ID'].str.contains('M0')]
-            management_crew = pd.merge(crew_cost, crew, on=['Labor type ID'])
-            management_crew = management_crew.assign(per_diem_total=management_crew['Per diem USD per day'] * management_crew['Number of workers'] * num_days)
-            management_crew = management_crew.assign(hourly_costs_total=management_crew['Hourly rate USD per hour'] * self.input_dict['hour_day'][self.input_dict['time_construct']] * num_days)
-            management_crew = management_crew.assign(total_crew_cost_before_wind_delay=management_crew['per_diem_total'] + management_crew['hourly_costs_total'])
+            crew_rates = CrewRates.for_input_dict(self.input_dict)
+            management_crew = crew_rates.management_crew_cost(num_days, self.input_dict['hour_day'][self.input_dict['time_construct']])
             self.output_dict['management_crew'] = management_crew
             self.output_dict['managament_crew_cost_before_wind_delay'] = management_crew['total_crew_cost_before_wind_delay'].sum()
         else:
@@ -881,6 +873,7 @@ class ArraySystem(CostModule):
             A list of dicts, with each dict representing a row of the data.
         """
         result = []
+        full = self.detail_level() == 'full'
         module = 'Collection Cost'
         result.append({
             'unit': '',
@@ -979,43 +972,44 @@ class ArraySystem(CostModule):
                     })
             n += 1
 
-        result.append({
-            'unit': '',
-            'type': 'list',
-            'variable_df_key_col_name': 'Number of turbines per cable type in full strings [' + cables + ']',
+        if full:
+            result.append({
+                'unit': '',
+                'type': 'list',
+                'variable_df_key_col_name': 'Number of turbines per cable type in full strings [' + cables + ']',
 
-            'value': str(self.output_dict['num_turb_per_cable'])
-        })
+                'value': str(self.output_dict['num_turb_per_cable'])
+            })
 
-        if self.input_dict['turbine_rating_MW'] > 0.1:
-            for row in self.output_dict['management_crew'].itertuples():
-                dashed_row = ' <--> '.join(str(x) for x in list(row))
-                result.append({
-                    'unit': '',
-                    'type': 'dataframe',
-                    'variable_df_key_col_name': 'Labor type ID <--> Hourly rate USD per hour <--> Per diem USD per day <--> Operation <--> Crew type <--> Crew name <--> Number of workers <--> Per Diem Total <--> Hourly costs total <--> Crew total cost ',
-                    'value': dashed_row
-                })
+            if self.input_dict['turbine_rating_MW'] > 0.1:
+                for row in self.output_dict['management_crew'].itertuples():
+                    dashed_row = ' <--> '.join(str(x) for x in list(row))
+                    result.append({
+                        'unit': '',
+                        'type': 'dataframe',
+                        'variable_df_key_col_name': 'Labor type ID <--> Hourly rate USD per hour <--> Per diem USD per day <--> Operation <--> Crew type <--> Crew name <--> Number of workers <--> Per Diem Total <--> Hourly costs total <--> Crew total cost ',
+                        'value': dashed_row
+                    })
 
-        result.append({
-            'unit': '',
-            'type': 'list',
-            'variable_df_key_col_name': 'Percent length of cable in partial string [' + cables + ']',
+            result.append({
+                'unit': '',
+                'type': 'list',
+                'variable_df_key_col_name': 'Percent length of cable in partial string [' + cables + ']',
 
-            'value': str(self.output_dict['perc_partial_string'])
-        })
+                'value': str(self.output_dict['perc_partial_string'])
+            })
 
 
 
-        for row in self.output_dict['total_collection_cost'].itertuples():
-            dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
+            for row in self.output_dict['total_collection_cost'].itertuples():
+                dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
+                    'value': dashed_row,
+                    'last_number': row[2]
+                })
 
 
         for _dict in result:
@@ -1063,7 +1057,8 @@ class ArraySystem(CostModule):
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             self.output_dict['collection_cost_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_collection_cost'],
                 project_id=self.project_name,
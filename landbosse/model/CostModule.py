@@ -7,6 +7,47 @@ class CostModule:
     mobilization cost calculations.
     """
 
+    # The levels of detail the cost modules can make rows for the details
+    # tab at, from least to most. See detail_level().
+    detail_levels = ('none', 'summary', 'full')
+
+    def module_name(self):
+        """
+        Returns
+        -------
+        str
+            The name of the module in the Module column of the costs,
+            which is the name of the class, except that ArraySystem is
+            reported as CollectionCost.
+        """
+        return 'CollectionCost' if (type(self).__name__ == 'ArraySystem') else type(self).__name__
+
+    def detail_level(self):
+        """
+        Returns how much this module puts in the details tab. Manager sets
+        the level for a project in the input dictionary:
+
+        detail_level
+            'none' makes no detail rows at all. 'summary' makes only the
+            rows of single values, and skips the rows that format each row
+            of a dataframe or a whole list into text. 'full', the default,
+            makes every row.
+
+        detail_modules
+            If this is not None, only the modules named in it (as in the
+            Module column of the costs) make detail rows. The others are at
+            'none'.
+
+        Returns
+        -------
+        str
+            'none', 'summary' or 'full'.
+        """
+        detail_modules = self.input_dict.get('detail_modules')
+        if detail_modules is not None and self.module_name() not in detail_modules:
+            return 'none'
+        return self.input_dict.get('detail_level', 'full')
+
     def mobilization_cost_multiplier(self, turbine_rating):
         """
         Calculates a mobilization cost term as a function of
@@ -65,8 +106,7 @@ class CostModule:
             the output.
         """
         result = []
-        # module = type(self).__name__
-        module = 'CollectionCost' if (type(self).__name__ == 'ArraySystem') else type(self).__name__
+        module = self.module_name()
         turbine_rating_MW = self.input_dict['turbine_rating_MW']
         num_turbines = self.input_dict['num_turbines']
         rotor_diameter_m = self.input_dict['rotor_diameter_m']
@@ -0,0 +1,85 @@
+import pandas as pd
+
+
+class CrewRates:
+    """
+    The labor rates of the crews of a project, joined from the crew and
+    crew_price project data sheets once per project. Manager puts them in
+    the master input dictionary under 'crew_rates' before the cost modules
+    run, after the labor cost multiplier has been applied to crew_price.
+
+    FoundationCost, SitePreparationCost and CollectionCost all cost the
+    same management crews, the crews whose Crew type ID contains M0, over
+    different numbers of days. ErectionCost costs every crew, with
+    duplicate rows of the crew sheet removed. Rather than each module
+    matching the crew type strings and merging the sheets again, they use
+    the tables and rate vectors here.
+    """
+
+    def __init__(self, crew, crew_price):
+        """
+        Parameters
+        ----------
+        crew : pandas.DataFrame
+            The crew sheet.
+
+        crew_price : pandas.DataFrame
+            The crew_price sheet.
+        """
+        management = crew[crew['Crew type ID'].str.contains('M0')]
+        self.management_crew = pd.merge(crew_price, management, on=['Labor type ID'])
+
+        # The cost of each management crew row per day of per diem, for all
+        # its workers, and per hour worked. The modules have always costed
+        # the hours of each row at the rate of one worker.
+        self.management_per_diem_usd_per_day = \
+            self.management_crew['Per diem USD per day'] * self.management_crew['Number of workers']
+        self.management_hourly_usd_per_hour = self.management_crew['Hourly rate USD per hour']
+
+        crew_deduped = crew.drop_duplicates(subset=['Crew type ID', 'Operation', 'Crew name', 'Labor type ID'],
+                                            keep='first')
+        self.crew_cost = pd.merge(crew_deduped, crew_price, on=['Labor type ID'])
+
+    @classmethod
+    def for_input_dict(cls, input_dict):
+        """
+        Returns the crew rates in an input dictionary, or new crew rates
+        made from its crew and crew_cost sheets if Manager has not put any
+        there, as when a cost module is run on its own.
+
+        Parameters
+        ----------
+        input_dict : dict
+            The input dictionary of a cost module.
+
+        Returns
+        -------
+        CrewRates
+            The crew rates.
+        """
+        crew_rates = input_dict.get('crew_rates')
+        return crew_rates if crew_rates is not None else cls(input_dict['crew'], input_dict['crew_cost'])
+
+    def management_crew_cost(self, num_days, hours_per_day):
+        """
+        Costs the management crews over a period of construction.
+
+        Parameters
+        ----------
+        num_days : float
+            The number of days of construction.
+
+        hours_per_day : float
+            The number of hours worked per day.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The management crew rows with the columns per_diem_total,
+            hourly_costs_total and total_crew_cost_before_wind_delay added.
+        """
+        per_diem_total = self.management_per_diem_usd_per_day * num_days
+        hourly_costs_total = self.management_hourly_usd_per_hour * hours_per_day * num_days
+        return self.management_crew.assign(per_diem_total=per_diem_total,
+                                           hourly_costs_total=hourly_costs_total,
+                                           total_crew_cost_before_wind_delay=per_diem_total + hourly_costs_total)
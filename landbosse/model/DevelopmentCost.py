@@ -65,16 +65,18 @@ class DevelopmentCost(CostModule):
         """
 
         result = []
+        full = self.detail_level() == 'full'
         module = type(self).__name__
-        for _, row in self.output_dict['total_development_cost'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row["Type of cost"], row["Phase of construction"], math.ceil(row["Cost USD"]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost - Phase of Construction - Cost in USD',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
+        if full:
+            for _, row in self.output_dict['total_development_cost'].iterrows():
+                dashed_row = '{} - {} - {}'.format(row["Type of cost"], row["Phase of construction"], math.ceil(row["Cost USD"]))
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'Type of Cost - Phase of Construction - Cost in USD',
+                    'value': dashed_row,
+                    'last_number': row[2]
+                })
 
         for _dict in result:
             _dict['project_id_with_serial'] = self.project_name
@@ -91,7 +93,8 @@ class DevelopmentCost(CostModule):
 
         try:
             self.calculate_costs()
-            self.outputs_for_detailed_tab()
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab()
             self.output_dict['development_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_development_cost'],
                 project_id=self.project_name,
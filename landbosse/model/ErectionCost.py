@@ -1,9 +1,14 @@
+import copy
+import hashlib
+
 import pandas as pd
 import numpy as np
 from math import ceil
 
 from .CostModule import CostModule
+from .LruCache import LruCache
 from .WeatherDelay import WeatherDelay
+from .CrewRates import CrewRates
 
 import traceback
 
@@ -156,6 +161,21 @@ class ErectionCost(CostModule):
     rsmeans
         (p.DataFrame) RSMeans data
     """
+
+    # crane_operations_cache memoizes the cranes that can lift each
+    # component, their operation times and their wind delays. The keys are
+    # only the inputs of those calculations, so serials of a sweep over
+    # labor, equipment or material prices reuse the same entry. It is
+    # shared by all instances in a process.
+    crane_operations_cache = LruCache(maxsize=256)
+
+    # The keys in the output dictionary that calculate_crane_operations()
+    # fills.
+    crane_operations_output_keys = ['component_name_topvbase', 'possible_cranes', 'erection_operation_time',
+                                    'crane_specs', 'operation_time', 'offload_specs', 'offload_time',
+                                    'crane_specs_withoffload', 'operation_time_withoffload',
+                                    'enhanced_crane_specs', 'cranes_wind_delay_withoffload']
+
     def __init__(self, input_dict, output_dict, project_name):
         """
         Parameters
@@ -190,7 +210,8 @@ class ErectionCost(CostModule):
         """
         try:
             self.calculate_costs()
-            self.outputs_for_detailed_tab()
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab()
             self.output_dict['erection_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_erection_cost'],
                 project_id=self.project_name,
@@ -215,105 +236,107 @@ class ErectionCost(CostModule):
             A list of dicts, with each dict representing a row of the data.
         """
         result =[]
-
-        for _, row in self._number_of_equip.iterrows():
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': '_number_of_equip: Operation-Crane name-Boom system-Number of equipment',
-                'value': f'{row["Operation"]}-{row["Crane name"]}-{row["Boom system"]}-{row["Number of equipment"]}',
-                'last_number': row["Number of equipment"]
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': f'erection_selected_detailed_data: Operation-Crane name-Boom system-Operational construct days over time construct days',
-                'value': f'{row["Operation"]}-{row["Crane name"]}-{row["Boom system"]}-{row["Operational construct days over time construct days"]}',
-                'last_number': row["Operational construct days over time construct days"]
-            })
-
-        for row in self.output_dict['component_name_topvbase'].itertuples():
-            dashed_row = '{} - {}'.format(row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'component_name_topvbase: Operation - Top or Base',
-                'value': dashed_row
-            })
-
-        for row in self.output_dict['crane_choice'].itertuples():
-            dashed_row = '{} - {} - {}'.format(row[1], row[2], row[3])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'crane_choice: Crew name - Boom system - Operation',
-                'value': dashed_row
-            })
-
-        for _, row in self.output_dict['crane_data_output'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'crane_data_output: crane_boom_operation_concat - variable - value',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _, row in self.output_dict['crane_cost_details'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'crane_cost_details: Operation ID - Type of cost - Cost',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _, row in self.output_dict['total_erection_cost'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'total_erection_cost: Phase of construction - Type of cost - Cost USD',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            value = row['Labor cost USD without management']
-            operation = row['Operation']
-            result.append({
-                'unit': 'usd',
-                'type': 'dataframe',
-                'variable_df_key_col_name': f'erection_selected_detailed_data: crew cost without management',
-                'value': value,
-                'non_numeric_value': operation
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            value = row['Mobilization cost USD']
-            crane_boom_operation_concat = row['crane_boom_operation_concat']
-            result.append({
-                'unit': 'usd',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'erection_selected_detailed_data: mobilization',
-                'value': value,
-                'non_numeric_value': crane_boom_operation_concat
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            value = row['Wind multiplier']
-            operation = row['Operation']
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': f'erection_selected_detailed_data: wind multiplier',
-                'value': value,
-                'non_numeric_value': operation
-            })
+        full = self.detail_level() == 'full'
+
+        if full:
+            for _, row in self._number_of_equip.iterrows():
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': '_number_of_equip: Operation-Crane name-Boom system-Number of equipment',
+                    'value': f'{row["Operation"]}-{row["Crane name"]}-{row["Boom system"]}-{row["Number of equipment"]}',
+                    'last_number': row["Number of equipment"]
+                })
+
+            for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': f'erection_selected_detailed_data: Operation-Crane name-Boom system-Operational construct days over time construct days',
+                    'value': f'{row["Operation"]}-{row["Crane name"]}-{row["Boom system"]}-{row["Operational construct days over time construct days"]}',
+                    'last_number': row["Operational construct days over time construct days"]
+                })
+
+            for row in self.output_dict['component_name_topvbase'].itertuples():
+                dashed_row = '{} - {}'.format(row[1], row[2])
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'component_name_topvbase: Operation - Top or Base',
+                    'value': dashed_row
+                })
+
+            for row in self.output_dict['crane_choice'].itertuples():
+                dashed_row = '{} - {} - {}'.format(row[1], row[2], row[3])
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'crane_choice: Crew name - Boom system - Operation',
+                    'value': dashed_row
+                })
+
+            for _, row in self.output_dict['crane_data_output'].iterrows():
+                dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'crane_data_output: crane_boom_operation_concat - variable - value',
+                    'value': dashed_row,
+                    'last_number': row[2]
+                })
+
+            for _, row in self.output_dict['crane_cost_details'].iterrows():
+                dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'crane_cost_details: Operation ID - Type of cost - Cost',
+                    'value': dashed_row,
+                    'last_number': row[2]
+                })
+
+            for _, row in self.output_dict['total_erection_cost'].iterrows():
+                dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'total_erection_cost: Phase of construction - Type of cost - Cost USD',
+                    'value': dashed_row,
+                    'last_number': row[2]
+                })
+
+            for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
+                value = row['Labor cost USD without management']
+                operation = row['Operation']
+                result.append({
+                    'unit': 'usd',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': f'erection_selected_detailed_data: crew cost without management',
+                    'value': value,
+                    'non_numeric_value': operation
+                })
+
+            for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
+                value = row['Mobilization cost USD']
+                crane_boom_operation_concat = row['crane_boom_operation_concat']
+                result.append({
+                    'unit': 'usd',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'erection_selected_detailed_data: mobilization',
+                    'value': value,
+                    'non_numeric_value': crane_boom_operation_concat
+                })
+
+            for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
+                value = row['Wind multiplier']
+                operation = row['Operation']
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': f'erection_selected_detailed_data: wind multiplier',
+                    'value': value,
+                    'non_numeric_value': operation
+                })
 
         result.append({
             'unit': 'usd',
@@ -322,13 +345,14 @@ class ErectionCost(CostModule):
             'value': float(self.output_dict['total_cost_summed_erection'])
         })
 
-        for _, row in self.output_dict['management_crews_cost'].iterrows():
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'management_crews_cost: {}'.format(' - '.join(row.index)),
-                'value': ' - '.join(list(str(x) for x in row)[1:])
-            })
+        if full:
+            for _, row in self.output_dict['management_crews_cost'].iterrows():
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'management_crews_cost: {}'.format(' - '.join(row.index)),
+                    'value': ' - '.join(list(str(x) for x in row)[1:])
+                })
 
         result.append({
             'unit': 'hours',
@@ -412,17 +436,12 @@ class ErectionCost(CostModule):
 
         # Why multiply by hardcoded 1/3?
         erection_construction_time = 1 / 3 * construct_duration
-        breakpoint_between_base_and_topping_percent = self.input_dict['breakpoint_between_base_and_topping_percent']
-        hub_height_m = self.input_dict['hub_height_meters']
         rotor_diameter_m = self.input_dict['rotor_diameter_m']
         num_turbines = float(self.input_dict['num_turbines'])
         turbine_spacing_rotor_diameters = self.input_dict['turbine_spacing_rotor_diameters']
 
         # for components in component list determine if base or topping
-        project_data['components']['Operation'] = project_data['components']['Lift height m'] > (
-            float(hub_height_m * breakpoint_between_base_and_topping_percent))
-        boolean_dictionary = {True: 'Top', False: 'Base'}
-        project_data['components']['Operation'] = project_data['components']['Operation'].map(boolean_dictionary)
+        self.assign_component_operations()
 
         # For output to a csv file
         self.output_dict['component_name_topvbase'] = project_data['components'][['Component', 'Operation']]
@@ -896,12 +915,13 @@ class ErectionCost(CostModule):
 
         possible_crane_cost = pd.merge(join_wind_operation, equipment_cost_to_merge, on=['Crane name', 'Boom system', 'Equipment ID', 'Operation'])
 
-        # Remove any duplicates from crew data.
-        crew_deduped = project_data['crew'].drop_duplicates(
-            subset=['Crew type ID', 'Operation', 'Crew name', 'Labor type ID'], keep="first")
-
-        # Merge crew and price data for non-management crews only (base, topping, and offload only)
-        crew_cost = pd.merge(crew_deduped, project_data['crew_price'], on=['Labor type ID'])
+        # Crew and price data, with duplicates removed from the crew data.
+        # Only the non-management crews (base, topping, and offload) are
+        # costed here.
+        crew_rates = self.input_dict.get('crew_rates')
+        if crew_rates is None:
+            crew_rates = CrewRates(project_data['crew'], project_data['crew_price'])
+        crew_cost = crew_rates.crew_cost.copy()
         self.output_dict['crew_cost'] = crew_cost
         non_management_crew_cost = crew_cost.loc[crew_cost['Operation'].isin(['Base', 'Top', 'Offload'])]
 
@@ -939,22 +959,6 @@ class ErectionCost(CostModule):
         possible_crane_cost['Fuel cost USD'] = possible_crane_cost['Fuel consumption gal per day'] * float(
             self.input_dict['fuel_cost_usd_per_gal']) * labor_day_operation
 
-        # calculate costs if top and base cranes are the same
-        base_cranes = possible_crane_cost[possible_crane_cost['Operation'] == 'Base']
-        top_cranes = possible_crane_cost[possible_crane_cost['Operation'] == 'Top']
-        crane_topbase_bool = top_cranes['Crane name'].isin(base_cranes['Crane name'])
-        boom_topbase_bool = top_cranes['Boom system'].isin(base_cranes['Boom system'])
-        possible_crane_topbase = top_cranes[boom_topbase_bool & crane_topbase_bool]
-        same_topbase_crane_list = possible_crane_topbase[['Crane name', 'Boom system']]
-        possible_crane_topbase  = same_topbase_crane_list.merge(possible_crane_cost, on=['Crane name', 'Boom system'])
-        possible_crane_topbase_sum = possible_crane_topbase.groupby(['Crane name',
-                                                                     'Boom system'])[['Labor cost USD without management',
-                                                                                     'Subtotal for hourly labor (non-management) USD',
-                                                                                     'Subtotal for per diem labor (non-management) USD',
-                                                                                     'Equipment rental cost USD',
-                                                                                     'Fuel cost USD']
-        ].sum().reset_index()
-
         # Store the possible cranes for the top and base for future diagnostics.
         self._possible_crane_cost = possible_crane_cost.copy()
 
@@ -964,28 +968,14 @@ class ErectionCost(CostModule):
 
         mobilization_costs['Mobilization cost USD'] = mobilization_costs['Mobilization cost USD'] * 2 # for mobilization and demobilizaton
 
-        # join top and base crane data with mobilization data
-        topbase_same_crane_cost = pd.merge(possible_crane_topbase_sum, mobilization_costs,
-                                           on=['Crane name', 'Boom system'])
-
-        # compute total project cost for erection
-        topbase_same_crane_cost['Total cost USD'] = topbase_same_crane_cost['Labor cost USD without management'] + \
-                                                    topbase_same_crane_cost['Equipment rental cost USD'] + \
-                                                    topbase_same_crane_cost['Fuel cost USD'] + \
-                                                    topbase_same_crane_cost[
-                                                        'Mobilization cost USD']
-
-        # adds operation label for same crane used for base and topping (this way columns are consistent for same and separate basetop)
-        topbase_same_crane_cost['Operation'] = 'Base + Top'
-
-        # calculate costs if top and base use separate cranes
-        separate_topbase = \
-            possible_crane_cost.groupby(['Operation', 'Crane name', 'Boom system'])[['Labor cost USD without management',
-                                                                                                   'Subtotal for hourly labor (non-management) USD',
-                                                                                                   'Subtotal for per diem labor (non-management) USD',
-                                                                                                   'Equipment rental cost USD',
-                                                                                                   'Fuel cost USD']
-        ].sum().reset_index()
+        # The cost matrix has one row per operation, crane and boom system,
+        # which is the cost of using separate cranes for base and topping.
+        cost_columns = ['Labor cost USD without management',
+                        'Subtotal for hourly labor (non-management) USD',
+                        'Subtotal for per diem labor (non-management) USD',
+                        'Equipment rental cost USD',
+                        'Fuel cost USD']
+        separate_topbase = possible_crane_cost.groupby(['Operation', 'Crane name', 'Boom system'])[cost_columns].sum().reset_index()
 
         # join mobilization data to separate top base crane costs
         separate_topbase_crane_cost = pd.merge(separate_topbase, mobilization_costs, on=['Crane name', 'Boom system'])
@@ -997,6 +987,25 @@ class ErectionCost(CostModule):
                                                         separate_topbase_crane_cost[
                                                             'Mobilization cost USD']
 
+        # calculate costs if top and base cranes are the same: the rows of the
+        # cost matrix for cranes and boom systems that can do both the base
+        # and the topping, summed. The crane is mobilized once.
+        base_top = separate_topbase_crane_cost.loc[separate_topbase_crane_cost['Operation'].isin(['Base', 'Top'])]
+        does_base_and_top = base_top.groupby(['Crane name', 'Boom system'])['Operation'].transform('nunique') == 2
+        aggregations = {column: 'sum' for column in cost_columns}
+        aggregations['Mobilization cost USD'] = 'first'
+        topbase_same_crane_cost = base_top.loc[does_base_and_top].groupby(['Crane name', 'Boom system']).agg(aggregations).reset_index()
+
+        # compute total project cost for erection
+        topbase_same_crane_cost['Total cost USD'] = topbase_same_crane_cost['Labor cost USD without management'] + \
+                                                    topbase_same_crane_cost['Equipment rental cost USD'] + \
+                                                    topbase_same_crane_cost['Fuel cost USD'] + \
+                                                    topbase_same_crane_cost[
+                                                        'Mobilization cost USD']
+
+        # adds operation label for same crane used for base and topping (this way columns are consistent for same and separate basetop)
+        topbase_same_crane_cost['Operation'] = 'Base + Top'
+
         return separate_topbase_crane_cost, topbase_same_crane_cost, crew_cost
 
 
@@ -1023,18 +1032,11 @@ class ErectionCost(CostModule):
 
         self.output_dict['separate_basetop'] = separate_basetop
 
-        total_separate_cost = pd.DataFrame()
-        for operation in separate_basetop['Operation'].unique():
-            # find minimum cost option for separate base and topping cranes
-            min_val = min(separate_basetop['Total cost USD'].where(separate_basetop['Operation'] == operation).dropna())
-
-            # find the crane that corresponds to the minimum cost for each operation
-            crane = separate_basetop[separate_basetop['Total cost USD'] == min_val]
-            cost = crane.groupby('Operation').min()
-            total_separate_cost = total_separate_cost.append(cost, sort=True)
-
-        # reset index for separate crane costs
-        total_separate_cost = total_separate_cost.reset_index()
+        # find the minimum cost crane for each operation. Ties go to the
+        # first crane and boom system in alphabetical order.
+        candidates = separate_basetop.sort_values(['Crane name', 'Boom system'], kind='mergesort')
+        total_separate_cost = separate_basetop.loc[candidates.groupby('Operation')['Total cost USD'].idxmin()]
+        total_separate_cost = total_separate_cost[sorted(total_separate_cost.columns)]
 
         # duplicate offload records because assuming two offload cranes are on site
         total_separate_cost = total_separate_cost.append(
@@ -1043,15 +1045,17 @@ class ErectionCost(CostModule):
         # sum costs for separate cranes to get total for all cranes
         cost_chosen_separate = total_separate_cost['Total cost USD'].sum()
 
-        if allow_same_flag is True:
+        if allow_same_flag is True and len(same_basetop) > 0:
             # get the minimum cost for using the same crane for all operations
-            cost_chosen_same = min(same_basetop['Total cost USD'])
+            same_candidates = same_basetop.sort_values(['Crane name', 'Boom system'], kind='mergesort')
+            same_chosen = same_candidates['Total cost USD'].idxmin()
+            cost_chosen_same = same_basetop.loc[same_chosen, 'Total cost USD']
 
             # check if separate or same crane option is cheaper and choose crane cost
             if cost_chosen_separate < cost_chosen_same:
                 cost_chosen = total_separate_cost.groupby(by=["Boom system", "Crane name", "Operation"]).sum()  # added crane name and operation to groupby
             else:
-                cost_chosen = same_basetop.where(same_basetop['Total cost USD'] == cost_chosen_same).dropna()
+                cost_chosen = same_basetop.loc[[same_chosen]]
         else:
             cost_chosen = total_separate_cost.groupby(by=["Boom system", "Crane name", "Operation"]).sum()  # added crane name and operation to groupby
 
@@ -1129,33 +1133,132 @@ class ErectionCost(CostModule):
 
         return management_crews, management_crew_cost_grouped, total_management_cost
 
-    def calculate_costs(self):
+    @staticmethod
+    def frame_digest(frame):
         """
-        Calculates BOS costs for erection including selecting cranes that can lift
-        components, incorporating wind delays and finding the least cost crane options
-        for erection.
+        Digests the columns, dtypes, index and values of a dataframe, so
+        that dataframes with the same contents have the same digest.
+
+        Parameters
+        ----------
+        frame : pd.DataFrame
+            The dataframe, or None.
+
+        Returns
+        -------
+        str
+            The hex digest, or None if frame is None.
         """
-        [crane_specs, operation_time] = self.calculate_erection_operation_time()
+        if frame is None:
+            return None
+        digest = hashlib.sha1(repr((list(frame.columns), [str(dtype) for dtype in frame.dtypes])).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+        return digest.hexdigest()
 
-        self.output_dict['crane_specs'] = crane_specs
-        self.output_dict['operation_time'] = operation_time
+    def crane_operations_cache_key(self):
+        """
+        Makes the key of the crane operations of this project in
+        crane_operations_cache.
 
-        [offload_specs, offload_time] = self.calculate_offload_operation_time()
+        Returns
+        -------
+        tuple
+            The inputs that calculate_crane_operations() reads, with the
+            components, crane_specs and weather window dataframes as
+            digests. The Operation column of the components is left out,
+            because calculate_erection_operation_time() overwrites it.
+        """
+        project_data = self.input_dict['project_data']
+        components = project_data['components'].drop(columns=['Operation'], errors='ignore')
+        return (
+            self.frame_digest(components),
+            self.frame_digest(project_data['crane_specs']),
+            self.frame_digest(self.input_dict['weather_window']),
+            self.input_dict['wind_shear_exponent'],
+            self.input_dict['hub_height_meters'],
+            self.input_dict['breakpoint_between_base_and_topping_percent'],
+            self.input_dict['rotor_diameter_m'],
+            self.input_dict['num_turbines'],
+            self.input_dict['turbine_spacing_rotor_diameters'],
+            self.input_dict['rate_of_deliveries'],
+            self.input_dict['construct_duration'],
+            self.input_dict['operational_construction_time'],
+            self.input_dict['crane_breakdown_fraction'],
+        )
+
+    def assign_component_operations(self):
+        """
+        Labels each component in the components sheet of the project data
+        as a Base or Top operation by its lift height, in its Operation
+        column.
+        """
+        components = self.input_dict['project_data']['components']
+        hub_height_m = self.input_dict['hub_height_meters']
+        breakpoint_between_base_and_topping_percent = self.input_dict['breakpoint_between_base_and_topping_percent']
+        components['Operation'] = components['Lift height m'] > (
+            float(hub_height_m * breakpoint_between_base_and_topping_percent))
+        boolean_dictionary = {True: 'Top', False: 'Base'}
+        components['Operation'] = components['Operation'].map(boolean_dictionary)
 
-        self.output_dict['offload_specs'] = offload_specs
-        self.output_dict['offload_time'] = offload_time
+    def calculate_crane_operations(self):
+        """
+        Finds the cranes that can lift each component, their operation times
+        for the base, topping and offload operations and their wind delays,
+        or reads them from crane_operations_cache if a project with the same
+        inputs has already been calculated in this process.
 
-        # append data for offloading
-        if len(offload_specs) != 0:
-            crane_specs_withoffload = crane_specs.append(offload_specs, sort=True)
-            operation_time_withoffload = operation_time.append(offload_time, sort=True)
-        else:
-            raise Exception('ErectionCost calculate_costs(): offload_specs empty')
+        The output dictionary keys in crane_operations_output_keys are set.
+        """
+        computed = []
+
+        def compute():
+            computed.append(True)
+            [crane_specs, operation_time] = self.calculate_erection_operation_time()
+
+            self.output_dict['crane_specs'] = crane_specs
+            self.output_dict['operation_time'] = operation_time
+
+            [offload_specs, offload_time] = self.calculate_offload_operation_time()
+
+            self.output_dict['offload_specs'] = offload_specs
+            self.output_dict['offload_time'] = offload_time
+
+            # append data for offloading
+            if len(offload_specs) != 0:
+                crane_specs_withoffload = crane_specs.append(offload_specs, sort=True)
+                operation_time_withoffload = operation_time.append(offload_time, sort=True)
+            else:
+                raise Exception('ErectionCost calculate_costs(): offload_specs empty')
+
+            self.output_dict['crane_specs_withoffload'] = crane_specs_withoffload
+            self.output_dict['operation_time_withoffload'] = operation_time_withoffload
+            crane_specs_with_weather = self.calculate_wind_delay_by_component()
+            self.output_dict['cranes_wind_delay_withoffload'] = crane_specs_with_weather
 
-        self.output_dict['crane_specs_withoffload'] = crane_specs_withoffload
-        self.output_dict['operation_time_withoffload'] = operation_time_withoffload
-        crane_specs_with_weather = self.calculate_wind_delay_by_component()
-        self.output_dict['cranes_wind_delay_withoffload'] = crane_specs_with_weather
+            # The cache keeps its own copy, so later changes to the output
+            # dictionary do not reach it.
+            return copy.deepcopy({key: self.output_dict[key] for key in self.crane_operations_output_keys})
+
+        key = self.crane_operations_cache_key()
+        crane_operations = self.crane_operations_cache.get_or_compute(key, compute)
+        if not computed:
+            # A cache hit skips calculate_erection_operation_time(), so
+            # the components still need their operations.
+            self.assign_component_operations()
+
+        # deepcopy() keeps the tables that are the same object in the
+        # output dictionary, like possible_cranes and crane_specs, shared.
+        self.output_dict.update(copy.deepcopy(crane_operations))
+
+    def calculate_costs(self):
+        """
+        Calculates BOS costs for erection including selecting cranes that can lift
+        components, incorporating wind delays and finding the least cost crane options
+        for erection.
+        """
+        self.calculate_crane_operations()
+        operation_time_withoffload = self.output_dict['operation_time_withoffload']
+        crane_specs_with_weather = self.output_dict['cranes_wind_delay_withoffload']
 
         average_wind_delay = crane_specs_with_weather.groupby(['Crane name',
                                                                'Boom system',
@@ -1191,14 +1294,18 @@ class ErectionCost(CostModule):
 
         crane_choice = selected_detailed_data[['Crane name', 'Boom system', 'Operation']].drop_duplicates()
 
-        selected_detailed_data['crane_boom_operation_concat'] = selected_detailed_data[['Crane name', 'Boom system', 'Operation']].apply(lambda x: '-'.join(x), axis=1)
-        crane_data_output = selected_detailed_data.drop(['Crane name', 'Boom system', 'Operation'], axis=1)
-        crane_data_output = crane_data_output.melt(id_vars=['crane_boom_operation_concat'])
+        # The crane data and cost details are only used by the details tab,
+        # so they are only made for the full level of detail.
+        full_details = self.detail_level() == 'full'
+        if full_details:
+            selected_detailed_data['crane_boom_operation_concat'] = selected_detailed_data[['Crane name', 'Boom system', 'Operation']].apply(lambda x: '-'.join(x), axis=1)
+            crane_data_output = selected_detailed_data.drop(['Crane name', 'Boom system', 'Operation'], axis=1)
+            crane_data_output = crane_data_output.melt(id_vars=['crane_boom_operation_concat'])
 
-        crane_cost_details = crane_data_output.where(crane_data_output['variable'].str.contains("cost")).dropna()
-        crane_cost_details = crane_cost_details.rename(index=str,
-                            columns={"crane_boom_operation_concat": "Operation ID", "variable": "Type of cost",
-                                     "value": "Cost"})
+            crane_cost_details = crane_data_output.where(crane_data_output['variable'].str.contains("cost")).dropna()
+            crane_cost_details = crane_cost_details.rename(index=str,
+                                columns={"crane_boom_operation_concat": "Operation ID", "variable": "Type of cost",
+                                         "value": "Cost"})
 
         subtotal_per_diem_labor_management_USD = management_crews_cost['per_diem_costs'].sum()
         subtotal_hourly_labor_management_USD = management_crews_cost['hourly_costs'].sum()
@@ -1224,8 +1331,9 @@ class ErectionCost(CostModule):
         self.output_dict['total_erection_cost'] = total_erection_cost
         self.output_dict['erection_wind_mult'] = erection_wind_mult
         self.output_dict['crane_choice'] = crane_choice
-        self.output_dict['crane_data_output'] = crane_data_output
-        self.output_dict['crane_cost_details'] = crane_cost_details
+        if full_details:
+            self.output_dict['crane_data_output'] = crane_data_output
+            self.output_dict['crane_cost_details'] = crane_cost_details
         self.output_dict['total_cost_summed_erection'] = total_cost_summed_erection
 
         # Put some diagnostic data on selected_detailed_data. This is the number of crews needed
@@ -1242,8 +1350,9 @@ class ErectionCost(CostModule):
 
         # Now get the number of equipment diagnostic data ready. This is held on an instance
         # attribute because it isn't meant to be used outside of the class.
-        self._number_of_equip = selected_detailed_data.merge(self._possible_crane_cost, on=['Crane name', 'Boom system', 'Operation'], how='inner')
-        self._number_of_equip = self._number_of_equip[['Operation', 'Crane name', 'Boom system', 'Number of equipment']]
+        if full_details:
+            self._number_of_equip = selected_detailed_data.merge(self._possible_crane_cost, on=['Crane name', 'Boom system', 'Operation'], how='inner')
+            self._number_of_equip = self._number_of_equip[['Operation', 'Crane name', 'Boom system', 'Number of equipment']]
 
         # Management crews data
         self.output_dict['management_crews_cost'] = management_crews_cost
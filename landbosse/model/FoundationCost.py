@@ -4,9 +4,12 @@ import math
 import pandas as pd
 import numpy as np
 import math
-from scipy.optimize import root_scalar
 
 from .WeatherDelay import WeatherDelay as WD
+from .FoundationSizing import foundation_loads, size_foundations, COMPONENT_COLUMNS
+from .LruCache import LruCache
+from .RsMeansIndex import RsMeansIndex
+from .CrewRates import CrewRates
 from .CostModule import CostModule
 
 
@@ -177,6 +180,17 @@ class FoundationCost(CostModule):
         4. Mobilization
     """
 
+    # sizing_cache memoizes the foundation loads, radii and volumes. The
+    # keys are only the inputs that affect the foundation geometry, so
+    # serials of a sweep that vary other inputs reuse the same entry. It is
+    # shared by all instances in a process.
+    sizing_cache = LruCache(maxsize=1024)
+
+    # The keys in the output dictionary that size_foundation() fills.
+    sizing_output_keys = ['F_dead_kN_per_turbine', 'F_horiz_kN_per_turbine', 'M_tot_kN_m_per_turbine',
+                          'Radius_o_m', 'Radius_s_m', 'Radius_g_m', 'Radius_b_m', 'Radius_m',
+                          'excavated_volume_m3', 'foundation_volume_concrete_m3_per_turbine']
+
     def __init__(self, input_dict, output_dict, project_name):
         """
         Parameters
@@ -247,137 +261,30 @@ class FoundationCost(CostModule):
         Raises
         ------
         ValueError
-            Raises a value error if r_bearing is calculated to be a negative value.
+            Raises a value error if the gapping or bearing radius has no
+            root between 0.9 times the overturning radius and 50 m.
         """
-        # set exposure constants
-        a = 9.5
-        z_g = 274.32
-
-        # get section height
-        z = foundation_load_input_data['Section height m']
-
-        # get cross-sectional area
-        a_f = foundation_load_input_data['Surface area sq m']
-
-        # get coefficient of drag
-        c_d = foundation_load_input_data['Coeff drag (installed)']
-
-        # get lever arm
-        l = foundation_load_input_data['Lever arm m']
-
-        # get multipliers for tower and rotor
-        multiplier_rotor = foundation_load_input_data['Multplier drag rotor']
-        multiplier_tower = foundation_load_input_data['Multiplier tower drag']
-
-
-        # calculate wind pressure
-        k_z = 2.01 * (z / z_g) ** (2 / a)  # exposure factor
-        k_d = 0.95  # wind directionality factor
-        k_zt = 1  # topographic factor
-        v = foundation_load_input_data['gust_velocity_m_per_s']
-        wind_pressure = 0.613 * k_z * k_zt * k_d * v ** 2
-
-        # calculate wind loads on each tower component
-        g = 0.85  # gust factor
-        c_f = 0.6  # coefficient of force
-        f_t = (wind_pressure * g * c_f * a_f) * multiplier_tower
-
-        # calculate drag rotor
-        rho = 1.225  # air density in kg/m^3
-        f_r = (0.5 * rho * c_d * a_f * v ** 2) * multiplier_rotor
-
-        f = (f_t + f_r)
-
-        # calculate dead load in N
-        g = 9.8  # m / s ^ 2
-        f_dead = sum(foundation_load_input_data['Mass tonne']) * g * self._kg_per_tonne / 1.15  # scaling factor to adjust dead load for uplift
-
-        # calculate moment from each component at base of tower
-        m_overturn = f * l
-
-        # get total lateral load (N) and moment (N * m)
-        f_lat = f.sum()  # todo: add f_lat (drag force) to output csv
-        m_overturn = m_overturn.sum()
-
-        # compare to moment from rated thrust
-        rated_thrust = foundation_load_input_data['rated_thrust_N']
-        m_thrust = rated_thrust * max(l)
-        m_tot = max(m_thrust, m_overturn)
-
-        # compare lateral load to rated thrust
-        f_horiz = max(f_lat, rated_thrust)
-
-        # calculate foundation radius based on overturning moment
-        vol_fraction_fill = 0.55
-        vol_fraction_concrete = 1 - vol_fraction_fill
-        safety_overturn = 1.5
-        unit_weight_fill = 17.3e3  # in N / m^3
-        unit_weight_concrete = 23.6e3  # in N / m^3
-        bearing_pressure = foundation_load_input_data['bearing_pressure_n_m2']
-        p = [(np.pi * foundation_load_input_data['depth'] * (vol_fraction_fill * unit_weight_fill + vol_fraction_concrete * unit_weight_concrete)), 0, f_dead, - (safety_overturn * (m_tot + f_horiz * foundation_load_input_data['depth']))]
-        r_overturn = np.roots(p)
-        r_overturn = np.real(r_overturn[np.isreal(r_overturn)])[0]
-
-        # calculate foundation radius based on slipping
-        safety_slipping = 1.5
-        friction_angle_soil = 25
-        tangent_slip_angle = math.tan((friction_angle_soil * math.pi) / 180)
-        slipping_force_with_sf = (safety_slipping * f_lat)
-        # first check if slipping is already satisfied by dead weight
-        if slipping_force_with_sf < (f_dead * tangent_slip_angle):
-            r_slipping = 0
-        else:
-            # Calculate foundation radius based on slipping:
-            r_slipping = (((slipping_force_with_sf / tangent_slip_angle) - f_dead) /
-                          ((vol_fraction_fill * unit_weight_fill + vol_fraction_concrete * unit_weight_concrete) * math.pi * foundation_load_input_data['depth'])) ** 0.5
-
-        r_test_gapping = max(r_overturn, r_slipping)
-
-        # calculate foundation radius based on gapping
-        # check if gapping constrain is already satisfied - r / 3 < e
-        foundation_vol = np.pi * r_test_gapping ** 2 * foundation_load_input_data['depth']
-        v_1 = (foundation_vol * (
-                    vol_fraction_fill * unit_weight_fill + vol_fraction_concrete * unit_weight_concrete) + f_dead)
-        e = m_tot / v_1
-        if (r_test_gapping / 3) < e:
-            r_gapping = 0
-        else:
-            def r_g(x):
-                foundation_vol = np.pi * x** 2 * foundation_load_input_data['depth']
-                v_1 = (foundation_vol * (vol_fraction_fill * unit_weight_fill + vol_fraction_concrete * unit_weight_concrete) + f_dead)
-                e = m_tot / v_1
-                return (e * 3 - x)
-            result = root_scalar(r_g, method='brentq', bracket=[0.9*r_overturn, 50], xtol=1e-4, maxiter=50)
-            r_gapping = result.root
-            if not result.converged:
-                raise ValueError(f'Warning {self.project_name} calculate_foundation_load r_gapping solve failed, {result.flag}')
-
-        r_test_bearing = max(r_test_gapping, r_gapping)
-
-        # calculate foundation radius based on bearing pressure
-        def r_b(x):
-            foundation_vol = np.pi * r_test_bearing ** 2 * foundation_load_input_data['depth']
-            v_1 = (foundation_vol * (vol_fraction_fill * unit_weight_fill + vol_fraction_concrete * unit_weight_concrete) + f_dead)
-            e = m_tot / v_1
-            a_eff = v_1 / bearing_pressure
-            return (2 * (x ** 2 - e * (x ** 2 - e ** 2) ** 0.5) - a_eff)
-        result = root_scalar(r_b, method='brentq', bracket=[0.9*r_overturn, 50], xtol=1e-10, maxiter=50)
-        r_bearing = result.root
-
-        if not result.converged:
-            raise ValueError(f'Warning {self.project_name} calculate_foundation_load r_bearing solve failed, {result.flag}')
-
-        # pick the largest foundation radius based on all 4 foundation design criteria: moment, gapping, bearing, slipping
-        r_choosen = max(r_bearing, r_overturn, r_slipping, r_gapping)
-
-        foundation_load_output_data['F_dead_kN_per_turbine']    =   f_dead / 1e3
-        foundation_load_output_data['F_horiz_kN_per_turbine']   =   f_lat / 1e3
-        foundation_load_output_data['M_tot_kN_m_per_turbine']   =   m_tot / 1e3
-        foundation_load_output_data['Radius_o_m']   =   r_overturn
-        foundation_load_output_data['Radius_s_m']   =   r_slipping
-        foundation_load_output_data['Radius_g_m']   =   r_gapping
-        foundation_load_output_data['Radius_b_m']   =   r_bearing
-        foundation_load_output_data['Radius_m']     =   r_choosen
+        # The loads and radii are calculated by the same functions that
+        # size the foundations of many projects at once. See
+        # FoundationSizing for the calculations.
+        loads = foundation_loads(foundation_load_input_data, foundation_load_input_data['gust_velocity_m_per_s'])
+        sizes = size_foundations(
+            f_dead=loads['f_dead'],
+            f_lat=loads['f_lat'],
+            m_overturn=loads['m_overturn'],
+            lever_arm_max=loads['lever_arm_max'],
+            rated_thrust_N=foundation_load_input_data['rated_thrust_N'],
+            depth=foundation_load_input_data['depth'],
+            bearing_pressure_n_m2=foundation_load_input_data['bearing_pressure_n_m2']
+        )
+
+        if np.isnan(sizes['Radius_g_m'][0]):
+            raise ValueError(f'Warning {self.project_name} calculate_foundation_load r_gapping solve failed, no root in bracket')
+        if np.isnan(sizes['Radius_b_m'][0]):
+            raise ValueError(f'Warning {self.project_name} calculate_foundation_load r_bearing solve failed, no root in bracket')
+
+        for key, value in sizes.items():
+            foundation_load_output_data[key] = float(value[0])
 
         return foundation_load_output_data
 
@@ -415,6 +322,63 @@ class FoundationCost(CostModule):
         return foundation_size_output_data
 
 
+    def sizing_cache_key(self, foundation_input_data):
+        """
+        Makes the key of the foundation geometry in sizing_cache.
+
+        Parameters
+        -------
+        foundation_input_data : dict
+            The input dictionary.
+
+        Returns
+        -------
+        tuple
+            The component columns that the loads are calculated from, the
+            gust velocity, rated thrust, depth, bearing pressure and
+            whether the turbine is small enough for a square foundation.
+        """
+        components = tuple(tuple(np.asarray(foundation_input_data[column], dtype=float).tolist())
+                           for column in COMPONENT_COLUMNS)
+        return (
+            components,
+            float(foundation_input_data['gust_velocity_m_per_s']),
+            float(foundation_input_data['rated_thrust_N']),
+            float(foundation_input_data['depth']),
+            float(foundation_input_data['bearing_pressure_n_m2']),
+            foundation_input_data['turbine_rating_MW'] < 0.1
+        )
+
+    def size_foundation(self, foundation_input_data, foundation_output_data):
+        """
+        Calculates the foundation loads and size with
+        calculate_foundation_load() and determine_foundation_size(), or
+        reads them from sizing_cache if a project with the same geometry
+        inputs has already been sized in this process.
+
+        Parameters
+        -------
+        foundation_input_data : dict
+            The input dictionary.
+
+        foundation_output_data : dict
+            The output dictionary. The keys in sizing_output_keys are set.
+
+        Returns
+        -------
+        dict
+            The output dictionary.
+        """
+        def compute():
+            sizing_output_data = dict()
+            self.calculate_foundation_load(foundation_input_data, sizing_output_data)
+            self.determine_foundation_size(foundation_input_data, sizing_output_data)
+            return {key: sizing_output_data[key] for key in self.sizing_output_keys}
+
+        key = self.sizing_cache_key(foundation_input_data)
+        foundation_output_data.update(self.sizing_cache.get_or_compute(key, compute))
+        return foundation_output_data
+
     def estimate_material_needs_per_turbine(self, material_needs_per_turbine_input_data, material_needs_per_turbine_output_data):
         """
         Function to estimate amount of material based on foundation size and number of turbines.
@@ -472,7 +436,7 @@ class FoundationCost(CostModule):
 
         foundation_construction_time = construction_time_input_data['construct_duration'] * 1 / 3
         #throughput_operations = construction_time_input_data['throughput_operations']
-        throughput_operations = construction_time_input_data['rsmeans']
+        rsmeans_index = RsMeansIndex.for_input_dict(construction_time_input_data)
         material_needs_per_turbine = construction_time_output_data['material_needs_per_turbine']
         quantity_materials_entire_farm = material_needs_per_turbine['Quantity of material'] * construction_time_input_data['num_turbines']
 
@@ -482,12 +446,9 @@ class FoundationCost(CostModule):
         material_needs_entire_farm = construction_time_output_data['material_needs_entire_farm']
         material_needs_entire_farm['Quantity of material'] = quantity_materials_entire_farm
         if construction_time_input_data['turbine_rating_MW'] <= 0.1:
-            operation_data = throughput_operations.where(
-                throughput_operations['Module'] == 'Small DW Foundations').dropna(
-                thresh=4)
+            operation_data = rsmeans_index.operations('Small DW Foundations')
         else:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Foundations').dropna(
-                thresh=4)
+            operation_data = rsmeans_index.operations('Foundations')
 
         #operation data for entire wind farm:
         operation_data = pd.merge(material_needs_entire_farm, operation_data, on=['Material type ID'], how='outer')
@@ -510,12 +471,8 @@ class FoundationCost(CostModule):
 
         # pull out management data #TODO: Add this cost to Labor cost next
         if construction_time_input_data['turbine_rating_MW'] > 0.1:
-            crew_cost = self.input_dict['crew_cost']
-            crew = self.input_dict['crew'][self.input_dict['crew']['Crew type ID'].str.contains('M0')]
-            management_crew = pd.merge(crew_cost, crew, on=['Labor type ID'])
-            management_crew = management_crew.assign(per_diem_total=management_crew['Per diem USD per day'] * management_crew['Number of workers'] * num_days)
-            management_crew = management_crew.assign(hourly_costs_total=management_crew['Hourly rate USD per hour'] * self.input_dict['hour_day'][self.input_dict['time_construct']] * num_days)
-            management_crew = management_crew.assign(total_crew_cost_before_wind_delay=management_crew['per_diem_total'] + management_crew['hourly_costs_total'])
+            crew_rates = CrewRates.for_input_dict(self.input_dict)
+            management_crew = crew_rates.management_crew_cost(num_days, self.input_dict['hour_day'][self.input_dict['time_construct']])
             self.output_dict['management_crew'] = management_crew
             self.output_dict['managament_crew_cost_before_wind_delay'] = management_crew['total_crew_cost_before_wind_delay'].sum()
         else:
@@ -611,11 +568,11 @@ class FoundationCost(CostModule):
         wind_multiplier = 1 / (1 - wind_delay_fraction)
         calculate_costs_output_dict['wind_multiplier'] = wind_multiplier
 
-        rsmeans = calculate_costs_input_dict['rsmeans']
+        rsmeans_index = RsMeansIndex.for_input_dict(calculate_costs_input_dict)
         if calculate_costs_input_dict['turbine_rating_MW'] > 0.1:
-            rsmeans = rsmeans.where(rsmeans['Module'] == 'Foundations').dropna(thresh=4)
+            rsmeans = rsmeans_index.operations('Foundations')
         else:
-            rsmeans = rsmeans.where(rsmeans['Module'] == 'Small DW Foundations').dropna(thresh=4)
+            rsmeans = rsmeans_index.operations('Small DW Foundations')
 
         labor_equip_data = pd.merge(material_vol_entire_farm, rsmeans, on=['Material type ID'])
 
@@ -717,6 +674,7 @@ class FoundationCost(CostModule):
         # types.
 
         result = []
+        full = self.detail_level() == 'full'
         module = type(self).__name__
         result.append({
             'unit': '',
@@ -780,34 +738,35 @@ class FoundationCost(CostModule):
             'value': self.output_dict['foundation_volume_concrete_m3_per_turbine']
         })
 
-        for row in self.output_dict['operation_data_id_days_crews_workers'].itertuples():
-            dashed_row = '{}-{}-{}-{}'.format(row[1], math.ceil(row[2]), row[3], row[4])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'operation_data: Operation ID-Number of days-Number of crews-Number of workers',
-                'value': dashed_row
-            })
-
-        for row in self.output_dict['material_needs_per_turbine'].itertuples():
-            # This must be formatted in Python
-            dashed_row = '{}-{}-{:.2e}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': row[3],
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'material_needs_per_turbine: {}'.format('-'.join(self.output_dict['material_needs_per_turbine'].columns[:-1])),
-                'value': dashed_row
-            })
-
-        for row in self.output_dict['total_foundation_cost'].itertuples():
-            dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
+        if full:
+            for row in self.output_dict['operation_data_id_days_crews_workers'].itertuples():
+                dashed_row = '{}-{}-{}-{}'.format(row[1], math.ceil(row[2]), row[3], row[4])
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'operation_data: Operation ID-Number of days-Number of crews-Number of workers',
+                    'value': dashed_row
+                })
+
+            for row in self.output_dict['material_needs_per_turbine'].itertuples():
+                # This must be formatted in Python
+                dashed_row = '{}-{}-{:.2e}'.format(row[0], row[1], row[2])
+                result.append({
+                    'unit': row[3],
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'material_needs_per_turbine: {}'.format('-'.join(self.output_dict['material_needs_per_turbine'].columns[:-1])),
+                    'value': dashed_row
+                })
+
+            for row in self.output_dict['total_foundation_cost'].itertuples():
+                dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
+                    'value': dashed_row,
+                    'last_number': row[2]
+                })
 
         for _dict in result:
             _dict['project_id_with_serial'] = self.project_name
@@ -855,8 +814,7 @@ class FoundationCost(CostModule):
 
         """
         try:
-            self.calculate_foundation_load(self.input_dict, self.output_dict)  # Returns foundation load
-            self.determine_foundation_size(self.input_dict, self.output_dict)  # Returns foundation volume
+            self.size_foundation(self.input_dict, self.output_dict)  # Returns foundation load and volume
             self.estimate_material_needs_per_turbine(self.input_dict, self.output_dict)  # Returns material volume
             operation_data = self.estimate_construction_time(self.input_dict, self.output_dict)  # Estimates construction time
 
@@ -889,7 +847,8 @@ class FoundationCost(CostModule):
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             # self.output_dict['labor_equip_data']
             # self.output_dict['foundation_module_type_operation'] = self.outputs_for_module_type_operation(self.input_dict, self.output_dict)
             self.output_dict['foundation_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
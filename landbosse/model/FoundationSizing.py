@@ -0,0 +1,302 @@
+"""
+This module sizes the foundations of many turbines or projects at once.
+
+FoundationCost.calculate_foundation_load() sizes the foundation of one
+project. When a parametric sweep changes the hub height, rated thrust,
+gust velocity or bearing pressure, the same calculation is repeated for
+thousands of projects, each with its own cubic and root finding solves.
+The functions here do the same calculation on NumPy arrays with one
+element per project:
+
+- foundation_loads() reduces the component table to the dead load,
+  lateral load, overturning moment and longest lever arm for each gust
+  velocity.
+
+- size_foundations() finds the foundation radius from each of the four
+  design criteria. The overturning cubic has no squared term and one real
+  root, which is found in closed form with Cardano's formula. The gapping
+  and bearing radii are found by bisection on every project at once,
+  within the same brackets that FoundationCost has always used.
+
+FoundationCost uses these functions for a single project, so the scalar
+and batched paths are the same code.
+"""
+
+import math
+
+import numpy as np
+
+# Exposure constants
+EXPOSURE_ALPHA = 9.5
+EXPOSURE_Z_G = 274.32
+
+# Soil and fill properties
+VOL_FRACTION_FILL = 0.55
+VOL_FRACTION_CONCRETE = 1 - VOL_FRACTION_FILL
+UNIT_WEIGHT_FILL = 17.3e3  # in N / m^3
+UNIT_WEIGHT_CONCRETE = 23.6e3  # in N / m^3
+SAFETY_OVERTURN = 1.5
+SAFETY_SLIPPING = 1.5
+FRICTION_ANGLE_SOIL = 25  # degrees
+
+# The columns of the component data that the loads are calculated from.
+COMPONENT_COLUMNS = ['Section height m', 'Surface area sq m', 'Coeff drag (installed)', 'Lever arm m',
+                     'Multplier drag rotor', 'Multiplier tower drag', 'Mass tonne']
+
+# Upper end of the brackets for the gapping and bearing radii, in m.
+MAX_RADIUS_M = 50
+
+# Tolerance of the bisection for the gapping and bearing radii, in m.
+RADIUS_XTOL_M = 1e-10
+
+
+def foundation_loads(components, gust_velocity_m_per_s):
+    """
+    Calculates the loads on the foundation from the components of the
+    turbine.
+
+    Parameters
+    ----------
+    components : dict or pandas.DataFrame
+        The component data. Values under the keys 'Section height m',
+        'Surface area sq m', 'Coeff drag (installed)', 'Lever arm m',
+        'Multplier drag rotor', 'Multiplier tower drag' and 'Mass tonne'
+        are arrays with one element per component.
+
+    gust_velocity_m_per_s : float or numpy.ndarray
+        The 50 year gust velocity of each project.
+
+    Returns
+    -------
+    dict
+        Values are arrays with one element per gust velocity:
+
+        f_dead : Dead load, scaled for uplift, in N
+        f_lat : Total lateral load in N
+        m_overturn : Overturning moment in N * m
+        lever_arm_max : The longest lever arm of any component in m
+    """
+    z = np.asarray(components['Section height m'], dtype=float)
+    a_f = np.asarray(components['Surface area sq m'], dtype=float)
+    c_d = np.asarray(components['Coeff drag (installed)'], dtype=float)
+    l = np.asarray(components['Lever arm m'], dtype=float)
+    multiplier_rotor = np.asarray(components['Multplier drag rotor'], dtype=float)
+    multiplier_tower = np.asarray(components['Multiplier tower drag'], dtype=float)
+
+    # One row per gust velocity, one column per component.
+    v = np.atleast_1d(np.asarray(gust_velocity_m_per_s, dtype=float))[:, np.newaxis]
+
+    # calculate wind pressure
+    k_z = 2.01 * (z / EXPOSURE_Z_G) ** (2 / EXPOSURE_ALPHA)  # exposure factor
+    k_d = 0.95  # wind directionality factor
+    k_zt = 1  # topographic factor
+    wind_pressure = 0.613 * k_z * k_zt * k_d * v ** 2
+
+    # calculate wind loads on each tower component
+    g = 0.85  # gust factor
+    c_f = 0.6  # coefficient of force
+    f_t = (wind_pressure * g * c_f * a_f) * multiplier_tower
+
+    # calculate drag rotor
+    rho = 1.225  # air density in kg/m^3
+    f_r = (0.5 * rho * c_d * a_f * v ** 2) * multiplier_rotor
+
+    f = (f_t + f_r)
+
+    # calculate dead load in N
+    g = 9.8  # m / s ^ 2
+    kg_per_tonne = 1000
+    f_dead = sum(components['Mass tonne']) * g * kg_per_tonne / 1.15  # scaling factor to adjust dead load for uplift
+
+    return {
+        'f_dead': np.full(v.shape[0], f_dead),
+        'f_lat': f.sum(axis=1),
+        'm_overturn': (f * l).sum(axis=1),
+        'lever_arm_max': np.full(v.shape[0], max(l))
+    }
+
+
+def depressed_cubic_root(a, c, d):
+    """
+    Finds the real root of a * x ** 3 + c * x + d = 0 where a > 0 and
+    c >= 0. Under those conditions the cubic is strictly increasing and
+    has exactly one real root.
+
+    The root is calculated with Cardano's formula in the form
+    x = t - p / (3 * t), which avoids the cancellation of the usual
+    difference of two cube roots.
+
+    Parameters
+    ----------
+    a, c, d : numpy.ndarray
+        The coefficients of each cubic.
+
+    Returns
+    -------
+    numpy.ndarray
+        The real root of each cubic.
+    """
+    p = c / a
+    q = d / a
+    t = np.cbrt(-q / 2 + np.sqrt((q / 2) ** 2 + (p / 3) ** 3))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        root = t - p / (3 * t)
+    # When p and q are both zero, so is the root.
+    return np.where(t == 0, 0.0, root)
+
+
+def bisect(func, lo, hi, xtol=RADIUS_XTOL_M, maxiter=100):
+    """
+    Finds a root of func in each bracket [lo, hi] by bisection. All the
+    brackets are bisected at once.
+
+    Parameters
+    ----------
+    func : callable
+        Takes an array of x values, one per bracket, and returns an array
+        of function values.
+
+    lo, hi : numpy.ndarray
+        The ends of the brackets.
+
+    xtol : float
+        The bisection stops when every bracket is narrower than this.
+
+    maxiter : int
+        The maximum number of bisections.
+
+    Returns
+    -------
+    numpy.ndarray
+        The root in each bracket. NaN where func does not change sign
+        across the bracket.
+    """
+    lo, hi = np.broadcast_arrays(np.asarray(lo, dtype=float), np.asarray(hi, dtype=float))
+    lo = lo.copy()
+    hi = hi.copy()
+    with np.errstate(invalid='ignore'):
+        f_lo = func(lo)
+        f_hi = func(hi)
+        bracketed = np.sign(f_lo) * np.sign(f_hi) <= 0
+
+        for _ in range(maxiter):
+            if np.all((hi - lo)[bracketed] < xtol):
+                break
+            mid = (lo + hi) / 2
+            f_mid = func(mid)
+            same_sign_as_lo = (np.sign(f_mid) == np.sign(f_lo)) & (f_lo != 0)
+            lo = np.where(same_sign_as_lo, mid, lo)
+            f_lo = np.where(same_sign_as_lo, f_mid, f_lo)
+            hi = np.where(same_sign_as_lo, hi, mid)
+
+    root = np.where(f_lo == 0, lo, (lo + hi) / 2)
+    return np.where(bracketed, root, np.nan)
+
+
+def size_foundations(f_dead, f_lat, m_overturn, lever_arm_max, rated_thrust_N, depth, bearing_pressure_n_m2):
+    """
+    Sizes the foundations of many projects at once. The design criteria
+    are the same as in FoundationCost.calculate_foundation_load():
+    overturning, slipping, gapping and bearing pressure. The chosen radius
+    is the largest of the four.
+
+    All the parameters are arrays with one element per project, or scalars
+    that are shared by all projects.
+
+    Parameters
+    ----------
+    f_dead, f_lat, m_overturn, lever_arm_max
+        The loads from foundation_loads()
+
+    rated_thrust_N
+        Rated thrust of the turbine in N
+
+    depth
+        Foundation depth in m
+
+    bearing_pressure_n_m2
+        Bearing pressure of the soil in N / m^2
+
+    Returns
+    -------
+    dict
+        Values are arrays with one element per project, under the same keys
+        as the outputs of FoundationCost.calculate_foundation_load():
+        'F_dead_kN_per_turbine', 'F_horiz_kN_per_turbine',
+        'M_tot_kN_m_per_turbine', 'Radius_o_m', 'Radius_s_m',
+        'Radius_g_m', 'Radius_b_m' and 'Radius_m'. Radius_g_m and
+        Radius_b_m are NaN for projects whose root is not within the
+        bracket of 0.9 times the overturning radius to 50 m. Radius_m is
+        NaN for those projects too.
+    """
+    f_dead, f_lat, m_overturn, lever_arm_max, rated_thrust_N, depth, bearing_pressure_n_m2 = np.broadcast_arrays(
+        *[np.asarray(value, dtype=float) for value in
+          [f_dead, f_lat, m_overturn, lever_arm_max, rated_thrust_N, depth, bearing_pressure_n_m2]]
+    )
+
+    # compare to moment from rated thrust
+    m_thrust = rated_thrust_N * lever_arm_max
+    m_tot = np.maximum(m_thrust, m_overturn)
+
+    # compare lateral load to rated thrust
+    f_horiz = np.maximum(f_lat, rated_thrust_N)
+
+    # calculate foundation radius based on overturning moment
+    unit_weight = VOL_FRACTION_FILL * UNIT_WEIGHT_FILL + VOL_FRACTION_CONCRETE * UNIT_WEIGHT_CONCRETE
+    r_overturn = depressed_cubic_root(np.pi * depth * unit_weight,
+                                      f_dead,
+                                      -(SAFETY_OVERTURN * (m_tot + f_horiz * depth)))
+
+    # calculate foundation radius based on slipping. It is 0 if slipping
+    # is already satisfied by the dead weight.
+    tangent_slip_angle = math.tan((FRICTION_ANGLE_SOIL * math.pi) / 180)
+    slipping_force_with_sf = SAFETY_SLIPPING * f_lat
+    with np.errstate(invalid='ignore'):
+        r_slipping = np.where(
+            slipping_force_with_sf < (f_dead * tangent_slip_angle),
+            0.0,
+            (((slipping_force_with_sf / tangent_slip_angle) - f_dead) / (unit_weight * math.pi * depth)) ** 0.5
+        )
+
+    r_test_gapping = np.maximum(r_overturn, r_slipping)
+
+    # calculate foundation radius based on gapping. It is 0 if the gapping
+    # constraint r / 3 < e is already satisfied.
+    def eccentricity(r):
+        foundation_vol = np.pi * r ** 2 * depth
+        v_1 = foundation_vol * unit_weight + f_dead
+        return m_tot / v_1, v_1
+
+    e, _ = eccentricity(r_test_gapping)
+    gapping_satisfied = (r_test_gapping / 3) < e
+
+    def r_g(x):
+        e, _ = eccentricity(x)
+        return e * 3 - x
+
+    r_gapping = np.where(gapping_satisfied, 0.0, bisect(r_g, 0.9 * r_overturn, MAX_RADIUS_M))
+
+    r_test_bearing = np.maximum(r_test_gapping, r_gapping)
+
+    # calculate foundation radius based on bearing pressure
+    e_bearing, v_1_bearing = eccentricity(r_test_bearing)
+    a_eff = v_1_bearing / bearing_pressure_n_m2
+
+    def r_b(x):
+        return 2 * (x ** 2 - e_bearing * (x ** 2 - e_bearing ** 2) ** 0.5) - a_eff
+
+    r_bearing = bisect(r_b, 0.9 * r_overturn, MAX_RADIUS_M)
+
+    # pick the largest foundation radius based on all 4 foundation design criteria: moment, gapping, bearing, slipping
+    r_choosen = np.maximum.reduce([r_bearing, r_overturn, r_slipping, r_gapping])
+
+    return {
+        'F_dead_kN_per_turbine': f_dead / 1e3,
+        'F_horiz_kN_per_turbine': f_lat / 1e3,
+        'M_tot_kN_m_per_turbine': m_tot / 1e3,
+        'Radius_o_m': r_overturn,
+        'Radius_s_m': r_slipping,
+        'Radius_g_m': r_gapping,
+        'Radius_b_m': r_bearing,
+        'Radius_m': r_choosen
+    }
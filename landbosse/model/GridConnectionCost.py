@@ -115,17 +115,19 @@ class GridConnectionCost(CostModule):
             A list of dicts, with each dict representing a row of the data.
         """
         result = []
+        full = self.detail_level() == 'full'
         module = type(self).__name__
 
-        for row in self.output_dict['trans_dist_usd_df'].itertuples():
-            dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
+        if full:
+            for row in self.output_dict['trans_dist_usd_df'].itertuples():
+                dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
+                    'value': dashed_row,
+                    'last_number': row[2]
+                })
 
         for _dict in result:
             _dict['project_id_with_serial'] = self.project_name
@@ -184,7 +186,8 @@ class GridConnectionCost(CostModule):
         """
         try:
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             self.output_dict['trans_dist_cost_module_type_operation'] = \
                 self.outputs_for_costs_by_module_type_operation(input_df=self.output_dict['trans_dist_usd_df'],
                                                                 project_id=self.project_name,
@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+
+
+class LruCache:
+    """
+    A bounded cache that evicts the least recently used entry when it is
+    full. It counts hits and misses so that the benefit of caching can be
+    seen in a run.
+
+    Cost modules use it to memoize calculations whose inputs repeat across
+    the serials of a parametric sweep. For example, a sweep over the labor
+    cost multiplier does not change the foundation geometry, so
+    FoundationCost can skip the foundation sizing solves for every serial
+    after the first.
+
+    Keys must be hashable. Values are stored as given, so callers that
+    hand out mutable values should copy them.
+
+    The cache is local to the process that fills it. A lock makes it safe
+    to share between threads.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Parameters
+        ----------
+        maxsize : int
+            The maximum number of entries. 0 disables the cache: every
+            lookup is a miss and nothing is stored.
+        """
+        if maxsize < 0:
+            raise ValueError(f'maxsize must be 0 or more, got {maxsize}')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the value cached under key. If there is none, calls compute
+        and caches its result.
+
+        compute is called outside the lock, so two threads missing on the
+        same key may both compute it. Exceptions raised by compute
+        propagate and nothing is cached.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the value.
+
+        compute : callable
+            Called with no arguments to calculate the value on a miss.
+
+        Returns
+        -------
+        object
+            The cached or computed value.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def resize(self, maxsize):
+        """
+        Changes the maximum number of entries, evicting the least recently
+        used entries if there are too many.
+
+        Parameters
+        ----------
+        maxsize : int
+            The new maximum number of entries.
+        """
+        if maxsize < 0:
+            raise ValueError(f'maxsize must be 0 or more, got {maxsize}')
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes every entry and resets the hit and miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Returns
+        -------
+        dict
+            The number of hits, misses, entries and the maximum number of
+            entries.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
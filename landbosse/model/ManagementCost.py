@@ -1,9 +1,10 @@
 import math
 import traceback
-import pytest
-import traceback
 
-class ManagementCost:
+from .CostModule import CostModule
+
+
+class ManagementCost(CostModule):
     """
     This class models management costs of a wind plant. Its inputs are
     configured with a dictionary with the key value pairs being the
@@ -568,7 +569,8 @@ class ManagementCost:
                 self.output_dict['engineering_usd'] = self.engineering_foundations_collection_sys()
                 self.output_dict['site_facility_usd'] = self.site_facility()
                 self.output_dict['total_management_cost'] = self.total_management_cost()
-            self.output_dict['management_cost_csv'] = self.outputs_for_detailed_tab()
+            if self.detail_level() != 'none':
+                self.output_dict['management_cost_csv'] = self.outputs_for_detailed_tab()
             self.output_dict['mangement_module_type_operation'] = self.outputs_for_module_type_operation()
             return 0, 0    # module ran successfully
         except Exception as error:
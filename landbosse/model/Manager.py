@@ -1,5 +1,7 @@
 import traceback
 import math
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 from .ManagementCost import ManagementCost
 from .FoundationCost import FoundationCost
@@ -9,6 +11,11 @@ from .SitePreparationCost import SitePreparationCost
 from .CollectionCost import Cable, Array, ArraySystem
 from .ErectionCost import ErectionCost
 from .DevelopmentCost import DevelopmentCost
+from .CostModule import CostModule
+from .StageTimer import StageTimer
+from .TrackedInputDict import TrackedInputDict
+from .RsMeansIndex import RsMeansIndex
+from .CrewRates import CrewRates
 
 
 class Manager:
@@ -16,96 +23,440 @@ class Manager:
     The Manager class distributes input and output dictionaries among
     the various modules. It maintains the hierarchical dictionary
     structure.
+
+    The cost modules that run before ManagementCost are declared in
+    cost_module_dependencies as a directed acyclic graph. Each module is
+    listed with the modules whose outputs it needs. A module runs as soon
+    as all the modules it needs have finished. With max_workers greater
+    than 1, modules that do not depend on each other run at the same time
+    on a thread pool.
+
+    Each of those modules writes into its own output dictionary. When they
+    have all finished, their output dictionaries are merged into the output
+    dictionary of the project in the order of cost_module_dependencies.
+    Some keys, such as 'wind_multiplier', are written by more than one
+    module, so the merge order makes the result the same as running the
+    modules one after another in that order.
     """
 
-    def __init__(self, input_dict, output_dict):
+    # The cost modules that run before ManagementCost, in the order their
+    # outputs are merged, each with the cost modules whose outputs it
+    # needs. None of them needs the outputs of another: they only read the
+    # master input dictionary. ManagementCost needs all of them, through
+    # the project totals calculated in execute_landbosse(), so it runs last.
+    cost_module_dependencies = {
+        FoundationCost: [],
+        SitePreparationCost: [],
+        SubstationCost: [],
+        GridConnectionCost: [],
+        ArraySystem: [],
+        DevelopmentCost: [],
+        ErectionCost: [],
+    }
+
+    # The inputs that execute_landbosse() uses to select the weather window
+    # for all the modules. If any of them change, recompute() runs the
+    # whole project again.
+    weather_window_inputs = {'weather_window', 'season_construct', 'time_construct', 'hour_day', 'construct_duration'}
+
+    # The inputs that the crew rates are made from. If any of them change,
+    # recompute() makes the crew rates again. See CrewRates.
+    crew_rate_inputs = {'crew', 'crew_cost', ('project_data', 'crew'), ('project_data', 'crew_price')}
+
+    def __init__(self, input_dict, output_dict, max_workers=1, detail_level='full', detail_modules=None):
         """
         This initializer sets up the instance variables of:
 
-        self.cost_modules: A list of cost module instances. Each of the
-            instances must implement the method input_output.
-
         self.input_dict: A placeholder for the inputs dictionary
 
         self.output_dict: A placeholder for the output dictionary
+
+        self.max_workers: The number of threads that run independent cost
+            modules at the same time. 1 runs the modules one after another
+            on the calling thread.
+
+        self.detail_level: 'none', 'summary' or 'full', how many rows the
+            cost modules make for the details tab. See
+            CostModule.detail_level().
+
+        self.detail_modules: The names of the only modules that make rows
+            for the details tab, or None for all of them.
         """
+        if detail_level not in CostModule.detail_levels:
+            raise ValueError(f'detail_level must be one of {CostModule.detail_levels}, got {detail_level}')
         self.input_dict = input_dict
         self.output_dict = output_dict
+        self.max_workers = max_workers
+        self.detail_level = detail_level
+        self.detail_modules = None if detail_modules is None else frozenset(detail_modules)
 
     def execute_landbosse(self, project_name):
-        try:
-            # Create weather window that will be used for all tasks (window for entire project; selected to restrict to seasons and hours specified)
-            weather_data_user_input = self.input_dict['weather_window']
-            season_construct = self.input_dict['season_construct']
-            time_construct = self.input_dict['time_construct']
-            daily_operational_hours = self.input_dict['hour_day'][time_construct]
-
-            # Filtered window. Restrict to the seasons and hours specified.
-            filtered_weather_window = weather_data_user_input.loc[(weather_data_user_input['Season'].isin(season_construct)) & (weather_data_user_input['Time window'] == time_construct)]
-            filtered_weather_window = filtered_weather_window[0:(math.ceil(self.input_dict['construct_duration'] * 30 * daily_operational_hours))]
-
-            # Rename weather data to specify types
-            self.input_dict['weather_window'] = filtered_weather_window
-            self.input_dict['weather_data_user_input'] = weather_data_user_input
-
-            foundation_cost = FoundationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            foundation_cost.run_module()
-
-            roads_cost = SitePreparationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            roads_cost.run_module()
-
-            substation_cost = SubstationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            substation_cost.run_module()
-
-            transdist_cost = GridConnectionCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            transdist_cost.run_module()
-
-            collection_cost = ArraySystem(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            collection_cost.run_module()
-
-            development_cost = DevelopmentCost(input_dict=self.input_dict, output_dict=self.output_dict,
-                                          project_name=project_name)
-            development_cost.run_module()
-
-            erection_cost_output_dict = dict()
-            erection_cost = ErectionCost(
-                input_dict=self.input_dict,
-                output_dict=self.output_dict,
-                project_name=project_name
-            )
-            erection_cost.run_module()
-            self.output_dict['erection_cost'] = erection_cost_output_dict
-
-
-
-            self.output_dict['actual_construction_months'] = self.output_dict['siteprep_construction_months'] + \
-                                                             max(self.output_dict['erection_construction_months'],
-                                                             self.output_dict['foundation_construction_months'],
-                                                             self.output_dict['collection_construction_months']) + 1
-
-            if self.output_dict['actual_construction_months'] < self.input_dict['construct_duration']:
-                road_cost = self.output_dict['total_road_cost']
-                index = road_cost['Type of cost'] == 'Other'
-                other = road_cost[index]
-                amount_shorter_than_input_construction_time = (self.input_dict['construct_duration'] - self.output_dict['siteprep_construction_months'])
-                road_cost.loc[index, 'Cost USD'] = other['Cost USD'] - amount_shorter_than_input_construction_time * 55500
-                self.output_dict['total_road_cost'] = road_cost
-
-            total_costs = self.output_dict['total_collection_cost']
-            total_costs = total_costs.append(self.output_dict['total_road_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_transdist_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_substation_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_foundation_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_erection_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_development_cost'], sort=False)
-
-            self.input_dict['project_value_usd'] = total_costs.sum(numeric_only=True)[0]
-            self.input_dict['foundation_cost_usd'] = self.output_dict['total_foundation_cost'].sum(numeric_only=True)[0]
-
-            management_cost = ManagementCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            management_cost.run_module()
-
-            return 0
-        except Exception:
-            traceback.print_exc()
-            return 1  # module did not run successfully
+        """
+        Runs all the cost modules for one project.
+
+        If a module fails, or the calculations in this method fail, a
+        failure record is appended to the list under the 'failures' key of
+        the output dictionary (see failure_record() below) and no further
+        modules are run, because later calculations depend on the results
+        of earlier ones.
+
+        Parameters
+        ----------
+        project_name : str
+            The Project ID with serial of the project being run.
+
+        Returns
+        -------
+        int
+            0 if all modules ran successfully, 1 if there was a failure.
+        """
+        with StageTimer.stage(project_name, 'Manager.execute_landbosse'):
+            self.output_dict['failures'] = []
+            start = time.perf_counter()
+            try:
+                # Create weather window that will be used for all tasks (window for entire project; selected to restrict to seasons and hours specified)
+                weather_data_user_input = self.input_dict['weather_window']
+                season_construct = self.input_dict['season_construct']
+                time_construct = self.input_dict['time_construct']
+                daily_operational_hours = self.input_dict['hour_day'][time_construct]
+
+                # Filtered window. Restrict to the seasons and hours specified.
+                with StageTimer.stage(project_name, 'Manager weather window filtering'):
+                    filtered_weather_window = weather_data_user_input.loc[(weather_data_user_input['Season'].isin(season_construct)) & (weather_data_user_input['Time window'] == time_construct)]
+                    filtered_weather_window = filtered_weather_window[0:(math.ceil(self.input_dict['construct_duration'] * 30 * daily_operational_hours))]
+
+                # Rename weather data to specify types
+                self.input_dict['weather_window'] = filtered_weather_window
+                self.input_dict['weather_data_user_input'] = weather_data_user_input
+
+                # FoundationCost, SitePreparationCost and ArraySystem all use
+                # the operational hours per day. It is set here, rather than
+                # by the first module to need it, so the modules do not
+                # depend on each other.
+                self.input_dict['operational_hrs_per_day'] = daily_operational_hours
+
+                # FoundationCost, SitePreparationCost and CollectionCost look
+                # up the rsmeans rows of their modules in this index, which is
+                # built once per project. See RsMeansIndex.
+                self.input_dict['rsmeans_index'] = RsMeansIndex(self.input_dict['rsmeans'])
+
+                # The crew rates are joined from the crew and crew_price
+                # sheets once per project. See CrewRates.
+                self.input_dict['crew_rates'] = CrewRates(self.input_dict['crew'], self.input_dict['crew_cost'])
+
+                # The cost modules read how many detail rows to make from
+                # the input dictionary. See CostModule.detail_level().
+                self.input_dict['detail_level'] = self.detail_level
+                self.input_dict['detail_modules'] = self.detail_modules
+
+                if self.run_cost_module_graph(project_name) != 0:
+                    return 1  # module did not run successfully
+
+                return self.run_management_cost(project_name)
+            except Exception as error:
+                traceback.print_exc()
+                elapsed_seconds = time.perf_counter() - start
+                self.output_dict['failures'].append(self.failure_record(project_name, 'Manager', error, elapsed_seconds))
+                return 1  # module did not run successfully
+
+    def recompute(self, project_name, changed_inputs):
+        """
+        Runs a project again after some of its inputs have changed, running
+        only the cost modules that read those inputs, the modules that
+        depend on them, the project totals and ManagementCost.
+
+        The input and output dictionaries given to this Manager must be
+        those of a previous run of execute_landbosse() on the project, with
+        the changed values already set in the input dictionary. The output
+        dictionary records which inputs each module read in that run,
+        under 'module_input_reads', and the outputs of each module, under
+        'module_outputs'.
+
+        If the previous run failed, or the changed inputs include any that
+        select the weather window, the whole project is run again with
+        execute_landbosse().
+
+        Parameters
+        ----------
+        project_name : str
+            The Project ID with serial of the project being run.
+
+        changed_inputs : iterable
+            The keys of the input dictionary whose values changed. A
+            changed sheet of the project data is given as a tuple of
+            'project_data' and the sheet name, such as
+            ('project_data', 'crane_specs').
+
+        Returns
+        -------
+        int
+            0 if all modules ran successfully, 1 if there was a failure.
+        """
+        changed_inputs = set(changed_inputs)
+        previous_reads = self.output_dict.get('module_input_reads')
+        previous_run_failed = len(self.output_dict.get('failures', [])) > 0 or previous_reads is None
+        if previous_run_failed or len(changed_inputs & self.weather_window_inputs) > 0:
+            # execute_landbosse() replaces the weather window with the
+            # filtered window, so start over from the window the user gave.
+            if 'weather_window' not in changed_inputs and 'weather_data_user_input' in self.input_dict:
+                self.input_dict['weather_window'] = self.input_dict['weather_data_user_input']
+            return self.execute_landbosse(project_name)
+
+        # The rsmeans index and crew rates are built from project data
+        # sheets, so they change with them.
+        if 'rsmeans' in changed_inputs:
+            self.input_dict['rsmeans_index'] = RsMeansIndex(self.input_dict['rsmeans'])
+            changed_inputs.add('rsmeans_index')
+        if len(changed_inputs & self.crew_rate_inputs) > 0:
+            self.input_dict['crew_rates'] = CrewRates(self.input_dict['crew'], self.input_dict['crew_cost'])
+            changed_inputs.add('crew_rates')
+
+        # A module reruns if it read a changed input or needs the outputs of
+        # a module that reruns.
+        rerun = set()
+        for cost_module, dependencies in self.cost_module_dependencies.items():
+            reads = previous_reads.get(cost_module.__name__)
+            if reads is None or len(reads & changed_inputs) > 0 or any(dependency in rerun for dependency in dependencies):
+                rerun.add(cost_module)
+
+        with StageTimer.stage(project_name, 'Manager.recompute'):
+            self.output_dict['failures'] = []
+            start = time.perf_counter()
+            try:
+                if self.run_cost_module_graph(project_name, rerun) != 0:
+                    return 1  # module did not run successfully
+
+                return self.run_management_cost(project_name)
+            except Exception as error:
+                traceback.print_exc()
+                elapsed_seconds = time.perf_counter() - start
+                self.output_dict['failures'].append(self.failure_record(project_name, 'Manager', error, elapsed_seconds))
+                return 1  # module did not run successfully
+
+    def run_management_cost(self, project_name):
+        """
+        Calculates the project totals from the outputs of the other cost
+        modules and runs ManagementCost on them.
+
+        Parameters
+        ----------
+        project_name : str
+            The Project ID with serial of the project being run.
+
+        Returns
+        -------
+        int
+            0 if ManagementCost ran successfully, 1 if it failed.
+        """
+        erection_cost_output_dict = dict()
+        self.output_dict['erection_cost'] = erection_cost_output_dict
+
+        self.output_dict['actual_construction_months'] = self.output_dict['siteprep_construction_months'] + \
+                                                         max(self.output_dict['erection_construction_months'],
+                                                         self.output_dict['foundation_construction_months'],
+                                                         self.output_dict['collection_construction_months']) + 1
+
+        if self.output_dict['actual_construction_months'] < self.input_dict['construct_duration']:
+            # The road costs are copied so that the output of
+            # SitePreparationCost is unchanged if the totals are calculated
+            # again by recompute().
+            road_cost = self.output_dict['total_road_cost'].copy()
+            index = road_cost['Type of cost'] == 'Other'
+            other = road_cost[index]
+            amount_shorter_than_input_construction_time = (self.input_dict['construct_duration'] - self.output_dict['siteprep_construction_months'])
+            road_cost.loc[index, 'Cost USD'] = other['Cost USD'] - amount_shorter_than_input_construction_time * 55500
+            self.output_dict['total_road_cost'] = road_cost
+
+        total_costs = self.output_dict['total_collection_cost']
+        total_costs = total_costs.append(self.output_dict['total_road_cost'], sort=False)
+        total_costs = total_costs.append(self.output_dict['total_transdist_cost'], sort=False)
+        total_costs = total_costs.append(self.output_dict['total_substation_cost'], sort=False)
+        total_costs = total_costs.append(self.output_dict['total_foundation_cost'], sort=False)
+        total_costs = total_costs.append(self.output_dict['total_erection_cost'], sort=False)
+        total_costs = total_costs.append(self.output_dict['total_development_cost'], sort=False)
+
+        self.input_dict['project_value_usd'] = total_costs.sum(numeric_only=True)[0]
+        self.input_dict['foundation_cost_usd'] = self.output_dict['total_foundation_cost'].sum(numeric_only=True)[0]
+
+        return self.run_cost_module(ManagementCost, project_name)
+
+    def run_cost_module_graph(self, project_name, cost_modules=None):
+        """
+        Runs the cost modules in cost_module_dependencies. Each module is
+        started when the modules it needs have finished. If a module fails,
+        no more modules are started, the modules already running are
+        allowed to finish and the failures are recorded in the order of
+        cost_module_dependencies.
+
+        The inputs each module reads are recorded under
+        'module_input_reads' in the output dictionary and the outputs of
+        each module under 'module_outputs', both keyed by the name of the
+        module. recompute() uses them to run only some of the modules.
+
+        Parameters
+        ----------
+        project_name : str
+            The Project ID with serial of the project being run.
+
+        cost_modules : set
+            The cost modules to run. The outputs of the other modules are
+            kept from the previous run. If None, all modules are run.
+
+        Returns
+        -------
+        int
+            0 if all the modules ran successfully, 1 if any failed.
+        """
+        if cost_modules is None:
+            cost_modules = set(self.cost_module_dependencies)
+        module_input_reads = self.output_dict.setdefault('module_input_reads', dict())
+        module_outputs = self.output_dict.setdefault('module_outputs', dict())
+        previous_outputs = {cost_module: module_outputs.get(cost_module.__name__, dict()) for cost_module in cost_modules}
+        module_output_dicts = {cost_module: dict() for cost_module in cost_modules}
+        module_failures = dict()
+        finished = set(self.cost_module_dependencies) - cost_modules
+
+        def ready_modules(started):
+            return [cost_module for cost_module, dependencies in self.cost_module_dependencies.items()
+                    if cost_module not in started and all(dependency in finished for dependency in dependencies)]
+
+        def run(cost_module):
+            failures = []
+            input_dict = TrackedInputDict(self.input_dict)
+            status = self.run_cost_module(cost_module, project_name, module_output_dicts[cost_module], failures,
+                                          input_dict)
+            module_input_reads[cost_module.__name__] = input_dict.reads
+            return cost_module, status, failures
+
+        started = set(finished)
+        if self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                running = set()
+                while True:
+                    if not module_failures:
+                        for cost_module in ready_modules(started):
+                            started.add(cost_module)
+                            running.add(executor.submit(run, cost_module))
+                    if not running:
+                        break
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        cost_module, status, failures = future.result()
+                        if status == 0:
+                            finished.add(cost_module)
+                        else:
+                            module_failures[cost_module] = failures
+        else:
+            while not module_failures:
+                ready = ready_modules(started)
+                if not ready:
+                    break
+                cost_module, status, failures = run(ready[0])
+                started.add(cost_module)
+                if status == 0:
+                    finished.add(cost_module)
+                else:
+                    module_failures[cost_module] = failures
+
+        # Merge the outputs of all the modules in order. Keys that are
+        # already in the output dictionary keep their place in it, so the
+        # rows of the results come out in the same order after recompute().
+        # Previous outputs of the modules that ran which are no longer
+        # written are removed.
+        for cost_module in cost_modules & finished:
+            module_outputs[cost_module.__name__] = module_output_dicts[cost_module]
+        merged_outputs = dict()
+        for cost_module in self.cost_module_dependencies:
+            if cost_module in finished:
+                merged_outputs.update(module_outputs[cost_module.__name__])
+            self.output_dict['failures'].extend(module_failures.get(cost_module, []))
+        for outputs in previous_outputs.values():
+            for key in outputs:
+                if key not in merged_outputs:
+                    self.output_dict.pop(key, None)
+        self.output_dict.update(merged_outputs)
+
+        if module_failures:
+            return 1
+        if len(finished) < len(self.cost_module_dependencies):
+            raise ValueError(f'Cost modules {set(self.cost_module_dependencies) - finished} have circular dependencies')
+        return 0
+
+    def run_cost_module(self, cost_module, project_name, output_dict=None, failures=None, input_dict=None):
+        """
+        Instantiates and runs one cost module. If the module fails, a
+        failure record is appended to the list of failures.
+
+        Parameters
+        ----------
+        cost_module : class
+            The class of the cost module to run, such as FoundationCost.
+
+        project_name : str
+            The Project ID with serial of the project being run.
+
+        output_dict : dict
+            The output dictionary the module writes into. If None, the
+            output dictionary of the project is used.
+
+        failures : list
+            The list the failure record is appended to. If None, the list
+            under the 'failures' key of the project's output dictionary is
+            used.
+
+        input_dict : dict
+            The input dictionary the module reads. If None, the input
+            dictionary of the project is used.
+
+        Returns
+        -------
+        int
+            0 if the module ran successfully, 1 if it failed.
+        """
+        input_dict = self.input_dict if input_dict is None else input_dict
+        output_dict = self.output_dict if output_dict is None else output_dict
+        failures = self.output_dict['failures'] if failures is None else failures
+        start = time.perf_counter()
+        module = cost_module(input_dict=input_dict, output_dict=output_dict, project_name=project_name)
+        # Modules can run in several threads at once, so each is timed with
+        # the CPU time of its own thread.
+        with StageTimer.stage(project_name, f'{cost_module.__name__}.run_module', per_thread=True):
+            status, error = module.run_module()
+        if status != 0:
+            elapsed_seconds = time.perf_counter() - start
+            failures.append(self.failure_record(project_name, cost_module.__name__, error, elapsed_seconds))
+        return status
+
+    @staticmethod
+    def failure_record(project_name, module, error, elapsed_seconds):
+        """
+        Creates a record of a failure that can be written as a row of the
+        failures table.
+
+        Parameters
+        ----------
+        project_name : str
+            The Project ID with serial of the project that failed.
+
+        module : str
+            The name of the module (or other stage) that failed.
+
+        error : Exception
+            The exception that caused the failure.
+
+        elapsed_seconds : float
+            The time spent in the module before it failed.
+
+        Returns
+        -------
+        dict
+            The failure record.
+        """
+        return {
+            'project_id_with_serial': project_name,
+            'module': module,
+            'exception': type(error).__name__,
+            'message': str(error),
+            'elapsed_seconds': elapsed_seconds,
+            'traceback': ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+        }
@@ -0,0 +1,109 @@
+import pandas as pd
+
+
+class RsMeansIndex:
+    """
+    The rows of the rsmeans project data sheet, split by the module they
+    belong to. FoundationCost, SitePreparationCost and CollectionCost each
+    look up the rows of their own module several times per project. Rather
+    than each lookup masking the whole sheet, Manager splits the sheet once
+    per project and puts this index in the master input dictionary under
+    'rsmeans_index'.
+
+    Two lookups are provided:
+
+    rows(module)
+        The rows whose Module is the given module, as
+        rsmeans[rsmeans['Module'] == module] would return them.
+
+    operations(module)
+        The rows of the module that have data, as
+        rsmeans.where(rsmeans['Module'] == module).dropna(thresh=4) would
+        return them, including the conversion of integer columns to float
+        that where() makes.
+
+    Both return copies, which the modules are free to modify.
+    """
+
+    def __init__(self, rsmeans):
+        """
+        Parameters
+        ----------
+        rsmeans : pandas.DataFrame
+            The rsmeans sheet, after any labor cost multiplier has been
+            applied to it.
+        """
+        self.rsmeans = rsmeans
+        self._rows = dict()
+        self._operations = dict()
+
+        # where() makes a float copy of integer columns and an object copy
+        # of boolean columns whenever it masks out any rows, because masked
+        # cells become NaN.
+        masked_dtypes = dict()
+        for column, dtype in rsmeans.dtypes.items():
+            if dtype.kind in 'iu':
+                masked_dtypes[column] = 'float64'
+            elif dtype.kind == 'b':
+                masked_dtypes[column] = 'object'
+
+        module_column = rsmeans['Module'].values
+        for module in pd.unique(rsmeans['Module'].dropna()):
+            rows = rsmeans[module_column == module]
+            self._rows[module] = rows
+            if len(masked_dtypes) > 0 and len(rows) < len(rsmeans):
+                rows = rows.astype(masked_dtypes)
+            self._operations[module] = rows.dropna(thresh=4)
+
+    @classmethod
+    def for_input_dict(cls, input_dict):
+        """
+        Returns the index in an input dictionary, or a new index of its
+        rsmeans sheet if Manager has not put one there, as when a cost
+        module is run on its own.
+
+        Parameters
+        ----------
+        input_dict : dict
+            The input dictionary of a cost module.
+
+        Returns
+        -------
+        RsMeansIndex
+            The index.
+        """
+        index = input_dict.get('rsmeans_index')
+        return index if index is not None else cls(input_dict['rsmeans'])
+
+    def rows(self, module):
+        """
+        Parameters
+        ----------
+        module : str
+            The value of the Module column, such as 'Foundations'.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The rows of the module. Empty if the module has none.
+        """
+        if module not in self._rows:
+            return self.rsmeans.iloc[0:0].copy()
+        return self._rows[module].copy()
+
+    def operations(self, module):
+        """
+        Parameters
+        ----------
+        module : str
+            The value of the Module column, such as 'Foundations'.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The rows of the module with at least four values. Empty if the
+            module has none.
+        """
+        if module not in self._operations:
+            return self.rsmeans.where(self.rsmeans['Module'] == module).dropna(thresh=4)
+        return self._operations[module].copy()
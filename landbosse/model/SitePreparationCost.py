@@ -4,6 +4,8 @@ import math
 from .WeatherDelay import WeatherDelay as WD
 import traceback
 from .CostModule import CostModule
+from .RsMeansIndex import RsMeansIndex
+from .CrewRates import CrewRates
 
 
 class SitePreparationCost(CostModule):
@@ -278,7 +280,7 @@ class SitePreparationCost(CostModule):
             - Cost of labor and equipment rental prior to weather delays
 
         """
-        throughput_operations = estimate_construction_time_input['rsmeans']
+        rsmeans_index = RsMeansIndex.for_input_dict(estimate_construction_time_input)
 
         #TODO: Figure out where 'construct_duration' gets read in.
         estimate_construction_time_output['road_construction_time'] = estimate_construction_time_input[
@@ -287,10 +289,9 @@ class SitePreparationCost(CostModule):
         # Main switch between small DW wind and (utility scale + distributed wind)
         # select operations for roads module that have data
         if estimate_construction_time_input['turbine_rating_MW'] >= 0.1:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Roads').dropna(thresh=4)
+            operation_data = rsmeans_index.operations('Roads')
         else:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Small DW Roads').dropna(
-                thresh=4)
+            operation_data = rsmeans_index.operations('Small DW Roads')
             operation_data = operation_data.dropna(subset=['Units'])
 
         # create list of unique material units for operations
@@ -383,20 +384,9 @@ class SitePreparationCost(CostModule):
 
         # pull out management data
         if estimate_construction_time_input['turbine_rating_MW'] >= 0.1:
-            crew_cost = self.input_dict['crew_cost']
-            crew = self.input_dict['crew'][self.input_dict['crew']['Crew type ID'].str.contains('M0')]
-            management_crew = pd.merge(crew_cost, crew, on=['Labor type ID'])
-            management_crew = management_crew.assign(per_diem_total=
-                                                     management_crew['Per diem USD per day'] *
-                                                     management_crew['Number of workers'] *
-                                                     num_days)
-            management_crew = management_crew.assign(hourly_costs_total=
-                                                     management_crew['Hourly rate USD per hour'] *
-                                                     self.input_dict['hour_day'][self.input_dict['time_construct']] *
-                                                     num_days)
-            management_crew = management_crew.assign(total_crew_cost_before_wind_delay=
-                                                     management_crew['per_diem_total'] +
-                                                     management_crew['hourly_costs_total'])
+            crew_rates = CrewRates.for_input_dict(self.input_dict)
+            management_crew = crew_rates.management_crew_cost(num_days,
+                                                              self.input_dict['hour_day'][self.input_dict['time_construct']])
             self.output_dict['management_crew'] = management_crew
 
             self.output_dict['managament_crew_cost_before_wind_delay'] = management_crew[
@@ -477,7 +467,7 @@ class SitePreparationCost(CostModule):
         """
         rsmeans = calculate_cost_input_dict['rsmeans']
 
-        material_name = rsmeans['Material type ID'].where(rsmeans['Module'] == 'Roads').dropna().unique()
+        material_name = RsMeansIndex.for_input_dict(calculate_cost_input_dict).rows('Roads')['Material type ID'].dropna().unique()
 
         material_vol = pd.DataFrame(
             [[material_name[0], calculate_cost_output_dict['material_volume_cubic_yards'], 'Loose cubic yard']],
@@ -699,6 +689,7 @@ class SitePreparationCost(CostModule):
             A list of dicts, with each dict representing a row of the data.
         """
         result = []
+        full = self.detail_level() == 'full'
         module = type(self).__name__
 
         # Note that some values are cast with float() so that XlsxWriter
@@ -787,15 +778,16 @@ class SitePreparationCost(CostModule):
                 'value': float(self.output_dict['rough_grading_area'])
             })
 
-        for row in self.output_dict['total_road_cost'].itertuples():
-            dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
+        if full:
+            for row in self.output_dict['total_road_cost'].itertuples():
+                dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
+                    'value': dashed_row,
+                    'last_number': row[2]
+                })
 
 
 
@@ -869,7 +861,8 @@ class SitePreparationCost(CostModule):
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             # self.outputs_for_module_type_operation(self.input_dict, self.output_dict)
             self.output_dict['siteprep_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_road_cost'],
@@ -0,0 +1,200 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # The resource module is not available on Windows.
+    resource = None
+
+
+class StageTimer:
+    """
+    This class does not need to be instantiated. Like XlsxDataframeCache,
+    its state is held in class attributes so that every part of the code
+    running in a process records into the same place.
+
+    StageTimer measures where the time goes in a LandBOSSE run. Code that
+    should be measured is wrapped in a stage:
+
+    with StageTimer.stage(project_id_with_serial, 'FoundationCost.run_module'):
+        ...
+
+    For each stage, the wall time, CPU time and peak resident set size of
+    the process are recorded. The CPU time is that of the whole process,
+    including other threads running at the same time, unless the stage is
+    timed per thread. The stages of the cost modules are timed per thread,
+    because with --module-threads greater than 1 several modules run at
+    once. Timing is off by default, and stage() does
+    nothing but yield until enable() has been called, so the overhead is
+    negligible when timing is not wanted.
+
+    Records accumulate in the process where the stages ran. When projects
+    run in worker processes, each worker drains its records with
+    drain_records() and returns them along with the project results, so
+    that records from all workers can be aggregated with summarize().
+    """
+
+    # _enabled turns the recording of stages on and off.
+    _enabled = False
+
+    # _records holds the records of the stages that have finished in this
+    # process and have not been drained yet.
+    _records = []
+
+    @classmethod
+    def enable(cls, enabled=True):
+        """
+        Turns timing on or off for this process.
+
+        Parameters
+        ----------
+        enabled : bool
+            True to record stages, False to stop recording them.
+        """
+        cls._enabled = enabled
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        Returns
+        -------
+        bool
+            True if stages are being recorded.
+        """
+        return cls._enabled
+
+    @classmethod
+    @contextmanager
+    def stage(cls, project_id_with_serial, stage, per_thread=False):
+        """
+        A context manager that records the time spent in the block it
+        wraps. The record is made even if the block raises an exception.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The project the stage is for. Stages that are not for a single
+            project, such as writing the output files, use '(all projects)'.
+
+        stage : str
+            The name of the stage, such as 'FoundationCost.run_module'.
+
+        per_thread : bool
+            True to record the CPU time of the calling thread only, for
+            stages that run alongside other stages in other threads. False
+            to record the CPU time of the whole process.
+        """
+        if not cls._enabled:
+            yield
+            return
+
+        cpu_time = time.thread_time if per_thread else time.process_time
+        wall_start = time.perf_counter()
+        cpu_start = cpu_time()
+        try:
+            yield
+        finally:
+            cls._records.append({
+                'project_id_with_serial': project_id_with_serial,
+                'stage': stage,
+                'wall_seconds': time.perf_counter() - wall_start,
+                'cpu_seconds': cpu_time() - cpu_start,
+                'peak_rss_mb': cls.peak_rss_mb(),
+                'pid': os.getpid(),
+            })
+
+    @staticmethod
+    def peak_rss_mb():
+        """
+        Returns the peak resident set size of this process so far. This is
+        a high water mark for the whole process, not the memory used by a
+        single stage.
+
+        Returns
+        -------
+        float
+            Peak resident set size in megabytes, or NaN where it cannot be
+            measured.
+        """
+        if resource is None:
+            return float('nan')
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux.
+        if sys.platform == 'darwin':
+            return max_rss / 1024 / 1024
+        return max_rss / 1024
+
+    @classmethod
+    def drain_records(cls):
+        """
+        Removes and returns the records made so far in this process.
+
+        Returns
+        -------
+        list
+            List of dictionaries, one for each stage that finished.
+        """
+        records = cls._records
+        cls._records = []
+        return records
+
+    @staticmethod
+    def create_timings_dataframe(records):
+        """
+        Makes a table with one row per stage per project.
+
+        Parameters
+        ----------
+        records : list
+            Records from drain_records(), possibly from many processes.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The timing table.
+        """
+        # pandas is imported here so that importing StageTimer, which the
+        # runners do at startup, stays cheap.
+        import pandas as pd
+        timings = pd.DataFrame(records, columns=[
+            'project_id_with_serial', 'stage', 'wall_seconds', 'cpu_seconds', 'peak_rss_mb', 'pid'
+        ])
+        return timings.rename(columns={
+            'project_id_with_serial': 'Project ID with serial',
+            'stage': 'Stage',
+            'wall_seconds': 'Wall time s',
+            'cpu_seconds': 'CPU time s',
+            'peak_rss_mb': 'Peak RSS MB',
+            'pid': 'Process ID',
+        })
+
+    @classmethod
+    def summarize(cls, records):
+        """
+        Aggregates the records of every project and every worker process
+        into one row per stage, sorted so that the stages that took the
+        most total wall time come first.
+
+        Parameters
+        ----------
+        records : list
+            Records from drain_records(), possibly from many processes.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The summary table.
+        """
+        timings = cls.create_timings_dataframe(records)
+        summary = timings.groupby('Stage').agg(**{
+            'Count': ('Wall time s', 'count'),
+            'Total wall time s': ('Wall time s', 'sum'),
+            'Mean wall time s': ('Wall time s', 'mean'),
+            'Max wall time s': ('Wall time s', 'max'),
+            'Total CPU time s': ('CPU time s', 'sum'),
+            'Max peak RSS MB': ('Peak RSS MB', 'max'),
+        })
+        return summary.sort_values('Total wall time s', ascending=False).reset_index()
@@ -103,17 +103,19 @@ class SubstationCost(CostModule):
             A list of dicts, with each dict representing a row of the data.
         """
         result = []
+        full = self.detail_level() == 'full'
         module = type(self).__name__
 
-        for row in self.output_dict['substation_cost_output_df'].itertuples():
-            dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
+        if full:
+            for row in self.output_dict['substation_cost_output_df'].itertuples():
+                dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
+                result.append({
+                    'unit': '',
+                    'type': 'dataframe',
+                    'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
+                    'value': dashed_row,
+                    'last_number': row[2]
+                })
 
         for _dict in result:
             _dict['project_id_with_serial'] = self.project_name
@@ -142,7 +144,8 @@ class SubstationCost(CostModule):
         """
         try:
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             # self.outputs_for_module_type_operation(self.input_dict, self.output_dict)
             self.output_dict['substation_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['substation_cost_output_df'],
@@ -0,0 +1,69 @@
+from collections.abc import MutableMapping
+
+
+class TrackedInputDict(MutableMapping):
+    """
+    A view of an input dictionary that records which keys are read through
+    it. Manager gives each cost module its own view of the master input
+    dictionary, so that after a run it knows which inputs each module
+    depends on. When inputs change, only the modules that read them need
+    to run again. See Manager.recompute().
+
+    Reads and writes go through to the underlying dictionary. Looking up a
+    key with [], get() or in counts as a read. So does reading a key while
+    iterating over the items, but iterating over the keys alone does not,
+    because modules iterate over the keys to pick out the few they need.
+
+    Values that are themselves dictionaries of dataframes, such as the
+    'project_data' sheets read by ErectionCost, are returned as views too.
+    A read of a sheet is recorded as a tuple of the key and the sheet name,
+    such as ('project_data', 'crane_specs'), as well as a read of the key.
+    """
+
+    # Keys whose values are dictionaries of sheets. Reads of each sheet
+    # are recorded separately.
+    nested_keys = {'project_data'}
+
+    def __init__(self, data, reads=None, prefix=None):
+        """
+        Parameters
+        ----------
+        data : dict
+            The dictionary to view.
+
+        reads : set
+            The set that reads are recorded in. A new set if None.
+
+        prefix : str
+            If this is a view of a nested dictionary, the key of that
+            dictionary in the master input dictionary.
+        """
+        self.data = data
+        self.reads = set() if reads is None else reads
+        self.prefix = prefix
+
+    def _record(self, key):
+        self.reads.add(key if self.prefix is None else (self.prefix, key))
+
+    def __getitem__(self, key):
+        self._record(key)
+        value = self.data[key]
+        if self.prefix is None and key in self.nested_keys and isinstance(value, dict):
+            return TrackedInputDict(value, self.reads, prefix=key)
+        return value
+
+    def __contains__(self, key):
+        self._record(key)
+        return key in self.data
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+
+    def __delitem__(self, key):
+        del self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
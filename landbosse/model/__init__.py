@@ -1,11 +1,28 @@
-from .ManagementCost import ManagementCost
-from .Manager import Manager
-from .WeatherDelay import WeatherDelay
-from .FoundationCost import FoundationCost
-from .ErectionCost import ErectionCost
-from .SitePreparationCost import SitePreparationCost
-from .SubstationCost import SubstationCost
-from .GridConnectionCost import GridConnectionCost
-from .CollectionCost import Cable, Array, ArraySystem
-from .DevelopmentCost import DevelopmentCost
-from .DefaultMasterInputDict import DefaultMasterInputDict
+from ..lazy import lazy_exports
+
+# The classes and functions exported by this package and the modules that
+# define them. Each module is imported the first time one of its names is
+# used. See landbosse/lazy.py.
+lazy_exports(__name__, {
+    'ManagementCost': 'ManagementCost',
+    'Manager': 'Manager',
+    'WeatherDelay': 'WeatherDelay',
+    'FoundationCost': 'FoundationCost',
+    'ErectionCost': 'ErectionCost',
+    'SitePreparationCost': 'SitePreparationCost',
+    'SubstationCost': 'SubstationCost',
+    'GridConnectionCost': 'GridConnectionCost',
+    'Cable': 'CollectionCost',
+    'Array': 'CollectionCost',
+    'ArraySystem': 'CollectionCost',
+    'DevelopmentCost': 'DevelopmentCost',
+    'DefaultMasterInputDict': 'DefaultMasterInputDict',
+    'StageTimer': 'StageTimer',
+    'BatchClosedFormCost': 'BatchClosedFormCost',
+    'foundation_loads': 'FoundationSizing',
+    'size_foundations': 'FoundationSizing',
+    'LruCache': 'LruCache',
+    'TrackedInputDict': 'TrackedInputDict',
+    'RsMeansIndex': 'RsMeansIndex',
+    'CrewRates': 'CrewRates',
+})
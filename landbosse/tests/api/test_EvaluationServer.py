@@ -0,0 +1,136 @@
+import io
+import json
+import os
+import signal
+from unittest import TestCase
+from unittest.mock import patch
+
+import pandas as pd
+
+from landbosse.api.EvaluationServer import EvaluationServer, METHOD_NOT_FOUND, PARSE_ERROR, INVALID_PARAMS, \
+    INTERNAL_ERROR
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'project_input_template')
+
+
+class TestEvaluationServer(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Starts one server without worker processes for all the tests.
+        """
+        cls.server = EvaluationServer(TEMPLATE_DIR, workers=0)
+        project_list = pd.read_excel(os.path.join(TEMPLATE_DIR, 'project_list.xlsx'))
+        cls.project = json.loads(project_list.iloc[[0]].to_json(orient='records'))[0]
+
+    def serve(self, *requests):
+        """
+        Sends requests to the server and returns the responses.
+        """
+        instream = io.StringIO(''.join(
+            (request if isinstance(request, str) else json.dumps(request)) + '\n' for request in requests))
+        outstream = io.StringIO()
+        self.server.serve(instream, outstream)
+        return [json.loads(line) for line in outstream.getvalue().splitlines()]
+
+    def test_evaluate(self):
+        """
+        A batch of projects is evaluated and each gets its costs.
+        """
+        responses = self.serve({'jsonrpc': '2.0', 'id': 1, 'method': 'evaluate',
+                                'params': {'projects': [self.project, self.project], 'details': True}})
+        self.assertEqual(responses[0]['id'], 1)
+        results = responses[0]['result']
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertEqual(result['project_id_with_serial'], self.project['Project ID'])
+            self.assertEqual(result['failures'], [])
+            self.assertGreater(len(result['costs']), 0)
+            self.assertGreater(len(result['details']), 0)
+        self.assertEqual(results[0]['costs'], results[1]['costs'])
+
+    def test_strict_json(self):
+        """
+        Responses with details are strict JSON. The missing values of the
+        details are null, not NaN.
+        """
+        request = {'jsonrpc': '2.0', 'id': 6, 'method': 'evaluate',
+                   'params': {'projects': [self.project], 'details': True}}
+        instream = io.StringIO(json.dumps(request) + '\n')
+        outstream = io.StringIO()
+        self.server.serve(instream, outstream)
+
+        def reject(constant):
+            raise ValueError(f'{constant} is not valid JSON')
+
+        response = json.loads(outstream.getvalue(), parse_constant=reject)
+        details = response['result'][0]['details']
+        self.assertGreater(len(details), 0)
+        self.assertTrue(any(row['Non-numeric value'] is None for row in details))
+
+    def test_errors(self):
+        """
+        Bad requests get JSON-RPC errors and notifications get no response.
+        """
+        responses = self.serve(
+            'not json',
+            {'jsonrpc': '2.0', 'id': 2, 'method': 'missing'},
+            {'jsonrpc': '2.0', 'id': 3, 'method': 'evaluate', 'params': {'projects': [{'Project ID': 'a'}]}},
+            {'jsonrpc': '2.0', 'method': 'preload', 'params': {'project_data_file': 'ge15_public'}},
+        )
+        self.assertEqual([response['error']['code'] for response in responses],
+                         [PARSE_ERROR, METHOD_NOT_FOUND, INVALID_PARAMS])
+
+    def test_unknown_params(self):
+        """
+        Parameters that the method does not take are invalid.
+        """
+        responses = self.serve({'jsonrpc': '2.0', 'id': 7, 'method': 'preload', 'params': {'file': 'ge15_public'}})
+        self.assertEqual(responses[0]['error']['code'], INVALID_PARAMS)
+
+        # A TypeError raised inside a method is not caused by the
+        # parameters.
+        with patch.object(self.server, 'preload', side_effect=TypeError('inside the method')):
+            responses = self.serve({'jsonrpc': '2.0', 'id': 8, 'method': 'preload',
+                                    'params': {'project_data_file': 'ge15_public'}})
+        self.assertEqual(responses[0]['error']['code'], INTERNAL_ERROR)
+
+    def test_missing_project_data_file(self):
+        """
+        A project whose project data file does not exist fails on its own
+        and the rest of the batch still gets its costs.
+        """
+        missing = dict(self.project, **{'Project data file': 'missing', 'Project ID': 'missing project'})
+        responses = self.serve({'jsonrpc': '2.0', 'id': 4, 'method': 'evaluate',
+                                'params': {'projects': [missing, self.project]}})
+        results = responses[0]['result']
+        self.assertEqual(results[0]['project_id_with_serial'], 'missing project')
+        self.assertEqual(results[0]['costs'], [])
+        self.assertEqual([failure['module'] for failure in results[0]['failures']], ['XlsxReader'])
+        self.assertEqual(results[0]['failures'][0]['exception'], 'FileNotFoundError')
+        self.assertEqual(results[1]['failures'], [])
+        self.assertGreater(len(results[1]['costs']), 0)
+
+
+class TestEvaluationServerWorkers(TestCase):
+    def test_dead_worker(self):
+        """
+        A batch during which a worker process dies fails, and the worker
+        processes are restarted for the next batch.
+        """
+        server = EvaluationServer(TEMPLATE_DIR, workers=1)
+        try:
+            project_list = pd.read_excel(os.path.join(TEMPLATE_DIR, 'project_list.xlsx'))
+            project = json.loads(project_list.iloc[[0]].to_json(orient='records'))[0]
+            self.assertEqual(len(server.evaluate([project, project])), 2)
+
+            for process in list(server.executor._processes.values()):
+                os.kill(process.pid, signal.SIGKILL)
+            request = json.dumps({'jsonrpc': '2.0', 'id': 5, 'method': 'evaluate',
+                                  'params': {'projects': [project, project]}})
+            self.assertEqual(server.handle(request)['error']['code'], INTERNAL_ERROR)
+
+            results = server.evaluate([project, project])
+            self.assertEqual([result['failures'] for result in results], [[], []])
+        finally:
+            server.close()
@@ -0,0 +1,102 @@
+import os
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.api import InMemoryRunner
+from landbosse.excelio import XlsxDataframeCache
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'project_input_template')
+PROJECT_ID = 'foundation_validation_ge15'
+
+
+class TestInMemoryRunner(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Reads the parameters and project data of a project in the template
+        once for all the tests.
+        """
+        project_list = pd.read_excel(os.path.join(TEMPLATE_DIR, 'project_list.xlsx'))
+        cls.project_parameters = project_list.set_index('Project ID', drop=False).loc[PROJECT_ID]
+        cls.project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(
+            cls.project_parameters['Project data file'],
+            os.path.join(TEMPLATE_DIR, 'project_data')
+        )
+
+    def test_run(self):
+        """
+        A project runs from a dictionary of parameters, every module has
+        costs and the project data sheets are not modified.
+        """
+        crew_price = self.project_data_sheets['crew_price'].copy()
+        parameters = self.project_parameters.to_dict()
+        parameters['Labor cost multiplier'] = 2
+
+        result = InMemoryRunner(self.project_data_sheets).run(parameters)
+
+        self.assertEqual(result['failures'], [])
+        self.assertEqual(result['project_id_with_serial'], PROJECT_ID)
+        self.assertEqual(len(result['costs']['Module'].unique()), 8)
+        self.assertGreater(len(result['details']), 0)
+        pd.testing.assert_frame_equal(self.project_data_sheets['crew_price'], crew_price)
+
+    def test_failure(self):
+        """
+        Missing parameters are reported as a failure instead of raised.
+        """
+        parameters = self.project_parameters.drop('Number of turbines')
+        result = InMemoryRunner(self.project_data_sheets).run(parameters)
+        self.assertEqual(result['failures'][0]['module'], 'XlsxReader')
+        self.assertEqual(len(result['costs']), 0)
+
+    def test_recompute(self):
+        """
+        Recomputing after a change gives the same costs as running the
+        project with the change from the start.
+        """
+        runner = InMemoryRunner(self.project_data_sheets)
+        result = runner.run(self.project_parameters)
+        result['input_dict']['interconnect_voltage_kV'] = 230
+        recomputed = runner.recompute(result, ['interconnect_voltage_kV'])
+
+        parameters = self.project_parameters.copy()
+        parameters['Interconnect Voltage (kV)'] = 230
+        expected = runner.run(parameters)
+
+        pd.testing.assert_frame_equal(recomputed['costs'], expected['costs'])
+
+    def test_detail_levels(self):
+        """
+        Fewer details give the same costs. The summary has fewer rows than
+        the full details, and an allowlist of modules leaves out the
+        details of the other modules.
+        """
+        full = InMemoryRunner(self.project_data_sheets).run(self.project_parameters)
+        summary = InMemoryRunner(self.project_data_sheets, detail_level='summary').run(self.project_parameters)
+        none = InMemoryRunner(self.project_data_sheets, detail_level='none').run(self.project_parameters)
+        erection = InMemoryRunner(self.project_data_sheets, detail_modules=['ErectionCost']).run(self.project_parameters)
+
+        for result in [summary, none, erection]:
+            pd.testing.assert_frame_equal(result['costs'], full['costs'])
+
+        self.assertEqual(len(none['details']), 0)
+        self.assertLess(len(summary['details']), len(full['details']))
+        self.assertTrue(set(summary['details']['Variable name']) < set(full['details']['Variable name']))
+        self.assertIn('total_cost_summed_erection', set(summary['details']['Variable name']))
+        self.assertEqual(set(erection['details']['Module']), {'ErectionCost'})
+        pd.testing.assert_frame_equal(erection['details'].reset_index(drop=True),
+                                      full['details'][full['details']['Module'] == 'ErectionCost'].reset_index(drop=True),
+                                      check_like=True, check_dtype=False)
+
+    def test_recompute_keeps_detail_level(self):
+        """
+        Recomputing a project whose weather window changed runs every
+        module again, at the detail level of the runner.
+        """
+        runner = InMemoryRunner(self.project_data_sheets, detail_level='none')
+        result = runner.run(self.project_parameters)
+        result['input_dict']['construct_duration'] += 1
+        recomputed = runner.recompute(result, ['construct_duration'])
+        self.assertEqual(len(recomputed['details']), 0)
+        self.assertEqual(recomputed['input_dict']['detail_level'], 'none')
@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import BaselineComparison
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestBaselineComparison(TestCase):
+    def setUp(self):
+        """
+        Makes the costs of a baseline and two other projects, one of which
+        has a cost that the baseline does not have.
+        """
+        self.extended_project_list = pd.DataFrame({
+            'Project ID': ['base', 'tall', 'big'],
+            'Project ID with serial': [np.nan, 'tall_1', 'big_1'],
+            'Hub height m': [80, 120, 80],
+            'Number of turbines': [60, 60, 100],
+        })
+        self.costs = pd.DataFrame({
+            'Project ID with serial': ['base', 'base', 'tall_1', 'tall_1', 'big_1'],
+            'Module': ['ErectionCost', 'SubstationCost', 'ErectionCost', 'SubstationCost', 'DevelopmentCost'],
+            'Type of cost': ['Labor', 'Other', 'Labor', 'Other', 'Other'],
+            'Cost per turbine': [10.0, 0.0, 15.0, 2.0, 5.0],
+            'Cost per project': [600.0, 0.0, 900.0, 120.0, 500.0],
+            'Cost per kW': [1.0, 0.0, 1.5, 0.2, 0.5],
+        })
+
+    def test_requires_one_baseline(self):
+        with self.assertRaises(ValueError):
+            BaselineComparison()
+        with self.assertRaises(ValueError):
+            BaselineComparison(baseline_project='base', baseline_filter='`Hub height m` == 80')
+
+    def test_find_baseline(self):
+        """
+        The baseline is found by its Project ID with serial, or its Project
+        ID if it has no serial, or by a filter that matches only it.
+        """
+        comparison = BaselineComparison(baseline_project='base')
+        self.assertEqual(comparison.find_baseline(self.extended_project_list), 'base')
+
+        comparison = BaselineComparison(baseline_filter='`Hub height m` == 80 and `Number of turbines` < 100')
+        self.assertEqual(comparison.find_baseline(self.extended_project_list), 'base')
+
+    def test_baseline_must_match_one_project(self):
+        comparison = BaselineComparison(baseline_filter='`Hub height m` == 80')
+        with self.assertRaises(XlsxOperationException):
+            comparison.find_baseline(self.extended_project_list)
+
+        comparison = BaselineComparison(baseline_project='missing')
+        with self.assertRaises(XlsxOperationException):
+            comparison.find_baseline(self.extended_project_list)
+
+    def test_compare(self):
+        """
+        Costs are compared with the baseline cost of the same module and
+        type of cost. Ratios to zero baseline costs, and costs that the
+        baseline does not have, are missing.
+        """
+        comparison = BaselineComparison(baseline_project='base')
+        comparison.find_baseline(self.extended_project_list)
+        comparison.set_baseline_costs(self.costs)
+        compared = comparison.compare(self.costs)
+
+        self.assertEqual(list(compared['Project ID with serial']), list(self.costs['Project ID with serial']))
+        self.assertTrue((compared['Baseline project ID with serial'] == 'base').all())
+        np.testing.assert_array_equal(compared['Delta cost per project'], [0.0, 0.0, 300.0, 120.0, np.nan])
+        np.testing.assert_array_equal(compared['Ratio cost per turbine'], [1.0, np.nan, 1.5, np.nan, np.nan])
+        np.testing.assert_array_equal(compared['Baseline cost per kW'], [1.0, 0.0, 1.0, 0.0, np.nan])
+
+    def test_compare_in_chunks(self):
+        """
+        Comparing the costs in chunks gives the same rows as comparing them
+        at once.
+        """
+        comparison = BaselineComparison(baseline_project='base')
+        comparison.set_baseline_costs(self.costs)
+        chunks = [comparison.compare(self.costs.iloc[start:start + 2]) for start in range(0, len(self.costs), 2)]
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), comparison.compare(self.costs))
+
+    def test_missing_baseline_costs(self):
+        comparison = BaselineComparison(baseline_project='failed')
+        with self.assertRaises(XlsxOperationException):
+            comparison.set_baseline_costs(self.costs)
@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import LcoeCalculator
+
+
+class TestLcoeCalculator(TestCase):
+    def setUp(self):
+        self.aep = pd.DataFrame({'Rating [kW]': [2300, 1500], 'Rotor Diam [m]': [116, 77],
+                                 'AEP [kWh/yr]': [8e6, 4e6]})
+        self.tcc = pd.DataFrame({'Rating [kW]': [2300, 1500], 'Rotor Diam [m]': [116, 77],
+                                 'TCC [USD/kW]': [1000.0, 900.0]})
+        self.costs = pd.DataFrame({
+            'Project ID with serial': ['b', 'b', 'a', 'c'],
+            'Number of turbines': [10, 10, 2, 5],
+            'Turbine rating MW': [2.3, 2.3, 1.5, 3.0],
+            'Rotor diameter m': [116, 116, 77, 120],
+            'Module': ['ErectionCost', 'FoundationCost', 'ErectionCost', 'ErectionCost'],
+            'Type of cost': ['Labor', 'Materials', 'Labor', 'Labor'],
+            'Cost per project': [1e6, 2e6, 5e5, 1e6],
+        })
+
+    def test_calculate(self):
+        """
+        The BOS Capex of each project is the sum of its costs, and the
+        LCOE follows the formula of post_processing_scripts/lcoe.py.
+        Projects without AEP and TCC have a missing LCOE.
+        """
+        lcoe = LcoeCalculator(self.aep, self.tcc, fcr=0.08, opex_usd_per_kw=50.0).calculate(self.costs)
+
+        self.assertEqual(list(lcoe['Project ID with serial']), ['b', 'a', 'c'])
+        np.testing.assert_array_equal(lcoe['BOS Capex [USD]'], [3e6, 5e5, 1e6])
+
+        capex_b = 3e6 + 1000.0 * 2300 * 10
+        expected_b = (capex_b * 0.08 + 50.0 * 2300 * 10) / (8e6 * 10)
+        capex_a = 5e5 + 900.0 * 1500 * 2
+        expected_a = (capex_a * 0.08 + 50.0 * 1500 * 2) / (4e6 * 2)
+        np.testing.assert_allclose(lcoe['LCOE [USD/kWh]'][:2], [expected_b, expected_a])
+        self.assertTrue(np.isnan(lcoe['LCOE [USD/kWh]'][2]))
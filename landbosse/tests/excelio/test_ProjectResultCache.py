@@ -0,0 +1,67 @@
+from unittest import TestCase
+import tempfile
+
+import pandas as pd
+
+from landbosse.excelio import ProjectResultCache
+
+
+class TestProjectResultCache(TestCase):
+    def setUp(self):
+        """
+        Makes a cache in a temporary directory along with a small set of
+        project parameters and project data sheets to fingerprint.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ProjectResultCache(self.temp_dir.name)
+        self.project_parameters = pd.Series({
+            'Project ID': 'project_1',
+            'Hub height m': 80.0,
+            'Number of turbines': 100,
+        })
+        self.project_data_sheets = {
+            'components': pd.DataFrame({'Component': ['Tower', 'Nacelle'], 'Mass tonne': [150.0, 80.0]}),
+            'crew': pd.DataFrame({'Crew type ID': ['M0'], 'Number of workers': [2]}),
+        }
+        self.output_dict = {
+            'foundation_module_type_operation': [{'raw_cost': 1.0}],
+            'foundation_cost_csv': [{'value': 2.0}],
+            'total_foundation_cost': pd.DataFrame({'Cost USD': [1.0]}),
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_fingerprint_is_stable(self):
+        """
+        The same inputs produce the same fingerprint.
+        """
+        first = self.cache.fingerprint(self.project_parameters, self.project_data_sheets)
+        second = self.cache.fingerprint(self.project_parameters.copy(), dict(self.project_data_sheets))
+        self.assertEqual(first, second)
+
+    def test_fingerprint_changes_with_parameters_and_sheets(self):
+        """
+        Changing a parameter or a single cell in a sheet changes the fingerprint.
+        """
+        original = self.cache.fingerprint(self.project_parameters, self.project_data_sheets)
+
+        modified_parameters = self.project_parameters.copy()
+        modified_parameters['Hub height m'] = 90.0
+        self.assertNotEqual(original, self.cache.fingerprint(modified_parameters, self.project_data_sheets))
+
+        modified_sheets = {name: df.copy() for name, df in self.project_data_sheets.items()}
+        modified_sheets['components'].loc[0, 'Mass tonne'] = 151.0
+        self.assertNotEqual(original, self.cache.fingerprint(self.project_parameters, modified_sheets))
+
+    def test_store_and_load(self):
+        """
+        Only the result rows are stored, and they are read back unchanged.
+        """
+        fingerprint = self.cache.fingerprint(self.project_parameters, self.project_data_sheets)
+        self.assertIsNone(self.cache.load(fingerprint))
+
+        self.cache.store(fingerprint, self.output_dict)
+        loaded = self.cache.load(fingerprint)
+        self.assertEqual(set(loaded.keys()), {'foundation_module_type_operation', 'foundation_cost_csv'})
+        self.assertEqual(loaded['foundation_cost_csv'], [{'value': 2.0}])
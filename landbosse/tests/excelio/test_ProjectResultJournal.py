@@ -0,0 +1,76 @@
+from unittest import TestCase
+import os
+import tempfile
+
+from landbosse.excelio import ProjectResultJournal
+from landbosse.excelio import XlsxManagerRunner
+
+
+class TestProjectResultJournal(TestCase):
+    def setUp(self):
+        """
+        Makes a journal in a temporary output directory.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal = ProjectResultJournal(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_empty_journal(self):
+        """
+        A journal that has not been written to has no completed projects.
+        """
+        self.assertEqual(self.journal.completed_results(), {})
+
+    def test_append_and_read(self):
+        """
+        Appended projects are read back with only their result rows.
+        """
+        self.journal.append('project_1', {'foundation_cost_csv': [{'value': 1.0}], 'other': 'not stored'}, 'abc')
+        self.journal.append('project_2', {'foundation_cost_csv': [{'value': 2.0}]}, 'def')
+
+        completed = ProjectResultJournal(self.temp_dir.name).completed_results()
+        self.assertEqual(list(completed.keys()), ['project_1', 'project_2'])
+        self.assertEqual(completed['project_1'], {'fingerprint': 'abc', 'results': {'foundation_cost_csv': [{'value': 1.0}]}})
+
+    def test_incomplete_last_record_is_ignored(self):
+        """
+        A record cut off by an interrupted run does not hide the records
+        written before it.
+        """
+        self.journal.append('project_1', {'foundation_cost_csv': [{'value': 1.0}]})
+        size_after_first_record = os.path.getsize(self.journal.journal_path)
+        self.journal.append('project_2', {'foundation_cost_csv': [{'value': 2.0}]})
+
+        with open(self.journal.journal_path, 'r+b') as f:
+            f.truncate(size_after_first_record + 10)
+
+        completed = self.journal.completed_results()
+        self.assertEqual(list(completed.keys()), ['project_1'])
+
+        # Records appended after the incomplete one was removed are read.
+        self.journal.append('project_2', {'foundation_cost_csv': [{'value': 2.0}]})
+        completed = self.journal.completed_results()
+        self.assertEqual(list(completed.keys()), ['project_1', 'project_2'])
+
+    def test_remove(self):
+        """
+        Removing the journal deletes its checkpoint directory.
+        """
+        self.journal.append('project_1', {'foundation_cost_csv': [{'value': 1.0}]})
+        self.journal.remove()
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, 'checkpoint')))
+
+    def test_changed_fingerprint_is_calculated_again(self):
+        """
+        A resumed run only reuses the results of projects whose fingerprint
+        has not changed.
+        """
+        self.journal.append('project_1', {'foundation_cost_csv': [{'value': 1.0}]}, 'abc')
+        self.journal.append('project_2', {'foundation_cost_csv': [{'value': 2.0}]}, 'def')
+        completed = self.journal.completed_results()
+        self.assertEqual(XlsxManagerRunner.completed_result(completed, 'project_1', 'abc'),
+                         {'foundation_cost_csv': [{'value': 1.0}]})
+        self.assertIsNone(XlsxManagerRunner.completed_result(completed, 'project_2', 'changed'))
+        self.assertIsNone(XlsxManagerRunner.completed_result(completed, 'project_3', 'ghi'))
@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import ProjectShard
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestProjectShard(TestCase):
+    def setUp(self):
+        self.extended_project_list = pd.DataFrame({
+            'Project ID': ['project'] * 10 + ['plain'],
+            'Project ID with serial': [f'project_{serial}' for serial in range(10)] + [np.nan],
+        })
+
+    def test_parse(self):
+        shard = ProjectShard.parse('3/32', 'hash')
+        self.assertEqual((shard.index, shard.count, shard.by), (3, 32, 'hash'))
+        for invalid in ['3', '3/x', '4/4', '-1/4', '0/0']:
+            with self.assertRaises(XlsxOperationException):
+                ProjectShard.parse(invalid)
+
+    def test_shards_partition_the_projects(self):
+        """
+        Every project is in exactly one shard, however the projects are
+        split, and range shards are contiguous and differ in size by at
+        most one project.
+        """
+        for by in ProjectShard.methods:
+            masks = np.array([ProjectShard(index, 3, by).mask(self.extended_project_list) for index in range(3)])
+            np.testing.assert_array_equal(masks.sum(axis=0), np.ones(11))
+
+        positions = [ProjectShard(index, 3).select(self.extended_project_list).index.tolist() for index in range(3)]
+        self.assertEqual(positions, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10]])
+
+    def test_hash_shards_do_not_depend_on_the_other_projects(self):
+        shard = ProjectShard(1, 4, 'hash')
+        selected = shard.select(self.extended_project_list)
+        reversed_selected = shard.select(self.extended_project_list.iloc[::-1].reset_index(drop=True))
+        self.assertEqual(sorted(selected['Project ID with serial'].fillna('plain')),
+                         sorted(reversed_selected['Project ID with serial'].fillna('plain')))
+
+    def test_project_positions(self):
+        """
+        The manifest has the positions of the projects of the shard in the
+        project list, under their Project ID if they have no serial.
+        """
+        shard = ProjectShard(2, 3)
+        shard.select(self.extended_project_list)
+        self.assertEqual(shard.num_projects_total, 11)
+        self.assertEqual(shard.project_positions, {'project_8': 8, 'project_9': 9, 'plain': 10})
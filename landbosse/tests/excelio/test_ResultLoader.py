@@ -0,0 +1,175 @@
+from unittest import TestCase
+import os
+import sqlite3
+import tempfile
+
+import pandas as pd
+
+from landbosse.excelio import ResultLoader
+from landbosse.excelio import SqliteLoaderBackend
+from landbosse.excelio import PostgresLoaderBackend
+
+
+class RecordingCursor:
+    """
+    Stands in for a psycopg2 cursor. It records the statements it is given
+    and the .csv text of each COPY.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def execute(self, statement, params=None):
+        self.connection.statements.append((statement, params))
+
+    def fetchall(self):
+        return [('ErectionCost',), ('FoundationCost',)]
+
+    def copy_expert(self, statement, buffer):
+        self.connection.statements.append((statement, None))
+        self.connection.copied.append(buffer.read())
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.statements = []
+        self.copied = []
+        self.commits = 0
+
+    def cursor(self):
+        return RecordingCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestResultLoader(TestCase):
+    def setUp(self):
+        """
+        Writes a details .csv file of five rows to a temporary directory.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.details_path = os.path.join(self.temp_dir.name, 'landbosse-details.csv')
+        # The counts of the second chunk are read as floats, because one
+        # of them is missing.
+        with open(self.details_path, 'w') as details_csv:
+            details_csv.write('Project ID with serial,Module,Variable name,Count,Numeric value\n'
+                              'p_1,ErectionCost,a,1,1.5\n'
+                              'p_1,FoundationCost,b,2,\n'
+                              'p_2,ErectionCost,a,3,2.5\n'
+                              'p_3,ErectionCost,a,,3.5\n'
+                              'p_2,FoundationCost,b,5,4.5\n')
+        self.extended_project_list = pd.DataFrame({
+            'Project ID with serial': ['p_1', 'p_2'],
+            'Hub height m': [80, 90],
+        })
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_csv_chunks(self):
+        """
+        The .csv file is read in chunks of at most chunksize rows, joined
+        with the extended project list.
+        """
+        loader = ResultLoader(backend=None, chunksize=2)
+        chunks = list(loader.read_csv_chunks(self.details_path, drop_columns=['Count'],
+                                             right=self.extended_project_list))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1, 1])
+        self.assertNotIn('Count', chunks[0].columns)
+        self.assertEqual(list(pd.concat(chunks)['Hub height m']), [80, 80, 90, 90])
+
+    def test_load_into_sqlite(self):
+        """
+        Every chunk is loaded into SQLite, missing values become NULL and
+        the indexes are made.
+        """
+        connection = sqlite3.connect(':memory:')
+        loader = ResultLoader(SqliteLoaderBackend(connection), chunksize=2)
+        chunks = loader.read_csv_chunks(self.details_path)
+        num_rows = loader.load('landbosse_details', chunks, indexes=[['Module', 'Variable name']],
+                               partition_by='Module')
+
+        self.assertEqual(num_rows, 5)
+        rows = connection.execute('SELECT "Count", "Numeric value" FROM landbosse_details').fetchall()
+        self.assertEqual(rows, [(1, 1.5), (2, None), (3, 2.5), (None, 3.5), (5, 4.5)])
+        indexes = [name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+        self.assertEqual(indexes, ['landbosse_details_module_variable_name'])
+
+    def test_load_replaces_table(self):
+        """
+        Loading a table again replaces its rows.
+        """
+        connection = sqlite3.connect(':memory:')
+        loader = ResultLoader(SqliteLoaderBackend(connection), chunksize=2)
+        loader.load('landbosse_details', loader.read_csv_chunks(self.details_path))
+        loader.load('landbosse_details', loader.read_csv_chunks(self.details_path))
+        self.assertEqual(connection.execute('SELECT COUNT(*) FROM landbosse_details').fetchone(), (5,))
+
+    def test_load_nothing(self):
+        """
+        Without any chunks, no table is made.
+        """
+        connection = sqlite3.connect(':memory:')
+        loader = ResultLoader(SqliteLoaderBackend(connection))
+        self.assertEqual(loader.load('landbosse_details', iter([])), 0)
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM sqlite_master").fetchone(), (0,))
+
+    def test_load_into_postgres_partitioned(self):
+        """
+        A partitioned table is copied into an unpartitioned table chunk by
+        chunk, then moved into a table with a partition per module before
+        it is indexed.
+        """
+        connection = RecordingConnection()
+        loader = ResultLoader(PostgresLoaderBackend(connection), chunksize=2)
+        loader.load('landbosse_details', loader.read_csv_chunks(self.details_path),
+                    indexes=[['Module']], partition_by='Module')
+
+        statements = [statement for statement, _ in connection.statements]
+        self.assertEqual(len(connection.copied), 3)
+        self.assertTrue(all('COPY "landbosse_details_load"' in statement
+                            for statement in statements if statement.startswith('COPY')))
+        self.assertEqual(connection.copied[1], 'p_2,ErectionCost,a,3,2.5\np_3,ErectionCost,a,,3.5\n')
+        self.assertIn('CREATE TABLE "landbosse_details" ("Project ID with serial" TEXT, "Module" TEXT, '
+                      '"Variable name" TEXT, "Count" BIGINT, "Numeric value" DOUBLE PRECISION) '
+                      'PARTITION BY LIST ("Module")', statements)
+        partitions = [params for statement, params in connection.statements if 'PARTITION OF' in statement]
+        self.assertEqual(partitions, [('ErectionCost',), ('FoundationCost',), None])
+        insert = statements.index('INSERT INTO "landbosse_details" SELECT * FROM "landbosse_details_load"')
+        index = statements.index('CREATE INDEX "landbosse_details_module" ON "landbosse_details" ("Module")')
+        self.assertLess(insert, index)
+        self.assertEqual(connection.commits, 1)
+
+    def test_load_with_dtypes(self):
+        """
+        The columns are made with the types they are read with, so a
+        Numeric value that is all numbers in the first chunk and has text
+        in a later one can be copied.
+        """
+        details_path = os.path.join(self.temp_dir.name, 'numeric-first.csv')
+        with open(details_path, 'w') as details_csv:
+            details_csv.write('Project ID with serial,Module,Variable name,Unit,Numeric value,Non-numeric value\n'
+                              'p_1,ErectionCost,a,,1.5,\n'
+                              'p_1,ErectionCost,b,,2.5,\n'
+                              'p_2,DevelopmentCost,c,m,Development,crane\n')
+        connection = RecordingConnection()
+        loader = ResultLoader(PostgresLoaderBackend(connection), chunksize=2)
+        loader.load('landbosse_details', loader.read_csv_chunks(details_path, dtype=ResultLoader.details_dtypes))
+        statements = [statement for statement, _ in connection.statements]
+        self.assertIn('CREATE TABLE "landbosse_details" ("Project ID with serial" TEXT, "Module" TEXT, '
+                      '"Variable name" TEXT, "Unit" TEXT, "Numeric value" TEXT, "Non-numeric value" TEXT)',
+                      statements)
+        self.assertEqual(connection.copied[1], 'p_2,DevelopmentCost,c,m,Development,crane\n')
+
+        connection = sqlite3.connect(':memory:')
+        loader = ResultLoader(SqliteLoaderBackend(connection), chunksize=2)
+        loader.load('landbosse_details', loader.read_csv_chunks(details_path, dtype=ResultLoader.details_dtypes))
+        rows = connection.execute('SELECT "Unit", "Numeric value", "Non-numeric value" FROM landbosse_details')
+        self.assertEqual(rows.fetchall(), [(None, '1.5', None), (None, '2.5', None), ('m', 'Development', 'crane')])
@@ -0,0 +1,82 @@
+import dataclasses
+import os
+import tempfile
+from unittest import TestCase
+
+from landbosse.excelio import RunConfiguration
+from landbosse.excelio import XlsxFileOperations
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestRunConfiguration(TestCase):
+    def test_from_argv(self):
+        """
+        Options on the command line take precedence over the environment
+        variables, which take precedence over the defaults.
+        """
+        environ = {'LANDBOSSE_INPUT_DIR': 'env_input', 'LANDBOSSE_OUTPUT_DIR': 'env_output'}
+        config = RunConfiguration.from_argv(['-o', 'out', '--serial', '--output-formats', 'csv',
+                                             '--module-threads', '2', '--detail-level', 'summary',
+                                             '--detail-modules', 'ErectionCost', 'CollectionCost'], environ)
+        self.assertEqual(config.input_dir, 'env_input')
+        self.assertEqual(config.output_dir, 'out')
+        self.assertFalse(config.parallel)
+        self.assertEqual(config.output_formats, ('csv',))
+        self.assertEqual(config.module_threads, 2)
+        self.assertEqual(config.detail_level, 'summary')
+        self.assertEqual(config.detail_modules, ('ErectionCost', 'CollectionCost'))
+        self.assertIsNone(config.cache_dir)
+
+        self.assertEqual(RunConfiguration.from_environment({}), RunConfiguration())
+
+    def test_baseline(self):
+        """
+        A baseline project and a baseline filter cannot both be given.
+        """
+        config = RunConfiguration.from_argv(['--baseline-filter', '`Hub height m` == 90'], {})
+        self.assertIsNone(config.baseline_project)
+        self.assertEqual(config.baseline_filter, '`Hub height m` == 90')
+        with self.assertRaises(SystemExit):
+            RunConfiguration.from_argv(['--baseline', 'project', '--baseline-filter', '`Hub height m` == 90'], {})
+
+    def test_lcoe(self):
+        """
+        --aep and --tcc must be given together.
+        """
+        config = RunConfiguration.from_argv(['--aep', 'aep.csv', '--tcc', 'tcc.csv', '--fcr', '0.07'], {})
+        self.assertEqual((config.aep_csv, config.tcc_csv, config.fcr, config.opex_usd_per_kw),
+                         ('aep.csv', 'tcc.csv', 0.07, 52.0))
+        with self.assertRaises(XlsxOperationException):
+            RunConfiguration.from_argv(['--aep', 'aep.csv'], {})
+
+    def test_shard(self):
+        config = RunConfiguration.from_argv(['--shard', '2/8', '--shard-by', 'hash'], {})
+        self.assertEqual((config.shard, config.shard_by), ('2/8', 'hash'))
+        with self.assertRaises(XlsxOperationException):
+            RunConfiguration.from_argv(['--shard', '8/8'], {})
+        with self.assertRaises(XlsxOperationException):
+            RunConfiguration.from_argv(['--shard', '0/8', '--validate'], {})
+        with self.assertRaises(XlsxOperationException):
+            RunConfiguration.from_argv(['--shard', '0/8', '--output-formats', 'sqlite'], {})
+
+    def test_immutable(self):
+        config = RunConfiguration()
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.input_dir = 'other'
+
+    def test_validate_and_scaling(self):
+        with self.assertRaises(XlsxOperationException):
+            RunConfiguration.from_argv(['--validate', '--scaling'], {})
+
+    def test_output_dir_is_created_once(self):
+        """
+        The output directory is created on the first call and later calls
+        return the same path.
+        """
+        with tempfile.TemporaryDirectory() as output_dir:
+            file_ops = XlsxFileOperations(RunConfiguration(output_dir=output_dir))
+            path = file_ops.landbosse_output_dir()
+            self.assertTrue(os.path.isdir(path))
+            os.rmdir(path)
+            self.assertEqual(file_ops.landbosse_output_dir(), path)
+            self.assertFalse(os.path.exists(path))
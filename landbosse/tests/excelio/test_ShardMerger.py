@@ -0,0 +1,86 @@
+from unittest import TestCase
+import glob
+import os
+import tempfile
+
+import pandas as pd
+
+from landbosse.excelio import ProjectShard
+from landbosse.excelio import ShardMerger
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestShardMerger(TestCase):
+    def setUp(self):
+        """
+        Writes the outputs of the three hash shards of six projects, as
+        runs with --shard i/3 --shard-by hash would.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.extended_project_list = pd.DataFrame({
+            'Project ID': [f'project_{number}' for number in range(6)],
+            'Project ID with serial': [float('nan')] * 6,
+            'Hub height m': [80, 90, 100, 110, 120, 130],
+        })
+        project_ids = self.extended_project_list['Project ID']
+        self.costs = pd.DataFrame({
+            'Project ID with serial': project_ids.repeat(2).values,
+            'Type of cost': ['Labor', 'Materials'] * 6,
+            'Cost per project': range(12),
+        })
+
+        self.shard_dirs = []
+        for index in range(3):
+            shard = ProjectShard(index, 3, 'hash')
+            projects = shard.select(self.extended_project_list)
+            shard_dir = os.path.join(self.temp_dir.name, f'shard-{index}')
+            os.makedirs(os.path.join(shard_dir, 'calculated_parametric_inputs'))
+            projects.to_csv(os.path.join(shard_dir, 'calculated_parametric_inputs', 'extended_project_list.csv'),
+                            index=False)
+            costs = self.costs[self.costs['Project ID with serial'].isin(projects['Project ID'])]
+            costs.to_csv(os.path.join(shard_dir, 'landbosse-costs.csv'), index=False)
+            costs.iloc[0:0].to_csv(os.path.join(shard_dir, 'landbosse-details.csv'), index=False)
+            shard.write_manifest(shard_dir)
+            self.shard_dirs.append(shard_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_merge(self):
+        """
+        The merged tables have the projects in the order of the project
+        list, as a run of all the projects would.
+        """
+        output_dir = os.path.join(self.temp_dir.name, 'merged')
+        merged_dir = ShardMerger(reversed(self.shard_dirs)).merge(output_dir)
+
+        costs = pd.read_csv(os.path.join(merged_dir, 'landbosse-costs.csv'))
+        pd.testing.assert_frame_equal(costs, self.costs)
+        extended_project_list = pd.read_csv(
+            os.path.join(merged_dir, 'calculated_parametric_inputs', 'extended_project_list.csv'))
+        pd.testing.assert_frame_equal(extended_project_list, self.extended_project_list)
+        self.assertFalse(os.path.exists(os.path.join(merged_dir, 'landbosse-failures.csv')))
+
+    def test_missing_shard(self):
+        with self.assertRaises(XlsxOperationException):
+            ShardMerger(self.shard_dirs[:2]).merge(self.temp_dir.name)
+
+    def test_repeated_shard(self):
+        with self.assertRaises(XlsxOperationException):
+            ShardMerger(self.shard_dirs + self.shard_dirs[:1]).merge(self.temp_dir.name)
+
+    def test_not_a_shard(self):
+        os.remove(os.path.join(self.shard_dirs[0], ProjectShard.manifest_filename))
+        with self.assertRaises(XlsxOperationException):
+            ShardMerger(self.shard_dirs).merge(self.temp_dir.name)
+        self.assertEqual(glob.glob(os.path.join(self.temp_dir.name, 'landbosse-*')), [])
+
+    def test_missing_costs(self):
+        """
+        A shard without costs, as when it was run without csv in its
+        --output-formats, is not merged as if it had none.
+        """
+        os.remove(os.path.join(self.shard_dirs[1], 'landbosse-costs.csv'))
+        with self.assertRaises(XlsxOperationException):
+            ShardMerger(self.shard_dirs).merge(self.temp_dir.name)
+        self.assertEqual(glob.glob(os.path.join(self.temp_dir.name, 'landbosse-*')), [])
@@ -0,0 +1,104 @@
+from unittest import TestCase
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import SqliteResultStore
+
+
+class TestSqliteResultStore(TestCase):
+    def setUp(self):
+        """
+        Writes two projects, their costs and their details to a database
+        in a temporary directory.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'landbosse-results.sqlite')
+
+        projects = pd.DataFrame({
+            'Project ID': ['project', 'project'],
+            'Project ID with serial': ['project_1', None],
+            'Number of turbines': [100, 60],
+            'Turbine rating MW': [1.5, 2.5],
+            'Hub height m': [80.0, 90.0],
+        })
+        costs = pd.DataFrame({
+            'Project ID with serial': ['project_1', 'project_1', 'project'],
+            'Number of turbines': [100, 100, 60],
+            'Turbine rating MW': [1.5, 1.5, 2.5],
+            'Rotor diameter m': [77, 77, 100],
+            'Module': ['ErectionCost', 'FoundationCost', 'ErectionCost'],
+            'Type of cost': ['Labor', 'Materials', 'Labor'],
+            'Cost per turbine': [10.0, 20.0, 30.0],
+            'Cost per project': [1000.0, 2000.0, 1800.0],
+            'Cost per kW': [np.nan, 1.0, 2.0],
+        })
+        details = pd.DataFrame({
+            'Project ID with serial': ['project_1', 'project'],
+            'Module': ['ErectionCost', 'ErectionCost'],
+            'Variable name': ['Total erection time', 'Crane'],
+            'Unit': ['hours', 'n/a'],
+            'Numeric value': [12.5, np.nan],
+            'Non-numeric value': [None, 'Crawler'],
+        })
+
+        with SqliteResultStore(self.path) as store:
+            store.batch_size = 2
+            store.write_projects(projects)
+            store.write_costs(costs)
+            store.write_details(details)
+
+        self.connection = sqlite3.connect(self.path)
+
+    def tearDown(self):
+        self.connection.close()
+        self.temp_dir.cleanup()
+
+    def test_costs_are_joined_with_projects(self):
+        """
+        The landbosse_costs view has every cost with the parameters of its
+        project, including projects stored under their Project ID.
+        """
+        rows = self.connection.execute(
+            'SELECT "Project ID with serial", "Module", "Cost per kW", "Hub height m" '
+            'FROM landbosse_costs ORDER BY 1, 2').fetchall()
+        self.assertEqual(rows, [
+            ('project', 'ErectionCost', 2.0, 90.0),
+            ('project_1', 'ErectionCost', None, 80.0),
+            ('project_1', 'FoundationCost', 1.0, 80.0),
+        ])
+
+    def test_details_are_joined_with_projects(self):
+        """
+        Missing numeric and non-numeric values of the details are NULL.
+        """
+        rows = self.connection.execute(
+            'SELECT "Project ID with serial", "Numeric value", "Non-numeric value", "Number of turbines" '
+            'FROM landbosse_details ORDER BY 1').fetchall()
+        self.assertEqual(rows, [('project', None, 'Crawler', 60), ('project_1', 12.5, None, 100)])
+
+    def test_indexes(self):
+        """
+        The costs and details are indexed by project and by module.
+        """
+        indexes = {name for (name,) in self.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn('costs_project_id_with_serial', indexes)
+        self.assertIn('costs_module_type_of_cost', indexes)
+        self.assertIn('details_project_id_with_serial', indexes)
+        self.assertIn('details_module_variable_name', indexes)
+
+    def test_existing_file_is_replaced(self):
+        """
+        Writing a store again replaces the database rather than adding to
+        it.
+        """
+        self.connection.close()
+        with SqliteResultStore(self.path) as store:
+            store.write_projects(pd.DataFrame({'Project ID': ['other']}))
+        self.connection = sqlite3.connect(self.path)
+        self.assertEqual(self.connection.execute('SELECT COUNT(*) FROM costs').fetchone(), (0,))
+        self.assertEqual(self.connection.execute('SELECT * FROM projects').fetchall(), [('other', 'other')])
@@ -0,0 +1,41 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import RunConfiguration
+from landbosse.excelio import XlsxFileOperations
+from landbosse.excelio import XlsxGenerator
+
+
+def detail_row(index):
+    return {
+        'project_id_with_serial': 'project',
+        'module': 'FoundationCost',
+        'type': 'variable',
+        'variable_df_key_col_name': f'variable {index}',
+        'unit': 'usd',
+        'value': index if index % 2 == 0 else f'text {index}',
+    }
+
+
+class TestXlsxGenerator(TestCase):
+    def test_details_split_across_worksheets(self):
+        """
+        Rows past the row limit of a worksheet are continued on more
+        worksheets, each with the header, and no rows are lost.
+        """
+        rows = [detail_row(index) for index in range(25)]
+        with tempfile.TemporaryDirectory() as output_dir:
+            file_ops = XlsxFileOperations(RunConfiguration(output_dir=output_dir))
+            with XlsxGenerator('output', file_ops, max_rows_per_sheet=11) as xlsx:
+                xlsx.tab_details(rows)
+            sheets = pd.read_excel(os.path.join(file_ops.landbosse_output_dir(), 'output.xlsx'), sheet_name=None)
+
+        self.assertEqual(list(sheets.keys()), ['details', 'details_2', 'details_3'])
+        self.assertEqual([len(sheet) for sheet in sheets.values()], [10, 10, 5])
+        details = pd.concat(sheets.values(), ignore_index=True)
+        self.assertEqual(list(details['name']), [f'variable {index}' for index in range(25)])
+        self.assertEqual(details['Numeric value'][2], 2)
+        self.assertEqual(details['Non-numeric value'][3], 'text 3')
@@ -0,0 +1,108 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import BatchClosedFormCost
+from landbosse.model import SubstationCost
+from landbosse.model import GridConnectionCost
+from landbosse.model import DevelopmentCost
+from landbosse.model import ManagementCost
+
+
+class TestBatchClosedFormCost(TestCase):
+    def setUp(self):
+        """
+        Makes a table of projects that covers both sides of every branch
+        in the scalar modules: utility and distributed substation and
+        grid connection, zero distance to interconnect, with and without
+        a new switchyard, every met mast size class, both hub height
+        classes, short and long construction and overridden management
+        costs.
+        """
+        self.site_facility_building_area_df = pd.DataFrame({
+            'Size Min (MW)': [0, 200, 500, 800, 1000],
+            'Size Max (MW)': [200, 500, 800, 1000, 5000],
+            'Building area (sq. ft.)': [3000, 5000, 7000, 9000, 12000],
+        })
+        num_turbines = [5, 8, 20, 50, 100, 150, 200, 250]
+        turbine_rating_MW = [1.5, 2.5, 1.5, 2.5, 2.0, 3.0, 2.0, 4.0]
+        self.projects = pd.DataFrame({
+            'project_id_with_serial': [f'project_{i}' for i in range(len(num_turbines))],
+            'num_turbines': num_turbines,
+            'turbine_rating_MW': turbine_rating_MW,
+            'rotor_diameter_m': 100.0,
+            'project_size_megawatts': np.array(num_turbines) * np.array(turbine_rating_MW),
+            'interconnect_voltage_kV': [34.5, 69, 138, 138, 230, 345, 138, 500],
+            'distance_to_interconnect_mi': [1, 5, 0, 10, 2.5, 50, 7, 20],
+            'new_switchyard': [True, False, True, False, True, True, False, True],
+            'development_labor_cost_usd': [1e5, 2e5, 3e5, 4e5, 5e5, 6e5, 7e5, 8e5],
+            'project_value_usd': [1e7, 2e7, 5e7, 1e8, 2e8, 3e8, 4e8, 8e8],
+            'foundation_cost_usd': [1e6, 2e6, 3e6, 5e6, 1e7, 2e7, 3e7, 4e7],
+            'actual_construction_months': [6, 9, 12, 20, 27, 28, 30, 40],
+            'num_hwy_permits': [1, 2, 5, 10, 10, 10, 10, 20],
+            'hub_height_meters': [80, 80, 85, 90, 100, 110, 80, 120],
+            'markup_contingency': 0.03,
+            'markup_warranty_management': 0.0002,
+            'markup_sales_and_use_tax': 0,
+            'markup_overhead': 0.05,
+            'markup_profit_margin': 0.05,
+            'override_total_management_cost': [2e5, 0, 0, 0, 0, 0, 0, 0],
+        })
+
+    def scalar_input_dict(self, project):
+        """
+        Makes the input dictionary for the scalar modules from one row of
+        the projects table.
+        """
+        input_dict = project.to_dict()
+        input_dict['site_facility_building_area_df'] = self.site_facility_building_area_df
+        # ManagementCost validates these keys but does not use them.
+        input_dict['construct_duration'] = project['actual_construction_months']
+        input_dict['num_access_roads'] = 2
+        if input_dict['override_total_management_cost'] <= 0:
+            del input_dict['override_total_management_cost']
+        return input_dict
+
+    def scalar_costs(self):
+        """
+        Runs the scalar modules for every project.
+        """
+        rows = []
+        for _, project in self.projects.iterrows():
+            input_dict = self.scalar_input_dict(project)
+            output_dict = {'actual_construction_months': project['actual_construction_months']}
+            project_name = project['project_id_with_serial']
+            for cost_module, key in [(SubstationCost, 'substation_module_type_operation'),
+                                     (GridConnectionCost, 'trans_dist_cost_module_type_operation'),
+                                     (DevelopmentCost, 'development_module_type_operation'),
+                                     (ManagementCost, 'mangement_module_type_operation')]:
+                status, error = cost_module(input_dict, output_dict, project_name).run_module()
+                self.assertEqual(status, 0, error)
+                rows.extend(output_dict[key])
+        return pd.DataFrame(rows)[BatchClosedFormCost.cost_columns]
+
+    def test_matches_scalar_modules(self):
+        """
+        The batch results have the same rows, in the same order, as the
+        scalar modules.
+        """
+        expected = self.scalar_costs()
+        actual = BatchClosedFormCost(self.projects, self.site_facility_building_area_df).run_modules()
+
+        text_columns = ['operation_id', 'type_of_cost', 'project_id_with_serial', 'module',
+                        'raw_cost_total_or_per_turbine']
+        self.assertEqual(actual[text_columns].values.tolist(), expected[text_columns].values.tolist())
+        for column in ['raw_cost', 'cost_per_turbine', 'cost_per_project', 'usd_per_kw_per_project']:
+            np.testing.assert_allclose(actual[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float),
+                                       rtol=1e-12, err_msg=column)
+
+    def test_missing_columns(self):
+        """
+        A missing column raises a ValueError that names it.
+        """
+        batch = BatchClosedFormCost(self.projects.drop(columns=['interconnect_voltage_kV']))
+        with self.assertRaisesRegex(ValueError, 'interconnect_voltage_kV'):
+            batch.substation_cost()
+        with self.assertRaisesRegex(ValueError, 'site_facility_building_area_df'):
+            batch.management_costs()
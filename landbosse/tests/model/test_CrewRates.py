@@ -0,0 +1,40 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.model import CrewRates
+
+
+class TestCrewRates(TestCase):
+    def setUp(self):
+        self.crew = pd.DataFrame({
+            'Crew type ID': ['M0', 'M0', 'C1', 'C1'],
+            'Operation': ['Management', 'Management', 'Base', 'Base'],
+            'Crew name': ['Management', 'Management', 'Base crew', 'Base crew'],
+            'Labor type ID': ['Project manager', 'Site manager', 'Laborer', 'Laborer'],
+            'Number of workers': [1, 2, 4, 4],
+        })
+        self.crew_price = pd.DataFrame({
+            'Labor type ID': ['Project manager', 'Site manager', 'Laborer'],
+            'Hourly rate USD per hour': [80.0, 60.0, 40.0],
+            'Per diem USD per day': [150.0, 150.0, 100.0],
+        })
+
+    def test_management_crew_cost(self):
+        """
+        The management crew costs are the same as merging the sheets and
+        costing the crews directly.
+        """
+        crew = self.crew[self.crew['Crew type ID'].str.contains('M0')]
+        expected = pd.merge(self.crew_price, crew, on=['Labor type ID'])
+        expected = expected.assign(per_diem_total=expected['Per diem USD per day'] * expected['Number of workers'] * 20)
+        expected = expected.assign(hourly_costs_total=expected['Hourly rate USD per hour'] * 10 * 20)
+        expected = expected.assign(total_crew_cost_before_wind_delay=expected['per_diem_total'] + expected['hourly_costs_total'])
+
+        management_crew = CrewRates(self.crew, self.crew_price).management_crew_cost(num_days=20, hours_per_day=10)
+        pd.testing.assert_frame_equal(management_crew, expected)
+
+    def test_crew_cost_drops_duplicate_crew_rows(self):
+        crew_cost = CrewRates(self.crew, self.crew_price).crew_cost
+        self.assertEqual(list(crew_cost['Labor type ID']), ['Project manager', 'Site manager', 'Laborer'])
+        self.assertEqual(crew_cost['Hourly rate USD per hour'].iloc[2], 40.0)
@@ -2,7 +2,8 @@ from unittest import TestCase
 import pandas as pd
 from landbosse.model import ErectionCost
 import os
-from landbosse.excelio import XlsxReader
+from landbosse.excelio import XlsxReader, XlsxDataframeCache
+from landbosse.api import InMemoryRunner
 from landbosse.tests.model.test_filename_functions import landbosse_test_input_dir
 import logging
 import sys
@@ -101,3 +102,70 @@ class TestErectionCost(TestCase):
         self.key_value_logging_helper(erection_cost_output_dict)
         print('>>>>>>>>>>>>>>>>>>>>> End ErectionCost Module black box test <<<<<<<<<<<<<<<<<<<')
         self.assertTrue(True)
+
+
+class TestCraneOperationsCache(TestCase):
+    def setUp(self):
+        """
+        Reads the parameters and project data of a project in the template.
+        """
+        template_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'project_input_template')
+        project_list = pd.read_excel(os.path.join(template_dir, 'project_list.xlsx'))
+        self.project_parameters = project_list.set_index('Project ID', drop=False).loc['foundation_validation_ge15']
+        self.project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(
+            self.project_parameters['Project data file'],
+            os.path.join(template_dir, 'project_data')
+        )
+        ErectionCost.crane_operations_cache.clear()
+
+    def tearDown(self):
+        ErectionCost.crane_operations_cache.clear()
+
+    def run_project(self, labor_cost_multiplier):
+        parameters = self.project_parameters.to_dict()
+        parameters['Labor cost multiplier'] = labor_cost_multiplier
+        result = InMemoryRunner(self.project_data_sheets).run(parameters)
+        self.assertEqual(result['failures'], [])
+        return result['costs']
+
+    def test_cache_hit(self):
+        """
+        A project that differs only in labor prices reuses the crane
+        operations and has the same costs as without the cache.
+        """
+        self.run_project(labor_cost_multiplier=1)
+        self.assertEqual(ErectionCost.crane_operations_cache.misses, 1)
+        cached = self.run_project(labor_cost_multiplier=2)
+        self.assertEqual(ErectionCost.crane_operations_cache.hits, 1)
+
+        ErectionCost.crane_operations_cache.clear()
+        expected = self.run_project(labor_cost_multiplier=2)
+        pd.testing.assert_frame_equal(cached, expected)
+
+
+class TestFindMinimumCostCranes(TestCase):
+    def find_minimum_cost_cranes(self, separate_basetop):
+        output_dict = {'separate_basetop': separate_basetop, 'same_basetop': separate_basetop.iloc[0:0]}
+        return ErectionCost({'allow_same_flag': False}, output_dict, 'foo').find_minimum_cost_cranes()
+
+    def test_ties(self):
+        """
+        Cranes with the same cost are chosen by name and boom system,
+        whatever order they are in.
+        """
+        separate_basetop = pd.DataFrame({
+            'Operation': ['Base', 'Base', 'Base', 'Top', 'Top', 'Offload'],
+            'Crane name': ['B', 'A', 'A', 'B', 'A', 'C'],
+            'Boom system': ['X', 'Y', 'X', 'X', 'X', 'X'],
+            'Total cost USD': [100.0, 100.0, 100.0, 50.0, 60.0, 10.0],
+        })
+        expected = pd.DataFrame({
+            'Boom system': ['X', 'X', 'X'],
+            'Crane name': ['A', 'B', 'C'],
+            'Operation': ['Base', 'Top', 'Offload'],
+            'Total cost USD': [100.0, 50.0, 20.0],
+        }).set_index(['Boom system', 'Crane name', 'Operation'])
+
+        for seed in range(3):
+            shuffled = separate_basetop.sample(frac=1, random_state=seed)
+            pd.testing.assert_frame_equal(self.find_minimum_cost_cranes(shuffled), expected)
@@ -0,0 +1,137 @@
+from unittest import TestCase
+
+import numpy as np
+from scipy.optimize import root_scalar
+
+from landbosse.model.FoundationSizing import foundation_loads, size_foundations, depressed_cubic_root, bisect
+
+
+# A 1.5 MW turbine on an 80 m tower: nacelle, hub, three blades and three
+# tower sections.
+COMPONENTS = {
+    'Section height m': np.array([0, 0, 0, 0, 0, 25, 25, 30.0]),
+    'Surface area sq m': np.array([33.0, 11.3, 33.44, 33.44, 33.44, 95.89, 96.25, 90.0]),
+    'Coeff drag (installed)': np.array([0.8, 1.1, 1.4, 1.4, 1.4, 1.1, 1.1, 1.1]),
+    'Lever arm m': np.array([80, 80, 80, 80, 80, 12, 37, 65.0]),
+    'Multplier drag rotor': np.array([1, 0, 2 / 3, 2 / 3, 2 / 3, 0, 0, 0]),
+    'Multiplier tower drag': np.array([0, 0, 0, 0, 0, 1, 1, 1.0]),
+    'Mass tonne': np.array([50, 15.4, 5.2, 5.2, 5.2, 59.8, 39.3, 30.9]),
+}
+
+
+def reference_radii(loads, rated_thrust_N, depth, bearing_pressure_n_m2):
+    """
+    The foundation radii of one project, calculated the way
+    FoundationCost.calculate_foundation_load() always has, with np.roots()
+    and brentq. A radius is NaN where brentq raises because there is no
+    root in its bracket.
+    """
+    f_dead, f_lat, m_overturn, lever_arm_max = loads
+    m_tot = max(rated_thrust_N * lever_arm_max, m_overturn)
+    f_horiz = max(f_lat, rated_thrust_N)
+    unit_weight = 0.55 * 17.3e3 + 0.45 * 23.6e3
+    r_overturn = np.roots([np.pi * depth * unit_weight, 0, f_dead, -(1.5 * (m_tot + f_horiz * depth))])
+    r_overturn = np.real(r_overturn[np.isreal(r_overturn)])[0]
+
+    tangent_slip_angle = np.tan(25 * np.pi / 180)
+    if 1.5 * f_lat < f_dead * tangent_slip_angle:
+        r_slipping = 0
+    else:
+        r_slipping = (((1.5 * f_lat / tangent_slip_angle) - f_dead) / (unit_weight * np.pi * depth)) ** 0.5
+    r_test_gapping = max(r_overturn, r_slipping)
+
+    def e_of(r):
+        v_1 = np.pi * r ** 2 * depth * unit_weight + f_dead
+        return m_tot / v_1, v_1
+
+    if r_test_gapping / 3 < e_of(r_test_gapping)[0]:
+        r_gapping = 0
+    else:
+        try:
+            r_gapping = root_scalar(lambda x: e_of(x)[0] * 3 - x, method='brentq',
+                                    bracket=[0.9 * r_overturn, 50], xtol=1e-4, maxiter=50).root
+        except ValueError:
+            # brentq raises when there is no root in the bracket.
+            return r_overturn, r_slipping, np.nan, np.nan
+    e, v_1 = e_of(max(r_test_gapping, r_gapping))
+    try:
+        r_bearing = root_scalar(lambda x: 2 * (x ** 2 - e * (x ** 2 - e ** 2) ** 0.5) - v_1 / bearing_pressure_n_m2,
+                                method='brentq', bracket=[0.9 * r_overturn, 50], xtol=1e-10, maxiter=50).root
+    except ValueError:
+        r_bearing = np.nan
+    return r_overturn, r_slipping, r_gapping, r_bearing
+
+
+class TestFoundationSizing(TestCase):
+    def test_depressed_cubic_root(self):
+        """
+        The closed form root agrees with np.roots()
+        """
+        rng = np.random.RandomState(1)
+        a = rng.uniform(1e4, 1e6, 100)
+        c = rng.uniform(0, 1e7, 100)
+        d = -rng.uniform(1e5, 1e9, 100)
+        actual = depressed_cubic_root(a, c, d)
+        for i in range(100):
+            roots = np.roots([a[i], 0, c[i], d[i]])
+            expected = np.real(roots[np.isreal(roots)])[0]
+            self.assertAlmostEqual(actual[i] / expected, 1, places=12)
+
+    def test_bisect(self):
+        """
+        Each bracket gets its own root and brackets without a sign change
+        give NaN.
+        """
+        targets = np.array([2.0, 3.0, 10.0])
+        roots = bisect(lambda x: x ** 2 - targets, np.array([0.0, 0.0, 0.0]), np.array([5.0, 5.0, 2.0]))
+        np.testing.assert_allclose(roots[:2], np.sqrt(targets[:2]), atol=1e-9)
+        self.assertTrue(np.isnan(roots[2]))
+
+    def test_matches_scalar_solves(self):
+        """
+        A sweep over gust velocity, rated thrust, depth and bearing
+        pressure gives the same radii as the scalar solves, including
+        projects where the bearing solve fails because its root is outside
+        the bracket.
+        """
+        rng = np.random.RandomState(2)
+        n = 200
+        gust_velocity = rng.uniform(10, 70, n)
+        rated_thrust = rng.uniform(1e2, 1e6, n)
+        depth = rng.uniform(0.5, 4, n)
+        bearing_pressure = rng.uniform(1.5e5, 4e5, n)
+
+        loads = foundation_loads(COMPONENTS, gust_velocity)
+        sizes = size_foundations(loads['f_dead'], loads['f_lat'], loads['m_overturn'], loads['lever_arm_max'],
+                                 rated_thrust, depth, bearing_pressure)
+
+        solved = 0
+        failed = 0
+        for i in range(n):
+            project_loads = (loads['f_dead'][i], loads['f_lat'][i], loads['m_overturn'][i], loads['lever_arm_max'][i])
+            r_overturn, r_slipping, r_gapping, r_bearing = reference_radii(project_loads, rated_thrust[i], depth[i],
+                                                                           bearing_pressure[i])
+            self.assertAlmostEqual(sizes['Radius_o_m'][i], r_overturn, places=10)
+            self.assertAlmostEqual(sizes['Radius_s_m'][i], r_slipping, places=10)
+            if np.isnan(r_gapping) or np.isnan(r_bearing):
+                self.assertTrue(np.isnan(sizes['Radius_m'][i]))
+                failed += 1
+                continue
+            self.assertAlmostEqual(sizes['Radius_b_m'][i], r_bearing, places=8)
+            # brentq stops within 1e-4 of the gapping root.
+            self.assertAlmostEqual(sizes['Radius_g_m'][i], r_gapping, delta=2e-4)
+            self.assertAlmostEqual(sizes['Radius_m'][i], max(r_overturn, r_slipping, r_gapping, r_bearing), delta=2e-4)
+            solved += 1
+
+        self.assertGreater(solved, 0)
+        self.assertGreater(failed, 0)
+
+    def test_loads_broadcast_over_gust_velocity(self):
+        """
+        The loads for an array of gust velocities are the loads of each
+        gust velocity on its own.
+        """
+        many = foundation_loads(COMPONENTS, np.array([40.0, 60.0]))
+        one = foundation_loads(COMPONENTS, 60.0)
+        for key in ['f_dead', 'f_lat', 'm_overturn', 'lever_arm_max']:
+            self.assertEqual(many[key][1], one[key][0])
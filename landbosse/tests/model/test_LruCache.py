@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+from landbosse.model import LruCache
+
+
+class TestLruCache(TestCase):
+    def test_hits_and_misses(self):
+        """
+        The first lookup of a key computes it and later lookups read it
+        from the cache.
+        """
+        cache = LruCache(maxsize=4)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return 'value'
+
+        self.assertEqual(cache.get_or_compute('a', compute), 'value')
+        self.assertEqual(cache.get_or_compute('a', compute), 'value')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 4})
+
+    def test_evicts_least_recently_used(self):
+        """
+        When the cache is full, the entry used longest ago is evicted.
+        """
+        cache = LruCache(maxsize=2)
+        cache.get_or_compute('a', lambda: 1)
+        cache.get_or_compute('b', lambda: 2)
+        cache.get_or_compute('a', lambda: 1)
+        cache.get_or_compute('c', lambda: 3)
+        self.assertEqual(cache.get_or_compute('a', lambda: -1), 1)
+        self.assertEqual(cache.get_or_compute('b', lambda: -2), -2)
+        self.assertEqual(len(cache), 2)
+
+    def test_exceptions_are_not_cached(self):
+        """
+        A key whose computation raised is computed again on the next
+        lookup.
+        """
+        cache = LruCache()
+
+        def fail():
+            raise ValueError('no root in bracket')
+
+        with self.assertRaises(ValueError):
+            cache.get_or_compute('a', fail)
+        self.assertEqual(cache.get_or_compute('a', lambda: 1), 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_zero_maxsize_disables_cache(self):
+        """
+        With maxsize 0 every lookup is a miss.
+        """
+        cache = LruCache(maxsize=0)
+        cache.get_or_compute('a', lambda: 1)
+        cache.get_or_compute('a', lambda: 1)
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 2, 'size': 0, 'maxsize': 0})
@@ -0,0 +1,115 @@
+import threading
+from unittest import TestCase
+
+from landbosse.model import Manager
+
+
+def fake_cost_module(name, log, fail=False):
+    """
+    Makes a class that behaves like a cost module. It appends its name to
+    log when it runs, reads the input named after it and writes its name under its own key and under the
+    'shared' key of its output dictionary.
+    """
+    class FakeCostModule:
+        def __init__(self, input_dict, output_dict, project_name):
+            self.input_dict = input_dict
+            self.output_dict = output_dict
+
+        def run_module(self):
+            log.append(name)
+            self.input_dict.get(f'{name}_input')
+            if fail:
+                return 1, ValueError(f'{name} failed')
+            self.output_dict[name] = threading.current_thread().name
+            self.output_dict['shared'] = name
+            return 0, 0
+
+    FakeCostModule.__name__ = name
+    return FakeCostModule
+
+
+class TestManager(TestCase):
+    def test_failure_is_recorded(self):
+        """
+        A project whose inputs are missing fails with a structured failure
+        record instead of an exception.
+        """
+        output_dict = dict()
+        manager = Manager(input_dict=dict(), output_dict=output_dict)
+        status = manager.execute_landbosse(project_name='project_1')
+
+        self.assertEqual(status, 1)
+        self.assertEqual(len(output_dict['failures']), 1)
+        failure = output_dict['failures'][0]
+        self.assertEqual(failure['project_id_with_serial'], 'project_1')
+        self.assertEqual(failure['module'], 'Manager')
+        self.assertEqual(failure['exception'], 'KeyError')
+        self.assertGreaterEqual(failure['elapsed_seconds'], 0)
+        self.assertIn('KeyError', failure['traceback'])
+
+    def test_failure_record(self):
+        """
+        Failure records carry the module, exception type and message.
+        """
+        record = Manager.failure_record('project_1', 'FoundationCost', ValueError('bad depth'), 1.5)
+        self.assertEqual(record['module'], 'FoundationCost')
+        self.assertEqual(record['exception'], 'ValueError')
+        self.assertEqual(record['message'], 'bad depth')
+        self.assertEqual(record['elapsed_seconds'], 1.5)
+
+    def graph_manager(self, log, max_workers, fail=None):
+        """
+        Makes a Manager whose cost module graph is a diamond: b and c need
+        a, and d needs b and c.
+        """
+        a, b, c, d = [fake_cost_module(name, log, fail=(name == fail)) for name in 'abcd']
+        manager = Manager(input_dict=dict(), output_dict={'failures': []}, max_workers=max_workers)
+        manager.cost_module_dependencies = {a: [], b: [a], c: [a], d: [b, c]}
+        return manager
+
+    def test_cost_module_graph(self):
+        """
+        Modules run after the modules they need and the outputs are merged
+        in the declared order, with or without threads.
+        """
+        for max_workers in [1, 4]:
+            log = []
+            manager = self.graph_manager(log, max_workers)
+            self.assertEqual(manager.run_cost_module_graph('project_1'), 0)
+            self.assertEqual(log[0], 'a')
+            self.assertEqual(log[-1], 'd')
+            self.assertEqual(set(log), {'a', 'b', 'c', 'd'})
+            self.assertEqual(manager.output_dict['shared'], 'd')
+            self.assertEqual(manager.output_dict['failures'], [])
+
+    def test_cost_module_graph_failure(self):
+        """
+        Modules that need a failed module are not run and the failure is
+        recorded.
+        """
+        for max_workers in [1, 4]:
+            log = []
+            manager = self.graph_manager(log, max_workers, fail='b')
+            self.assertEqual(manager.run_cost_module_graph('project_1'), 1)
+            self.assertNotIn('d', log)
+            self.assertNotIn('d', manager.output_dict)
+            self.assertEqual([failure['module'] for failure in manager.output_dict['failures']], ['b'])
+
+    def test_cost_module_graph_subset(self):
+        """
+        The inputs each module reads are recorded, and running a subset of
+        the modules again keeps the outputs of the others.
+        """
+        log = []
+        manager = self.graph_manager(log, max_workers=1)
+        manager.run_cost_module_graph('project_1')
+        self.assertEqual(manager.output_dict['module_input_reads']['b'], {'b_input'})
+
+        del log[:]
+        cost_modules = list(manager.cost_module_dependencies)
+        c = cost_modules[2]
+        manager.output_dict['shared'] = 'stale'
+        self.assertEqual(manager.run_cost_module_graph('project_1', {c}), 0)
+        self.assertEqual(log, ['c'])
+        self.assertEqual(manager.output_dict['shared'], 'd')
+        self.assertIn('a', manager.output_dict)
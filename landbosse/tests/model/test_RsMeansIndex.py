@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import RsMeansIndex
+
+
+class TestRsMeansIndex(TestCase):
+    def setUp(self):
+        self.rsmeans = pd.DataFrame({
+            'Operation ID': ['Excavation', 'Excavation', 'Trenching', 'Survey', 'Backfill'],
+            'Type of cost': ['Labor', 'Equipment', 'Labor', 'Labor', np.nan],
+            'Rate USD per unit': [10.0, 20.0, 30.0, 40.0, np.nan],
+            'Units': ['CY', 'CY', 'LF', np.nan, np.nan],
+            'Module': ['Foundations', 'Foundations', 'Collection', 'Roads', 'Roads'],
+            'Number of workers': [2, 1, 3, 4, 5],
+        })
+
+    def test_same_as_masking_the_sheet(self):
+        """
+        The lookups give the same rows and dtypes as masking the whole
+        sheet, for modules that are and are not in the sheet.
+        """
+        index = RsMeansIndex(self.rsmeans)
+        for module in ['Foundations', 'Collection', 'Roads', 'Small DW Roads']:
+            expected_operations = self.rsmeans.where(self.rsmeans['Module'] == module).dropna(thresh=4)
+            pd.testing.assert_frame_equal(index.operations(module), expected_operations)
+            pd.testing.assert_frame_equal(index.rows(module), self.rsmeans[self.rsmeans['Module'] == module])
+
+    def test_lookups_are_copies(self):
+        index = RsMeansIndex(self.rsmeans)
+        operations = index.operations('Foundations')
+        operations['Number of crews'] = 1
+        self.assertNotIn('Number of crews', index.operations('Foundations').columns)
+
+    def test_for_input_dict(self):
+        """
+        The index in an input dictionary is used if there is one. Otherwise
+        one is made from the rsmeans sheet.
+        """
+        index = RsMeansIndex(self.rsmeans)
+        self.assertIs(RsMeansIndex.for_input_dict({'rsmeans_index': index}), index)
+        made = RsMeansIndex.for_input_dict({'rsmeans': self.rsmeans})
+        self.assertEqual(len(made.rows('Roads')), 2)
@@ -0,0 +1,75 @@
+import threading
+import time
+from unittest import TestCase
+
+from landbosse.model import StageTimer
+
+
+class TestStageTimer(TestCase):
+    def tearDown(self):
+        """
+        StageTimer keeps its state on the class, so leave it disabled and
+        empty for other tests.
+        """
+        StageTimer.enable(False)
+        StageTimer.drain_records()
+
+    def test_disabled_records_nothing(self):
+        """
+        No records are made while timing is disabled.
+        """
+        StageTimer.enable(False)
+        with StageTimer.stage('project_1', 'FoundationCost.run_module'):
+            pass
+        self.assertEqual(StageTimer.drain_records(), [])
+
+    def test_records_and_summary(self):
+        """
+        Each stage gets a record, records are made even when the stage
+        raises, and the summary aggregates stages across projects.
+        """
+        StageTimer.enable()
+        with StageTimer.stage('project_1', 'FoundationCost.run_module'):
+            sum(range(1000))
+        with StageTimer.stage('project_2', 'FoundationCost.run_module'):
+            sum(range(1000))
+        with self.assertRaises(ValueError):
+            with StageTimer.stage('project_2', 'ErectionCost.run_module'):
+                raise ValueError()
+
+        records = StageTimer.drain_records()
+        self.assertEqual(len(records), 3)
+        self.assertEqual(StageTimer.drain_records(), [])
+        self.assertGreaterEqual(records[0]['wall_seconds'], 0)
+
+        summary = StageTimer.summarize(records).set_index('Stage')
+        self.assertEqual(summary.loc['FoundationCost.run_module', 'Count'], 2)
+        self.assertEqual(summary.loc['ErectionCost.run_module', 'Count'], 1)
+
+    def test_per_thread(self):
+        """
+        A stage timed per thread does not count the CPU time of another
+        thread that runs at the same time, while a stage of the process
+        does.
+        """
+        StageTimer.enable()
+        stop = threading.Event()
+
+        def spin():
+            while not stop.is_set():
+                sum(range(1000))
+
+        spinner = threading.Thread(target=spin)
+        spinner.start()
+        try:
+            with StageTimer.stage('project_1', 'FoundationCost.run_module', per_thread=True):
+                time.sleep(0.2)
+            with StageTimer.stage('project_1', 'Manager.execute_landbosse'):
+                time.sleep(0.2)
+        finally:
+            stop.set()
+            spinner.join()
+
+        per_thread, per_process = StageTimer.drain_records()
+        self.assertLess(per_thread['cpu_seconds'], 0.05)
+        self.assertGreater(per_process['cpu_seconds'], 0.1)
@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from landbosse.model import TrackedInputDict
+
+
+class TestTrackedInputDict(TestCase):
+    def test_reads_are_recorded(self):
+        """
+        Lookups with [], get() and in are reads. Writes go through to the
+        underlying dictionary.
+        """
+        data = {'depth': 2.5, 'num_turbines': 10, 'rated_thrust_N': 5e5}
+        tracked = TrackedInputDict(data)
+        tracked['depth']
+        tracked.get('missing_key')
+        'num_turbines' in tracked
+        tracked['operational_hrs_per_day'] = 10
+        self.assertEqual(tracked.reads, {'depth', 'missing_key', 'num_turbines'})
+        self.assertEqual(data['operational_hrs_per_day'], 10)
+
+    def test_project_data_sheets(self):
+        """
+        Reads of the sheets in project_data are recorded with the sheet
+        name.
+        """
+        tracked = TrackedInputDict({'project_data': {'crane_specs': 1, 'components': 2}})
+        self.assertEqual(tracked['project_data']['crane_specs'], 1)
+        self.assertEqual(tracked.reads, {'project_data', ('project_data', 'crane_specs')})
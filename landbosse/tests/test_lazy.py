@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+
+class TestLazyExports(TestCase):
+    def test_package_import_is_lightweight(self):
+        """
+        Importing the packages does not import pandas or the cost modules.
+        This runs in a new process because other tests have imported them.
+        """
+        code = (
+            'import sys, landbosse.model, landbosse.excelio, landbosse.api; '
+            'print("pandas" in sys.modules, "landbosse.model.Manager" in sys.modules)'
+        )
+        output = subprocess.check_output([sys.executable, '-c', code]).decode('utf-8').split()
+        self.assertEqual(output, ['False', 'False'])
+
+    def test_exports_are_classes(self):
+        """
+        The names exported by a package are the classes, even after their
+        modules have been imported directly.
+        """
+        import landbosse.model
+        from landbosse.model.FoundationCost import FoundationCost
+        from landbosse.model import FoundationCost as exported
+        self.assertIs(exported, FoundationCost)
+        self.assertIs(landbosse.model.FoundationCost, FoundationCost)
+        self.assertIn('FoundationCost', dir(landbosse.model))
+        with self.assertRaises(AttributeError):
+            landbosse.model.NotACostModule
@@ -1,4 +1,5 @@
 import os
+import sys
 from datetime import datetime
 
 import pandas as pd
@@ -8,41 +9,83 @@ from landbosse.excelio import XlsxParallelManagerRunner
 from landbosse.excelio import XlsxGenerator
 from landbosse.excelio import XlsxValidator
 from landbosse.excelio import CsvGenerator
+from landbosse.excelio import ProjectResultCache
+from landbosse.excelio import ProjectResultJournal
+from landbosse.excelio import SqliteResultStore
+from landbosse.excelio import BaselineComparison
+from landbosse.excelio import LcoeCalculator
+from landbosse.excelio import ShardMerger
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
 
 # LandBOSSE, small utility functions
 from landbosse.excelio import XlsxFileOperations
+from landbosse.excelio import RunConfiguration
+from landbosse.model import StageTimer
 
 if __name__ == '__main__':
+    # python main.py merge [shard output directory ...] -o [output directory]
+    # merges the outputs of the shards of a sweep run with --shard. See
+    # ShardMerger.
+    if len(sys.argv) > 1 and sys.argv[1] == 'merge':
+        ShardMerger.main(sys.argv[2:])
+        exit(0)
+
+    # The command line is parsed once into an immutable configuration,
+    # which is passed to everything that needs it. Run
+    # python main.py --help for the options.
+    config = RunConfiguration.from_argv()
+
     # Print start timestamp
     print(f'>>>>>>>> Begin run {datetime.now()} <<<<<<<<<<')
 
     # The file_ops object handles file names for input and output data.
-    file_ops = XlsxFileOperations()
+    file_ops = XlsxFileOperations(config)
 
-    # If run_parallel is True, an XlsxParallelManagerRunner will calculate the
-    # projects in parallel. This takes advantage of multicore architecture
-    # available on most hardware.
+    # With --profile, the time spent in each stage of each project is
+    # recorded and written to timing tables. See StageTimer.
+    StageTimer.enable(config.profile)
+
+    # By default, an XlsxParallelManagerRunner calculates the projects in
+    # parallel. This takes advantage of multicore architecture available on
+    # most hardware. --workers sets the number of processes.
     #
-    # If run_parallel is False, XlsxSerialManagerRunner will calculate projects
-    # serially. This is much slower so running in parallel is preferred
-    # unless there is a good reason to run serially. One such reason is using a
+    # With --serial, XlsxSerialManagerRunner calculates projects serially.
+    # This is much slower so running in parallel is preferred unless there
+    # is a good reason to run serially. One such reason is using a
     # debugger which can slow down when it is being used to debug multiple
     # processes.
 
-    run_parallel = True
-    manager_runner = XlsxParallelManagerRunner(file_ops) if run_parallel else XlsxSerialManagerRunner(file_ops)
+    # If a result cache directory is given with --cache (or the
+    # LANDBOSSE_CACHE_DIR environment variable), projects whose inputs
+    # have not changed since a previous run are read from the cache
+    # instead of being calculated again.
+    result_cache = ProjectResultCache(config.cache_dir) if config.cache_dir is not None else None
+
+    # The results of every project are checkpointed to a journal in the
+    # output directory as soon as the project finishes. If the run is
+    # interrupted, it can be continued with --resume [output directory],
+    # which skips the projects already in the journal. The journal is
+    # removed once all the outputs have been written.
+    journal = ProjectResultJournal(file_ops.landbosse_output_dir())
+
+    if config.parallel:
+        manager_runner = XlsxParallelManagerRunner(file_ops, result_cache, journal)
+    else:
+        manager_runner = XlsxSerialManagerRunner(file_ops, result_cache, journal)
 
     # project_xlsx is the absolute path of the project_list.xlsx
-    projects_xlsx = os.path.join(file_ops.landbosse_input_dir(), 'project_list.xlsx')
+    projects_xlsx = os.path.join(config.input_dir, 'project_list.xlsx')
 
-    # Should we enable the scaling study? Just look for the scaling study
-    # option. The first three elements of the returned tuple aren't necessary
-    # to determine if the scaling study is enabled.
-    # Switch to either validation or non validation producing code.
-    input_path, output_path, validation_enabled, enable_scaling_study = file_ops.get_input_output_paths_from_argv_or_env()
+    # With --baseline or --baseline-filter, the baseline project is found
+    # in the extended project list before any project runs, so that a
+    # baseline that matches no project, or several, stops the run at once.
+    compare_to_baseline = config.baseline_project is not None or config.baseline_filter is not None
+    if compare_to_baseline:
+        comparison = BaselineComparison(config.baseline_project, config.baseline_filter)
+        baseline_id = comparison.find_baseline(manager_runner.read_project_and_parametric_list_from_xlsx())
 
     # final_result aggregates all the results from all the projects.
-    final_result = manager_runner.run_from_project_list_xlsx(projects_xlsx, enable_scaling_study)
+    final_result = manager_runner.run_from_project_list_xlsx(projects_xlsx, config.scaling)
 
     # Write the extended_project_list, which has all the parametric values.
     extended_project_list_path = os.path.join(file_ops.extended_project_list_path(), 'extended_project_list.csv')
@@ -50,13 +93,13 @@ if __name__ == '__main__':
     extended_project_list.to_csv(extended_project_list_path, index=False)
 
     # Run validation or not depending on whether validation was enabled.
-    if validation_enabled:
+    if config.validate:
         print('Running validation.')
 
         # Creates file path for output file from prior LandBOSSE run that will be used to check latest run
         # Generated based on input_path from command line when --validate option is specified
         # (validation output file must be in inputs folder and must be called 'landbosse-output-validation.xlsx')
-        expected_validation_data_path = os.path.join(input_path, 'landbosse-expected-validation-data.xlsx')
+        expected_validation_data_path = os.path.join(config.input_dir, 'landbosse-expected-validation-data.xlsx')
         validation_result_path = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-validation-result.xlsx')
 
         validator = XlsxValidator()
@@ -76,24 +119,99 @@ if __name__ == '__main__':
     # worksheet to the output .xlsx. Also, copy file input structure.
     print('Writing final output folder')
 
-    max_number_of_excel_rows = 1048576
-    if len(final_result['details_list']) > max_number_of_excel_rows:
-        print('WARNING: Details sheet in .xlsx has too many rows for Excel. Please use landbosse-details.csv instead.')
-        print('Writing .xlsx file for backwards compatability.')
+    # --output-formats selects whether the costs and details are written
+    # to landbosse-output.xlsx, to .csv files, to a SQLite database or to
+    # several of them.
+    # XlsxGenerator streams the rows to disk and continues tabs that are
+    # too long for Excel on more worksheets.
+    if 'xlsx' in config.output_formats:
+        with StageTimer.stage('(all projects)', 'Write landbosse-output.xlsx'):
+            with XlsxGenerator('landbosse-output', file_ops) as xlsx:
+                xlsx.tab_costs_by_module_type_operation(rows=final_result['module_type_operation_list'])
 
-    with XlsxGenerator('landbosse-output', file_ops) as xlsx:
-        xlsx.tab_costs_by_module_type_operation(rows=final_result['module_type_operation_list'])
-    file_ops.copy_input_data()
+    with StageTimer.stage('(all projects)', 'Copy input data'):
+        file_ops.copy_input_data()
 
-    # Always write .csv versions of the output
     csv_generator = CsvGenerator(file_ops)
 
-    costs = csv_generator.create_costs_dataframe(final_result['module_type_operation_list'])
-    details = csv_generator.create_details_dataframe(final_result['details_list'])
-    costs_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-costs.csv')
-    details_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-details.csv')
-    costs.to_csv(costs_csv_filename, index=False)
-    details.to_csv(details_csv_filename, index=False)
+    # The costs and details dataframes are made once and written to the
+    # .csv files, the SQLite database or both.
+    calculate_lcoe = config.aep_csv is not None
+    if 'csv' in config.output_formats or 'sqlite' in config.output_formats or compare_to_baseline or calculate_lcoe:
+        costs = csv_generator.create_costs_dataframe(final_result['module_type_operation_list'])
+        details = csv_generator.create_details_dataframe(final_result['details_list'])
+
+    if 'csv' in config.output_formats:
+        with StageTimer.stage('(all projects)', 'Write landbosse-costs.csv'):
+            costs_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-costs.csv')
+            costs.to_csv(costs_csv_filename, index=False)
+
+        with StageTimer.stage('(all projects)', 'Write landbosse-details.csv'):
+            details_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-details.csv')
+            details.to_csv(details_csv_filename, index=False)
+
+    # With --output-formats sqlite, the projects, costs and details are
+    # also written to an indexed database, with views that join the costs
+    # and details with the parameters of their projects.
+    if 'sqlite' in config.output_formats:
+        with StageTimer.stage('(all projects)', 'Write landbosse-results.sqlite'):
+            sqlite_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-results.sqlite')
+            with SqliteResultStore(sqlite_filename) as store:
+                store.write_projects(extended_project_list)
+                store.write_costs(costs)
+                store.write_details(details)
+
+    # With --aep and --tcc, the LCOE of every project is calculated from
+    # its costs.
+    if calculate_lcoe:
+        with StageTimer.stage('(all projects)', 'Write landbosse-lcoe.csv'):
+            lcoe_calculator = LcoeCalculator.from_csv(config.aep_csv, config.tcc_csv, config.fcr, config.opex_usd_per_kw)
+            lcoe_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-lcoe.csv')
+            lcoe_calculator.calculate(costs).to_csv(lcoe_csv_filename, index=False)
+
+    # Projects that failed are left out of the costs and details. Instead,
+    # what failed in each of them is written to the failures table.
+    if len(final_result['failures']) > 0:
+        failures = csv_generator.create_failures_dataframe(final_result['failures'])
+        failures_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-failures.csv')
+        failures.to_csv(failures_csv_filename, index=False)
+        failed_projects = failures['Project ID with serial'].nunique()
+        print(f'WARNING: {failed_projects} projects failed. See {failures_csv_filename}')
+
+    # With --shard, the manifest of the shard is written for ShardMerger.
+    if file_ops.project_shard() is not None:
+        file_ops.project_shard().write_manifest(file_ops.landbosse_output_dir())
+
+    # With --baseline or --baseline-filter, the costs of every project are
+    # compared with those of the baseline project. This comes after the
+    # failures and the manifest are written, and a baseline project that
+    # failed only skips the comparison, so the rest of the outputs are kept.
+    if compare_to_baseline:
+        with StageTimer.stage('(all projects)', 'Write landbosse-baseline-comparison.csv'):
+            try:
+                comparison.set_baseline_costs(costs)
+            except XlsxOperationException as error:
+                print(f'WARNING: {error} The costs were not compared with it.')
+            else:
+                comparison_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-baseline-comparison.csv')
+                comparison.compare(costs).to_csv(comparison_csv_filename, index=False)
+                print(f'Compared the costs with the baseline project {baseline_id}')
+
+    # If profiling is enabled, write the time spent in each stage of each
+    # project and a summary of all the stages across all the projects and
+    # worker processes.
+    if StageTimer.is_enabled():
+        stage_timings = final_result['stage_timings'] + StageTimer.drain_records()
+        timings = StageTimer.create_timings_dataframe(stage_timings)
+        timings.to_csv(os.path.join(file_ops.landbosse_output_dir(), 'landbosse-timings.csv'), index=False)
+        timings_summary = StageTimer.summarize(stage_timings)
+        timings_summary.to_csv(os.path.join(file_ops.landbosse_output_dir(), 'landbosse-timings-summary.csv'), index=False)
+        print('Time spent in each stage:')
+        print(timings_summary.to_string(index=False))
+
+    # Every output has been written, so the run no longer needs to be
+    # resumed and its journal is removed.
+    journal.remove()
 
     # Print end timestamp
     print(f'>>>>>>>> End run {datetime.now()} <<<<<<<<<<')
@@ -102,7 +220,7 @@ if __name__ == '__main__':
     #
     # If validation was not enabled, exit with a status of 0 (no errors)
 
-    if validation_enabled:
+    if config.validate:
         exit(build_status)
     else:
         exit(0)
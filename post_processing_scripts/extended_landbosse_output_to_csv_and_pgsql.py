@@ -1,20 +1,20 @@
 import os
-import io
+import sqlite3
 
-from sqlalchemy import create_engine
 import pandas as pd
 
+from landbosse.excelio import ResultLoader
+from landbosse.excelio import SqliteLoaderBackend
+from landbosse.excelio import PostgresLoaderBackend
+
 
 costs_path = "landbosse-costs.csv"
 details_path = "landbosse-details.csv"
 extended_project_list_path = os.path.join("calculated_parametric_inputs", "extended_project_list.csv")
 
-print("Reading costs...")
-costs = pd.read_csv(costs_path)
-costs.drop(columns=['Number of turbines', 'Turbine rating MW', 'Rotor diameter m'], inplace=True)
-
-print("Reading details...")
-details = pd.read_csv(details_path)
+# The costs and details are read, joined and written this many rows at a
+# time, so the memory used does not grow with the size of the run.
+chunksize = 100000
 
 print("Reading extended project list...")
 extended_project_list = pd.read_csv(extended_project_list_path)
@@ -23,59 +23,64 @@ extended_project_list = pd.read_csv(extended_project_list_path)
 # In that case, those non-parametric projects will not be joined onto the extended project
 # list.
 
-print("Joining extended project list onto costs...")
-join_landbosse_output_costs = costs.merge(right=extended_project_list, on="Project ID with serial")
+cost_drop_columns = ['Number of turbines', 'Turbine rating MW', 'Rotor diameter m']
 
-print("Joining extended project list onto details...")
-join_landbosse_output_details = details.merge(right=extended_project_list, on="Project ID with serial")
+# The loader that reads and joins the chunks. Until a database is chosen
+# below, it has no backend and is only used to read the .csv files.
+loader = ResultLoader(backend=None, chunksize=chunksize)
 
+# The costs and details are read with the types of their columns, so that
+# every chunk has the same types as the first, which the database tables
+# are made with.
 print("Writing joined .csv files...")
-join_landbosse_output_costs.to_csv("extended_landbosse_costs.csv", index=False)
-join_landbosse_output_details.to_csv("extended_landbosse_details.csv", index=False)
-
+for input_path, output_path, drop_columns, dtype in [
+        (costs_path, "extended_landbosse_costs.csv", cost_drop_columns, ResultLoader.costs_dtypes),
+        (details_path, "extended_landbosse_details.csv", [], ResultLoader.details_dtypes)]:
+    chunks = loader.read_csv_chunks(input_path, drop_columns=drop_columns, right=extended_project_list, dtype=dtype)
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(output_path, index=False, mode="w" if i == 0 else "a", header=i == 0)
+
+# Set the backend to "postgresql" to load into PostgreSQL or to "sqlite"
+# to load into a local SQLite database file instead.
 load_into_database_enabled = False
+database_backend = "postgresql"
 if load_into_database_enabled:
     print("Load into database...")
 
-    # Get the security credentials and DB config from the environment
-    # variables to maintain security.
-
-    pg_password = os.environ.get("PG_PASSWORD", "no pasword was specified")
-    pg_user = os.environ.get("PG_USER", "no pg pasword was specified")
-    pg_database = os.environ.get("PG_DATABASE", "no pg database was specified")
-    pg_port = os.environ.get("PG_PORT", "no pg port was specified")
-    pg_host = os.environ.get("PG_HOST", "localhost")
-    pg_port = os.environ.get("PG_PORT", "5432")
-    engine_string = f"postgresql+psycopg2://{pg_user}:{pg_password}@{pg_host}:{pg_port}/{pg_database}"
-    engine = create_engine(engine_string)
-
-    # For ann explanation of how Pandas is creating SQL, see
-    # https://pandas.pydata.org/pandas-docs/version/0.23/generated/pandas.DataFrame.to_sql.html
-    #
-    # Also, with respect to the string IO, the code is writing a CSV file into an
-    # in memory buffer to insert all rows into each table in a single transaction
-    # See https://stackoverflow.com/questions/23103962/how-to-write-dataframe-to-postgres-table
+    if database_backend == "postgresql":
+        import psycopg2
 
-    cost_table_name = "landbosse_costs"
-    join_landbosse_output_costs.head(0).to_sql(cost_table_name, engine, if_exists="replace", index=False)
-    conn = engine.raw_connection()
-    cur = conn.cursor()
+        # Get the security credentials and DB config from the environment
+        # variables to maintain security.
 
-    # Create buffer to hold the .csv. Write it into the buffer.
-    output = io.StringIO()
-    join_landbosse_output_costs.to_csv(output, sep="\t", header=False, index=False)
+        connection = psycopg2.connect(
+            user=os.environ.get("PG_USER", "no pg pasword was specified"),
+            password=os.environ.get("PG_PASSWORD", "no pasword was specified"),
+            dbname=os.environ.get("PG_DATABASE", "no pg database was specified"),
+            host=os.environ.get("PG_HOST", "localhost"),
+            port=os.environ.get("PG_PORT", "5432"),
+        )
+        loader.backend = PostgresLoaderBackend(connection)
+    else:
+        connection = sqlite3.connect(os.environ.get("SQLITE_PATH", "landbosse-results.sqlite"))
+        loader.backend = SqliteLoaderBackend(connection)
 
-    # Rewind to beginning of the buffer and then dump it into the database
-    output.seek(0)
-    contents = output.getvalue()
-    cur.copy_from(output, cost_table_name, null="")
-    conn.commit()
+    # Each table is streamed into the database one chunk at a time with
+    # COPY (or inserts on SQLite). The indexes are made, and the details
+    # partitioned by module, after all the rows are loaded.
+
+    cost_table_name = "landbosse_costs"
+    chunks = loader.read_csv_chunks(costs_path, drop_columns=cost_drop_columns, right=extended_project_list,
+                                    dtype=ResultLoader.costs_dtypes)
+    num_rows = loader.load(cost_table_name, chunks,
+                           indexes=[["Project ID with serial"], ["Module", "Type of cost"]])
+    print(f"Loaded {num_rows} rows into {cost_table_name}")
 
     details_table_name = "landbosse_details"
-    join_landbosse_output_details.head(0).to_sql(details_table_name, engine, if_exists="replace", index=False)
-    output = io.StringIO()
-    join_landbosse_output_details.to_csv(output, sep="\t", header=False, index=False)
-    output.seek(0)
-    contents = output.getvalue()
-    cur.copy_from(output, details_table_name, null="")
-    conn.commit()
+    chunks = loader.read_csv_chunks(details_path, right=extended_project_list, dtype=ResultLoader.details_dtypes)
+    num_rows = loader.load(details_table_name, chunks,
+                           indexes=[["Project ID with serial"], ["Module", "Variable name"]],
+                           partition_by="Module")
+    print(f"Loaded {num_rows} rows into {details_table_name}")
+
+    connection.close()